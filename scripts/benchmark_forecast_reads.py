@@ -0,0 +1,114 @@
+"""Benchmark multi-location forecast reads on a synthetic forecast table.
+
+Builds a throwaway database of --rows forecast rows (15 days per location) and
+times a feed-sized read of --feed-locations locations three ways:
+
+  legacy   the previous query (ORDER BY location, date with a global
+           LIMIT days * len(locations)) on a copy without the new index
+  indexed  ForecastStore.get_forecasts_for_locations with the cache cleared
+           before every read (uses idx_forecast_location_date)
+  cached   ForecastStore.get_forecasts_for_locations with a warm cache
+
+Usage:
+  PYTHONPATH=. python scripts/benchmark_forecast_reads.py
+  PYTHONPATH=. python scripts/benchmark_forecast_reads.py --rows 50000 --iterations 500
+"""
+
+import argparse
+import itertools
+import json
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.services.forecast_store import ForecastStore, clear_forecast_cache
+
+DAYS_PER_LOCATION = 15
+
+LEGACY_QUERY = """
+    SELECT date, location, high, low, summary, description, last_updated, hourly_json, timezone
+    FROM forecast
+    WHERE date >= ? AND location IN ({placeholders})
+    ORDER BY location, date ASC
+    LIMIT ?
+"""
+
+
+def _populate(store: ForecastStore, rows: int) -> list[str]:
+    today = date.today()
+    hourly = json.dumps({"times": [f"T{h:02d}:00" for h in range(6, 23)], "temps": [12.5] * 17,
+                         "codes": [1] * 17, "rain": [10] * 17, "winds": [5.0] * 17})
+    locations = [f"City {i:05d}" for i in range(max(1, rows // DAYS_PER_LOCATION))]
+    conn = sqlite3.connect(store.db_path)
+    conn.executemany(
+        """INSERT INTO forecast (date, location, high, low, summary, description, last_updated, hourly_json, timezone)
+           VALUES (?, ?, 20, 10, 'summary', 'description', ?, ?, 'Europe/Berlin')""",
+        [((today + timedelta(days=d)).isoformat(), loc, today.isoformat(), hourly)
+         for loc in locations for d in range(DAYS_PER_LOCATION)],
+    )
+    conn.commit()
+    conn.close()
+    return locations
+
+
+def _legacy_read(db_path: str, locations: list[str], days: int) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(LEGACY_QUERY.format(placeholders=",".join("?" * len(locations))),
+                            [date.today().isoformat()] + locations + [days * len(locations)]).fetchall()
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def _time(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--feed-locations", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ForecastStore(db_path=str(Path(tmp) / "bench.db"))
+        all_locations = _populate(store, args.rows)
+        legacy_db = str(Path(tmp) / "legacy.db")
+        shutil.copy(store.db_path, legacy_db)
+        conn = sqlite3.connect(legacy_db)
+        conn.execute("DROP INDEX idx_forecast_location_date")
+        conn.close()
+
+        rng = random.Random(42)
+        feeds = [rng.sample(all_locations, min(args.feed_locations, len(all_locations))) for _ in range(50)]
+        cycle = itertools.cycle(feeds)
+
+        def indexed():
+            clear_forecast_cache()
+            store.get_forecasts_for_locations(next(cycle), days=14)
+
+        results = {
+            "legacy": _time(lambda: _legacy_read(legacy_db, next(cycle), 14), args.iterations),
+            "indexed": _time(indexed, args.iterations),
+        }
+        for feed in feeds:
+            store.get_forecasts_for_locations(feed, days=14)
+        results["cached"] = _time(lambda: store.get_forecasts_for_locations(next(cycle), days=14), args.iterations)
+
+    print(f"{len(all_locations) * DAYS_PER_LOCATION} rows, {len(all_locations)} locations, "
+          f"{args.feed_locations} locations per read, {args.iterations} reads")
+    for name, ms in results.items():
+        print(f"{name:<8} {ms:8.3f} ms/read")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Compare the Open-Meteo cost of the tiered and unified refresh modes.
+
+Replays one day of planned refreshes for a single timezone group and reports,
+per mode, the batch API calls made, response bytes received and wall time
+spent fetching and parsing. Only fetching is measured; nothing is written to
+the database or pushed.
+
+By default responses are synthesised locally (Open-Meteo-shaped hourly data for
+the requested range, plus --latency-ms per call), so the run is offline and
+repeatable. --live sends the real requests instead.
+
+Usage:
+  PYTHONPATH=. python scripts/benchmark_refresh_modes.py
+  PYTHONPATH=. python scripts/benchmark_refresh_modes.py --locations 10 --latency-ms 400
+  PYTHONPATH=. python scripts/benchmark_refresh_modes.py --live --locations 3
+"""
+
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import requests
+
+from src.services.forecast_service import ForecastService
+from src.services.tier_schedule import TIER_DAY_RANGES, tier_slots
+
+ZONE = "Europe/Berlin"
+CITIES = [
+    ("Munich", 48.14, 11.58), ("Berlin", 52.52, 13.41), ("Hamburg", 53.55, 9.99),
+    ("Cologne", 50.94, 6.96), ("Frankfurt", 50.11, 8.68), ("Stuttgart", 48.78, 9.18),
+    ("Vienna", 48.21, 16.37), ("Zurich", 47.37, 8.54), ("Prague", 50.08, 14.44),
+    ("Amsterdam", 52.37, 4.90), ("Paris", 48.86, 2.35), ("Milan", 45.46, 9.19),
+]
+HOURLY_VARS = ("temperature_2m", "apparent_temperature", "weather_code", "precipitation_probability",
+               "precipitation", "wind_speed_10m", "wind_gusts_10m")
+
+
+def _fetch_kwargs(tier: str, today: date) -> dict:
+    """fetch_forecasts_batch arguments used by each refresh in main.py."""
+    if tier == "tier1":
+        return {"forecast_days": 2}
+    if tier == "unified":
+        first, last = 0, TIER_DAY_RANGES["tier3"][1]
+    else:
+        first, last = TIER_DAY_RANGES[tier]
+    return {"start_date": (today + timedelta(days=first)).isoformat(),
+            "end_date": (today + timedelta(days=last)).isoformat()}
+
+
+def _synthetic_payload(params: dict) -> list | dict:
+    if "start_date" in params:
+        start = date.fromisoformat(params["start_date"])
+        days = (date.fromisoformat(params["end_date"]) - start).days + 1
+    else:
+        start, days = date.today(), params["forecast_days"]
+    hours = [datetime.combine(start, datetime.min.time()) + timedelta(hours=h) for h in range(days * 24)]
+    entries = []
+    for lat in params["latitude"].split(","):
+        hourly = {"time": [h.strftime("%Y-%m-%dT%H:%M") for h in hours]}
+        for i, var in enumerate(HOURLY_VARS):
+            hourly[var] = [round((h + i * 7) % 31 * 0.7, 1) for h in range(len(hours))]
+        hourly["weather_code"] = [(h // 3) % 4 for h in range(len(hours))]
+        entries.append({"latitude": float(lat), "timezone": params["timezone"], "hourly": hourly})
+    return entries if len(entries) > 1 else entries[0]
+
+
+def run_mode(mode: str, locations: list[dict], live: bool, latency: float) -> dict:
+    """Run one day of `mode` refresh fetches and return calls, bytes and wall time."""
+    stats = {"mode": mode, "calls": 0, "bytes": 0}
+    real_get = requests.get
+
+    def counting_get(url, params=None, **kwargs):
+        stats["calls"] += 1
+        if live:
+            response = real_get(url, params=params, **kwargs)
+            stats["bytes"] += len(response.content)
+            return response
+        body = json.dumps(_synthetic_payload(params)).encode()
+        stats["bytes"] += len(body)
+        time.sleep(latency)
+        response = requests.models.Response()
+        response.status_code, response._content = 200, body
+        return response
+
+    today = date.today()
+    slots = tier_slots({ZONE: locations}, mode=mode)
+    url = ForecastService.OPEN_METEO_URL or "https://api.open-meteo.com/v1/forecast"
+    started = time.perf_counter()
+    with patch("requests.get", counting_get), \
+            patch.object(ForecastService, "OPEN_METEO_URL", url):
+        for slot in slots:
+            ForecastService.fetch_forecasts_batch(locations, **_fetch_kwargs(slot.tier, today))
+    stats["wall_seconds"] = round(time.perf_counter() - started, 3)
+    stats["runs"] = len(slots)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--locations", type=int, default=5, help=f"locations in the group (max {len(CITIES)})")
+    parser.add_argument("--latency-ms", type=float, default=300, help="simulated per-call latency (synthetic only)")
+    parser.add_argument("--live", action="store_true", help="call the real Open-Meteo API")
+    args = parser.parse_args()
+
+    locations = [{"location": name, "lat": lat, "lon": lon, "timezone": ZONE}
+                 for name, lat, lon in CITIES[:max(1, min(args.locations, len(CITIES)))]]
+    results = [run_mode(mode, locations, args.live, args.latency_ms / 1000) for mode in ("tiered", "unified")]
+
+    print(f"{len(locations)} locations, one day, {'live' if args.live else 'synthetic'} responses")
+    print(f"{'mode':<8} {'runs':>5} {'calls':>6} {'bytes':>10} {'wall_s':>8}")
+    for r in results:
+        print(f"{r['mode']:<8} {r['runs']:>5} {r['calls']:>6} {r['bytes']:>10} {r['wall_seconds']:>8}")
+    tiered, unified = results
+    if tiered["calls"] and tiered["bytes"]:
+        print(f"unified/tiered: calls {unified['calls'] / tiered['calls']:.2f}, "
+              f"bytes {unified['bytes'] / tiered['bytes']:.2f}, "
+              f"wall {unified['wall_seconds'] / max(tiered['wall_seconds'], 1e-9):.2f}")
+
+
+if __name__ == "__main__":
+    main()
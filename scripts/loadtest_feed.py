@@ -0,0 +1,133 @@
+"""Load test concurrent ICS feed polls against one in-process app worker.
+
+Builds a throwaway database with --users users sharing --locations locations
+(14 stored forecast days each) and fires --requests feed polls at up to
+--concurrency at a time through the ASGI app, two ways:
+
+  inline      the feed handler called directly on the event loop, as it ran
+              when the route was `async def`
+  threadpool  the real /feed/{token}/weather.ics route, which Starlette runs
+              in its threadpool
+
+Every token is polled once beforehand so first-poll writes and a cold
+forecast cache don't land on either run. For each mode it reports feed
+throughput and the latency of a trivial request (/robots.txt) issued during
+the load, which shows how long the event loop is blocked.
+
+Usage:
+  PYTHONPATH=. python scripts/loadtest_feed.py
+  PYTHONPATH=. python scripts/loadtest_feed.py --requests 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+
+def _populate(db_path: str, users: int, locations: int) -> list[str]:
+    from src.models.forecast import Forecast
+    from src.services.forecast_store import ForecastStore
+    from src.web.db import create_feed_token, set_user_location
+    from src.utils.db import get_connection
+
+    store = ForecastStore(db_path=db_path)
+    today = date.today()
+    for n in range(locations):
+        for d in range(14):
+            store.upsert_forecast(Forecast(
+                date=(today + timedelta(days=d)).isoformat(), location=f"City {n}", high=20, low=10,
+                summary="AM☀️15° / PM⛅19°", description="Nice day", fetch_time=today.isoformat(),
+                timezone="Europe/Berlin",
+            ))
+    conn = get_connection(db_path)
+    conn.executemany(
+        "INSERT INTO users (email, password_hash, created_at) VALUES (?, 'x', ?)",
+        [(f"load{n}@example.com", today.isoformat()) for n in range(users)],
+    )
+    conn.commit()
+    user_ids = [r[0] for r in conn.execute("SELECT id FROM users ORDER BY id")]
+    conn.close()
+    tokens = []
+    for n, user_id in enumerate(user_ids):
+        set_user_location(db_path, user_id, f"City {n % locations}", 52.5, 13.4, "Europe/Berlin")
+        tokens.append(create_feed_token(db_path, user_id))
+    return tokens
+
+
+async def _run(app, paths: list[str], concurrency: int) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        probe_latencies = []
+        done = asyncio.Event()
+
+        async def poll(path):
+            async with semaphore:
+                resp = await client.get(path)
+                assert resp.status_code == 200, resp.status_code
+
+        async def probe():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/robots.txt")
+                probe_latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.01)
+
+        prober = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(poll(p) for p in paths))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+    probe_latencies.sort()
+    return {
+        "rps": len(paths) / elapsed,
+        "probe_p50": statistics.median(probe_latencies),
+        "probe_max": probe_latencies[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--locations", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app creates its tables in DB_PATH at import time
+        os.environ["DB_PATH"] = str(Path(tmp) / "loadtest.db")
+        import src.web.app as web_app
+        from fastapi import Request
+
+        tokens = _populate(web_app.DB_PATH, args.users, args.locations)
+
+        @web_app.app.get("/_loadtest_inline/{token}/weather.ics")
+        async def feed_inline(request: Request, token: str):
+            return web_app.feed(request, token)
+
+        # First polls log funnel events and fill the forecast cache; keep that out of both runs
+        asyncio.run(_run(web_app.app, [f"/feed/{t}/weather.ics" for t in tokens], args.concurrency))
+        results = {}
+        for mode, prefix in (("inline", "/_loadtest_inline"), ("threadpool", "/feed")):
+            paths = [f"{prefix}/{tokens[n % len(tokens)]}/weather.ics" for n in range(args.requests)]
+            results[mode] = asyncio.run(_run(web_app.app, paths, args.concurrency))
+        web_app.poll_buffer.close()
+
+    print(f"{args.requests} feed polls, concurrency {args.concurrency}, "
+          f"{args.users} users over {args.locations} locations")
+    for mode, r in results.items():
+        print(f"{mode:<11} {r['rps']:8.1f} req/s   /robots.txt during load: "
+              f"p50 {r['probe_p50']:7.1f} ms, max {r['probe_max']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
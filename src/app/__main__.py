@@ -0,0 +1,21 @@
+"""Scheduler entry point: python -m src.app
+
+Loads .env and sets up logging before importing the scheduler, whose modules
+read their settings at import time.
+"""
+
+from dotenv import load_dotenv
+
+from src.utils.logging_config import setup_logging
+
+
+def main():
+    load_dotenv()
+    setup_logging()
+    from src.app.main import schedule_jobs
+
+    schedule_jobs()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,68 @@
 import os
 import logging
+import threading
 import time
-from datetime import date, timedelta
-
-import schedule
+from datetime import date, datetime, timedelta, timezone
 
 from src.services.forecast_service import ForecastService
 from src.services.forecast_formatting import format_summary, format_detailed_forecast
-from src.utils.logging_config import setup_logging
-from src.utils.location_management import get_locations, group_locations_by_tz_offset, local_to_utc
+from src.utils.rate_limit import TokenBucket
+from src.utils.scheduler import Scheduler, daily_at, every
+from src.utils.location_management import get_locations, group_locations_by_timezone
 from src.services.forecast_store import ForecastStore
 from src.integrations.google_push import (
     create_google_tokens_table,
     get_google_connected_users,
     push_events_for_user,
 )
+from src.integrations.push_executor import run_push
+from src.integrations.push_queue import enqueue_push_job, process_push_jobs
 from src.constants import DEFAULT_PREFS
-from src.services.forecast_alerts import check_and_alert, log_refresh_result
+from src.services import model_runs
+from src.services.admin_stats import RECONCILE_INTERVAL_SECONDS, reconcile_admin_user_stats
+from src.services.poll_rollups import ROLLUP_INTERVAL_SECONDS, rollup_poll_log
+from src.services.forecast_alerts import check_and_alert, log_refresh_result, log_refresh_skip
+from src.services.tier_schedule import (
+    TIER_DAY_RANGES,
+    TIER_MAX_STARTS_PER_MINUTE,
+    TIERS,
+    get_tier_times,
+    shard_for,
+    startup_stagger,
+    tier_slots,
+)
+from src.services.worker_leases import acquire_lease, create_worker_leases_table
 from src.web.db import get_user_preferences, get_user_locations, resolve_prefs
 
-setup_logging()
 logger = logging.getLogger(__name__)
 
-# Tier schedule defaults (local times)
-DEFAULT_TIER1_TIMES = "05:30,11:00,15:30,18:30,22:00"
-DEFAULT_TIER2_TIMES = "06:00,17:00"
-DEFAULT_TIER3_TIME = "02:00"
-
-
-def _get_tier_times() -> tuple[list[str], list[str], list[str]]:
-    """Read tier schedule times from env vars or use defaults."""
-    tier1 = os.getenv("TIER1_TIMES", DEFAULT_TIER1_TIMES).split(",")
-    tier2 = os.getenv("TIER2_TIMES", DEFAULT_TIER2_TIMES).split(",")
-    tier3 = os.getenv("TIER3_TIME", DEFAULT_TIER3_TIME).split(",")
-    return [t.strip() for t in tier1], [t.strip() for t in tier2], [t.strip() for t in tier3]
-
-
-def _push_google_calendars(db_path: str = None):
-    """Push forecast events to Google Calendar for all connected users."""
+PUSH_QUEUE_POLL_SECONDS = 5
+
+# Tier refreshes run on this pool; each timezone group's jobs run one at a time
+SCHEDULER_WORKERS = max(1, int(os.getenv("SCHEDULER_WORKERS", "4")))
+scheduler = Scheduler(workers=SCHEDULER_WORKERS)
+tier_start_limiter = TokenBucket(rate=TIER_MAX_STARTS_PER_MINUTE / 60,
+                                 capacity=max(1.0, TIER_MAX_STARTS_PER_MINUTE))
+
+# Sharded mode: SCHEDULER_SHARDS processes each refresh the timezone groups that hash
+# to their SCHEDULER_SHARD, and only while holding that shard's lease
+SCHEDULER_SHARDS = max(1, int(os.getenv("SCHEDULER_SHARDS", "1")))
+SCHEDULER_SHARD = int(os.getenv("SCHEDULER_SHARD", "0"))
+SHARD_LEASE_SECONDS = 90
+# Outlives any single refresh, but not the gap between two runs of the same slot
+RUN_LEASE_SECONDS = 1800
+_shard_held = threading.Event()
+# Set once the startup tier 1 runs are scheduled, which waits for the shard lease
+_startup_scheduled = threading.Event()
+
+
+def _push_google_calendars(db_path: str = None, changed: dict[str, set[str]] | None = None):
+    """Push forecast events to Google Calendar for connected users.
+
+    `changed` maps location -> dates refreshed by the caller. When given, only
+    users subscribed to those locations are pushed, and only for those dates.
+    Without it, every connected user gets a full 14-day push.
+    """
     db_path = db_path or os.getenv("DB_PATH", "data/forecast.db")
     try:
         create_google_tokens_table(db_path)
@@ -45,31 +70,97 @@ def _push_google_calendars(db_path: str = None):
         logger.exception("Failed to ensure google_tokens table")
         return
 
-    connected = get_google_connected_users(db_path)
+    if changed is not None:
+        changed = {loc: dates for loc, dates in changed.items() if dates}
+        if not changed:
+            return
+    connected = get_google_connected_users(db_path, locations=changed.keys() if changed else None)
     if not connected:
         return
 
     store = ForecastStore(db_path=db_path)
-    for user_info in connected:
-        user_id = user_info["user_id"]
+    metrics = run_push(db_path, [u["user_id"] for u in connected],
+                       lambda user_id: _push_user_forecasts(db_path, store, user_id, changed))
+    # Hand failed users to the push queue, which retries them with backoff
+    # (after any rate-limit cool-down) instead of waiting for the next change
+    for user_id, cooldown in metrics.get("failed_users", {}).items():
+        try:
+            enqueue_push_job(db_path, user_id, delay_seconds=cooldown)
+        except Exception:
+            logger.exception("Failed to queue Google push retry for user_id=%s", user_id)
+
+
+def _push_user_forecasts(db_path: str, store: ForecastStore, user_id: int,
+                         changed: dict[str, set[str]] | None = None):
+    """Push one user's stored forecasts, limited to `changed` locations/dates when given."""
+    locations = get_user_locations(db_path, user_id)
+    prefs_row = get_user_preferences(db_path, user_id)
+    prefs = resolve_prefs(prefs_row)
+    for loc in locations:
+        if changed is not None and loc["location"] not in changed:
+            continue
+        forecasts = store.get_forecasts_for_locations([loc["location"]], days=14)
+        prune_beyond = True
+        if changed is not None and forecasts:
+            horizon = forecasts[-1].date
+            forecasts = [f for f in forecasts if f.date in changed[loc["location"]]]
+            # Only prune events past the window when this push reaches its end
+            prune_beyond = bool(forecasts) and forecasts[-1].date == horizon
+        if not forecasts:
+            continue
+        push_events_for_user(db_path, user_id, forecasts, prefs, loc["location"], loc["timezone"],
+                             prune_beyond=prune_beyond)
+    logger.info("Google push complete for user_id=%s", user_id)
+
+
+def _push_queue_worker(db_path: str, stop: threading.Event | None = None):
+    """Drain push_jobs queued by the web app until `stop` is set."""
+    stop = stop or threading.Event()
+    store = ForecastStore(db_path=db_path)
+    while not stop.is_set():
         try:
-            locations = get_user_locations(db_path, user_id)
-            prefs_row = get_user_preferences(db_path, user_id)
-            prefs = resolve_prefs(prefs_row)
-            for loc in locations:
-                forecasts = store.get_forecasts_for_locations([loc["location"]], days=14)
-                push_events_for_user(db_path, user_id, forecasts, prefs, loc["location"], loc["timezone"])
-            logger.info("Google push complete for user_id=%s", user_id)
+            claimed = process_push_jobs(db_path, lambda user_id: _push_user_forecasts(db_path, store, user_id))
         except Exception:
-            logger.exception("Google push failed for user_id=%s", user_id)
+            logger.exception("Push queue worker iteration failed")
+            claimed = 0
+        if not claimed:
+            stop.wait(PUSH_QUEUE_POLL_SECONDS)
 
 
-def _process_and_store(forecasts, store, prefs=None):
-    """Format summaries/descriptions and upsert forecasts into the store."""
-    for f in forecasts:
+def _changed_dates(batch_result: dict) -> dict[str, set[str]]:
+    """Map each location in a batch result to the dates it covers."""
+    return {loc: {f.date for f in forecasts} for loc, forecasts in batch_result.items()}
+
+
+def _process_and_store(forecasts, store, prefs=None) -> list:
+    """Format and upsert forecasts whose content changed; returns the changed ones.
+
+    Rows whose content hash matches the stored one are only touched (last_updated),
+    so staleness tracking still sees the refresh without re-rendering them.
+    """
+    changed = store.changed_forecasts(forecasts)
+    changed_ids = {id(f) for f in changed}
+    store.touch_forecasts([f for f in forecasts if id(f) not in changed_ids])
+    for f in changed:
         f.summary = format_summary(f, prefs) if prefs else format_summary(f)
         f.description = format_detailed_forecast(f, prefs) if prefs else format_detailed_forecast(f)
         store.upsert_forecast(f)
+    return changed
+
+
+def _skip_unchanged_model_run(db_path, store, tier, locations, start, end, latest_run) -> bool:
+    """Skip a tier fetch whose locations and window already reflect the latest upstream run.
+
+    Skipped rows get last_updated bumped: they are confirmed current, so the
+    staleness check shouldn't treat the skip as a missed refresh.
+    """
+    key = model_runs.fetch_key(tier, locations, start)
+    if not model_runs.has_current_run(db_path, key, latest_run):
+        return False
+    store.touch_locations([loc["location"] for loc in locations], start, end)
+    log_refresh_skip(db_path, tier, f"No new model run since {latest_run.isoformat()}")
+    logger.info("Skipping %s refresh for %d locations: no new model run", tier, len(locations))
+    return True
 
 
 def refresh_tier1(locations: list[dict]):
@@ -78,19 +169,30 @@ def refresh_tier1(locations: list[dict]):
         return
     store = ForecastStore()
     db_path = os.getenv("DB_PATH", "data/forecast.db")
+    today = date.today()
+    start = today.isoformat()
+    end = (today + timedelta(days=1)).isoformat()
+    latest_run = ForecastService.get_latest_model_run()
+    if _skip_unchanged_model_run(db_path, store, "tier1", locations, start, end, latest_run):
+        return
+    changed = {}
     try:
         batch_result = ForecastService.fetch_forecasts_batch(
             locations, forecast_days=2,
         )
-        for loc_name, forecasts in batch_result.items():
-            _process_and_store(forecasts, store)
-        logger.info("Tier 1 refresh complete for %d locations", len(locations))
+        stored = {loc_name: _process_and_store(forecasts, store)
+                  for loc_name, forecasts in batch_result.items()}
+        changed = _changed_dates(stored)
+        logger.info("Tier 1 refresh complete for %d locations (%d of %d days changed)", len(locations),
+                    sum(len(v) for v in stored.values()), sum(len(v) for v in batch_result.values()))
         log_refresh_result(db_path, "tier1", success=True)
+        if all(batch_result.get(loc["location"]) for loc in locations):
+            model_runs.record_fetch(db_path, model_runs.fetch_key("tier1", locations, start), latest_run)
     except Exception as exc:
         logger.exception("Tier 1 refresh failed")
         log_refresh_result(db_path, "tier1", success=False, error=str(exc))
     check_and_alert(db_path)
-    _push_google_calendars()
+    _push_google_calendars(changed=changed)
 
 
 def refresh_tier2(locations: list[dict]):
@@ -102,19 +204,27 @@ def refresh_tier2(locations: list[dict]):
     today = date.today()
     start = (today + timedelta(days=2)).isoformat()
     end = (today + timedelta(days=4)).isoformat()
+    latest_run = ForecastService.get_latest_model_run()
+    if _skip_unchanged_model_run(db_path, store, "tier2", locations, start, end, latest_run):
+        return
+    changed = {}
     try:
         batch_result = ForecastService.fetch_forecasts_batch(
             locations, start_date=start, end_date=end,
         )
-        for loc_name, forecasts in batch_result.items():
-            _process_and_store(forecasts, store)
-        logger.info("Tier 2 refresh complete for %d locations", len(locations))
+        stored = {loc_name: _process_and_store(forecasts, store)
+                  for loc_name, forecasts in batch_result.items()}
+        changed = _changed_dates(stored)
+        logger.info("Tier 2 refresh complete for %d locations (%d of %d days changed)", len(locations),
+                    sum(len(v) for v in stored.values()), sum(len(v) for v in batch_result.values()))
         log_refresh_result(db_path, "tier2", success=True)
+        if all(batch_result.get(loc["location"]) for loc in locations):
+            model_runs.record_fetch(db_path, model_runs.fetch_key("tier2", locations, start), latest_run)
     except Exception as exc:
         logger.exception("Tier 2 refresh failed")
         log_refresh_result(db_path, "tier2", success=False, error=str(exc))
     check_and_alert(db_path)
-    _push_google_calendars()
+    _push_google_calendars(changed=changed)
 
 
 def refresh_tier3(locations: list[dict]):
@@ -126,19 +236,77 @@ def refresh_tier3(locations: list[dict]):
     today = date.today()
     start = (today + timedelta(days=5)).isoformat()
     end = (today + timedelta(days=14)).isoformat()
+    latest_run = ForecastService.get_latest_model_run()
+    if _skip_unchanged_model_run(db_path, store, "tier3", locations, start, end, latest_run):
+        return
+    changed = {}
     try:
         batch_result = ForecastService.fetch_forecasts_batch(
             locations, start_date=start, end_date=end,
         )
-        for loc_name, forecasts in batch_result.items():
-            _process_and_store(forecasts, store)
-        logger.info("Tier 3 refresh complete for %d locations", len(locations))
+        stored = {loc_name: _process_and_store(forecasts, store)
+                  for loc_name, forecasts in batch_result.items()}
+        changed = _changed_dates(stored)
+        logger.info("Tier 3 refresh complete for %d locations (%d of %d days changed)", len(locations),
+                    sum(len(v) for v in stored.values()), sum(len(v) for v in batch_result.values()))
         log_refresh_result(db_path, "tier3", success=True)
+        if all(batch_result.get(loc["location"]) for loc in locations):
+            model_runs.record_fetch(db_path, model_runs.fetch_key("tier3", locations, start), latest_run)
     except Exception as exc:
         logger.exception("Tier 3 refresh failed")
         log_refresh_result(db_path, "tier3", success=False, error=str(exc))
     check_and_alert(db_path)
-    _push_google_calendars()
+    _push_google_calendars(changed=changed)
+
+
+def refresh_unified(locations: list[dict], writes: tuple[str, ...] = TIERS):
+    """Fetch the full 15-day horizon in one batch call and write the day ranges of `writes`.
+
+    Days outside those ranges are fetched but neither stored nor pushed; they
+    are written on the runs whose write policy includes them. The model-run
+    check is kept per range, so a range is only skipped once its own days
+    reflect the latest upstream run.
+    """
+    if not locations:
+        return
+    store = ForecastStore()
+    db_path = os.getenv("DB_PATH", "data/forecast.db")
+    today = date.today()
+    ranges = {tier: ((today + timedelta(days=TIER_DAY_RANGES[tier][0])).isoformat(),
+                     (today + timedelta(days=TIER_DAY_RANGES[tier][1])).isoformat())
+              for tier in writes}
+    keys = {tier: model_runs.fetch_key(f"unified_{tier}", locations, start) for tier, (start, _) in ranges.items()}
+    latest_run = ForecastService.get_latest_model_run()
+    if latest_run and all(model_runs.has_current_run(db_path, key, latest_run) for key in keys.values()):
+        for start, end in ranges.values():
+            store.touch_locations([loc["location"] for loc in locations], start, end)
+        log_refresh_skip(db_path, "unified", f"No new model run since {latest_run.isoformat()}")
+        logger.info("Skipping unified refresh for %d locations: no new model run", len(locations))
+        return
+    changed = {}
+    try:
+        batch_result = ForecastService.fetch_forecasts_batch(
+            locations,
+            start_date=today.isoformat(),
+            end_date=(today + timedelta(days=TIER_DAY_RANGES["tier3"][1])).isoformat(),
+        )
+        stored = {
+            loc_name: _process_and_store(
+                [f for f in forecasts if any(start <= f.date <= end for start, end in ranges.values())], store)
+            for loc_name, forecasts in batch_result.items()
+        }
+        changed = _changed_dates(stored)
+        logger.info("Unified refresh (%s) complete for %d locations (%d days changed)", ",".join(writes),
+                    len(locations), sum(len(v) for v in stored.values()))
+        log_refresh_result(db_path, "unified", success=True)
+        if all(batch_result.get(loc["location"]) for loc in locations):
+            for key in keys.values():
+                model_runs.record_fetch(db_path, key, latest_run)
+    except Exception as exc:
+        logger.exception("Unified refresh failed")
+        log_refresh_result(db_path, "unified", success=False, error=str(exc))
+    check_and_alert(db_path)
+    _push_google_calendars(changed=changed)
 
 
 def get_schedule_time() -> str:
@@ -196,73 +364,147 @@ def main():
     _push_google_calendars()
 
 
-def _schedule_tier_jobs(tz_groups: dict[int, list[dict]]):
-    """Schedule tier 1/2/3 jobs for each timezone group."""
-    tier1_times, tier2_times, tier3_times = _get_tier_times()
+def _run_tier(refresh, locations: list[dict], lease_key: str | None = None, **kwargs):
+    """Run a tier refresh. The scheduler only starts it once tier_start_limiter allows.
+
+    With a `lease_key`, the run is skipped if another scheduler process already
+    ran the same slot within RUN_LEASE_SECONDS.
+    """
+    db_path = os.getenv("DB_PATH", "data/forecast.db")
+    if lease_key and not acquire_lease(db_path, f"run:{lease_key}", RUN_LEASE_SECONDS):
+        logger.info("Skipping %s: already run by another scheduler process", lease_key)
+        return
+    refresh(locations, **kwargs)
+
+
+def _shard_lease_key() -> str:
+    return f"shard:{SCHEDULER_SHARD}/{SCHEDULER_SHARDS}"
 
-    for offset, locations in tz_groups.items():
-        loc_names = [loc["location"] for loc in locations]
-        logger.info("Scheduling tiers for UTC%+d: %s", offset, loc_names)
 
-        for local_time in tier1_times:
-            utc_time = local_to_utc(local_time, offset)
-            job = schedule.every().day.at(utc_time).do(refresh_tier1, locations=locations)
-            job.tag(f"tier1_utc{offset}")
+def _owned_groups(tz_groups: dict[str, list[dict]]) -> dict[str, list[dict]]:
+    """The timezone groups this process refreshes: all of them unless sharded."""
+    if SCHEDULER_SHARDS <= 1:
+        return tz_groups
+    if not _shard_held.is_set():
+        return {}
+    return {zone: locations for zone, locations in tz_groups.items()
+            if shard_for(zone, SCHEDULER_SHARDS) == SCHEDULER_SHARD}
 
-        for local_time in tier2_times:
-            utc_time = local_to_utc(local_time, offset)
-            job = schedule.every().day.at(utc_time).do(refresh_tier2, locations=locations)
-            job.tag(f"tier2_utc{offset}")
 
-        for local_time in tier3_times:
-            utc_time = local_to_utc(local_time, offset)
-            job = schedule.every().day.at(utc_time).do(refresh_tier3, locations=locations)
-            job.tag(f"tier3_utc{offset}")
+def _run_lease(name: str) -> dict:
+    return {"lease_key": name} if SCHEDULER_SHARDS > 1 else {}
 
 
-def reschedule():
-    """Clear and recreate all tier jobs. Handles DST transitions and new users."""
+def _renew_shard_lease(db_path: str):
+    """Keep this process's shard lease, starting or pausing tier jobs when ownership changes."""
+    held = acquire_lease(db_path, _shard_lease_key(), SHARD_LEASE_SECONDS)
+    if held and not _shard_held.is_set():
+        _shard_held.set()
+        logger.info("Acquired scheduler shard %s", _shard_lease_key())
+        tz_groups = reschedule()
+        if not _startup_scheduled.is_set():
+            _schedule_startup_runs(tz_groups)
+    elif not held and _shard_held.is_set():
+        _shard_held.clear()
+        logger.error("Lost scheduler shard %s to another process, pausing tier jobs", _shard_lease_key())
+        scheduler.cancel("tier")
+    elif not held:
+        logger.warning("Scheduler shard %s is held by another process, waiting", _shard_lease_key())
+
+
+def _shard_lease_worker(db_path: str, stop: threading.Event | None = None):
+    """Renew the shard lease every third of its lifetime until `stop` is set."""
+    stop = stop or threading.Event()
+    while not stop.wait(SHARD_LEASE_SECONDS / 3):
+        try:
+            _renew_shard_lease(db_path)
+        except Exception:
+            logger.exception("Shard lease renewal failed")
+
+
+def _schedule_tier_jobs(tz_groups: dict[str, list[dict]]):
+    """Schedule tier 1/2/3 jobs (or unified jobs) for each timezone group at its staggered local tier times."""
+    refreshes = {"tier1": refresh_tier1, "tier2": refresh_tier2, "tier3": refresh_tier3}
+    for zone, locations in tz_groups.items():
+        logger.info("Scheduling tiers for %s: %s", zone, [loc["location"] for loc in locations])
+
+    for slot in tier_slots(tz_groups, get_tier_times()):
+        if slot.tier == "unified":
+            scheduler.add(slot.name, _run_tier, slot.next_run, group=slot.zone, tags=("tier", slot.tier),
+                          limiter=tier_start_limiter, refresh=refresh_unified, locations=slot.locations,
+                          writes=slot.writes, **_run_lease(slot.name))
+        else:
+            scheduler.add(slot.name, _run_tier, slot.next_run, group=slot.zone, tags=("tier", slot.tier),
+                          limiter=tier_start_limiter, refresh=refreshes[slot.tier], locations=slot.locations,
+                          **_run_lease(slot.name))
+
+
+def _schedule_startup_runs(tz_groups: dict[str, list[dict]]):
+    """Run tier 1 once for each group, spread over STARTUP_STAGGER_SECONDS."""
+    if not tz_groups:
+        return
+    now = datetime.now(timezone.utc)
+    for zone, locations in tz_groups.items():
+        scheduler.add(f"tier1_{zone}_startup", _run_tier, None, group=zone, limiter=tier_start_limiter,
+                      start=now + timedelta(seconds=startup_stagger(zone)),
+                      refresh=refresh_tier1, locations=locations, **_run_lease(f"tier1_{zone}_startup"))
+    _startup_scheduled.set()
+
+
+def reschedule() -> dict[str, list[dict]]:
+    """Clear and recreate all tier jobs, picking up new users and regrouping timezones.
+
+    Returns the timezone groups this process now owns.
+    """
     logger.info("Rescheduling all tier jobs")
-    schedule.clear("tier1")
-    schedule.clear("tier2")
-    schedule.clear("tier3")
-    # Clear all tier-tagged jobs
-    for job in list(schedule.get_jobs()):
-        tags = getattr(job, "tags", set())
-        if any(t.startswith("tier") for t in tags):
-            schedule.cancel_job(job)
-
-    tz_groups = group_locations_by_tz_offset()
+    scheduler.cancel("tier")
+
+    tz_groups = _owned_groups(group_locations_by_timezone())
     _schedule_tier_jobs(tz_groups)
-    logger.info("Rescheduled %d jobs across %d timezone groups", len(schedule.get_jobs()), len(tz_groups))
+    logger.info("Rescheduled %d jobs across %d timezone groups", len(scheduler.jobs()), len(tz_groups))
+    late = {name: m for name, m in scheduler.lag_metrics().items() if m["late_runs"] or m["skipped"]}
+    if late:
+        logger.warning("Scheduler lag so far: %s", late)
+    return tz_groups
 
 
 def schedule_jobs():
     """Set up the tiered scheduler and run the event loop."""
-    tz_groups = group_locations_by_tz_offset()
+    db_path = os.getenv("DB_PATH", "data/forecast.db")
+    if SCHEDULER_SHARDS > 1:
+        if not 0 <= SCHEDULER_SHARD < SCHEDULER_SHARDS:
+            raise ValueError(f"SCHEDULER_SHARD must be in [0, {SCHEDULER_SHARDS}), got {SCHEDULER_SHARD}")
+        create_worker_leases_table(db_path)
+        if acquire_lease(db_path, _shard_lease_key(), SHARD_LEASE_SECONDS):
+            _shard_held.set()
+        else:
+            logger.warning("Scheduler shard %s is held by another process, waiting", _shard_lease_key())
+        # Renewed off the scheduler pool, so long refreshes can't starve the lease
+        threading.Thread(target=_shard_lease_worker, args=(db_path,), name="shard-lease", daemon=True).start()
+
+    tz_groups = _owned_groups(group_locations_by_timezone())
     _schedule_tier_jobs(tz_groups)
 
-    # Daily reschedule at 00:00 UTC to handle DST transitions and new users
-    reschedule_job = schedule.every().day.at("00:00").do(reschedule)
-    reschedule_job.tag("reschedule")
+    # Daily reschedule at 00:00 UTC to pick up new users and regroup timezones
+    scheduler.add("reschedule", reschedule, daily_at("00:00"), tags=("reschedule",))
 
-    # Hourly staleness check as safety net
-    db_path = os.getenv("DB_PATH", "data/forecast.db")
-    staleness_job = schedule.every(1).hours.do(check_and_alert, db_path=db_path)
-    staleness_job.tag("staleness_check")
+    # Hourly staleness check as safety net, poll-log rollups and admin stats reconcile (once across shards)
+    if SCHEDULER_SHARD == 0:
+        scheduler.add("staleness_check", check_and_alert, every(3600), tags=("staleness_check",),
+                      db_path=db_path)
+        scheduler.add("poll_rollup", rollup_poll_log, every(ROLLUP_INTERVAL_SECONDS), tags=("poll_rollup",),
+                      db_path=db_path)
+        scheduler.add("admin_stats_reconcile", reconcile_admin_user_stats, every(RECONCILE_INTERVAL_SECONDS),
+                      tags=("admin_stats_reconcile",), db_path=db_path)
 
-    # Run tier 1 immediately on startup for all groups
-    for offset, locations in tz_groups.items():
-        refresh_tier1(locations)
+    # Web routes queue Google pushes; drain them off the scheduling thread
+    threading.Thread(target=_push_queue_worker, args=(db_path,), name="push-queue", daemon=True).start()
 
-    total_jobs = len(schedule.get_jobs())
-    logger.info("Scheduler started with %d jobs across %d timezone groups. Waiting for tasks...",
-                total_jobs, len(tz_groups))
-
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    # Run tier 1 on startup for the owned groups; a shard still held elsewhere
+    # gets its startup runs from _renew_shard_lease once it takes the lease
+    _schedule_startup_runs(tz_groups)
 
+    logger.info("Scheduler started with %d jobs across %d timezone groups. Waiting for tasks...",
+                len(scheduler.jobs()), len(tz_groups))
+    scheduler.run_forever()
 
-if __name__ == "__main__":
-    schedule_jobs()
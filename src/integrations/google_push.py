@@ -1,16 +1,17 @@
+from __future__ import annotations
+
+import json
 import logging
 import os
 import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from google.auth.exceptions import RefreshError
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-
 from src.services.calendar_events import (
     CalendarEvent,
     build_calendar_events,
@@ -19,11 +20,50 @@ from src.services.calendar_events import (
 )
 from src.services.admin_alerts import send_google_alert
 from src.utils.db import get_connection as _conn
+from src.utils.rate_limit import TokenBucket
+
+# The Google client libraries take a few hundred ms to import and only the
+# OAuth routes and push jobs need them, so they are imported where used.
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import Flow
+    from googleapiclient.errors import HttpError
 
 logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/calendar.app.created"]
 
+# Google caps batch requests at 50 calls each for the Calendar API
+BATCH_SIZE = 50
+BATCH_MAX_ATTEMPTS = 3
+BATCH_RETRY_DELAY_SECONDS = 2
+_RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded")
+# How long to leave a user whose push ended rate limited, when Google sends no Retry-After
+RATE_LIMIT_COOLDOWN_SECONDS = int(os.getenv("GOOGLE_RATE_LIMIT_COOLDOWN_SECONDS", "300"))
+
+# Shared by every push thread; size GOOGLE_API_QPS to the project's Calendar API quota.
+# Each call inside a batch counts against the quota, so a full batch takes BATCH_SIZE tokens.
+GOOGLE_API_QPS = float(os.getenv("GOOGLE_API_QPS", "10"))
+api_rate_limiter = TokenBucket(rate=GOOGLE_API_QPS, capacity=BATCH_SIZE)
+
+# API calls made by each thread, so push_executor can count a run's own requests
+# while other runs share the limiter
+_api_calls = threading.local()
+
+# Refresh access tokens this long before they expire so a push never starts
+# with a token that lapses halfway through its batches.
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# user_id -> (credentials, calendar_id, service); see _get_calendar_service
+_service_cache: dict[int, tuple[Credentials, str, object]] = {}
+_service_cache_lock = threading.Lock()
+
+# One push per user at a time: the push queue and tier refreshes can both
+# reach a user, and a cached service's httplib2 transport is not thread-safe
+# (concurrent syncs would also race on the stored syncToken)
+_push_locks: dict[int, threading.Lock] = {}
+_push_locks_lock = threading.Lock()
+
 
 def create_google_tokens_table(db_path: str) -> None:
     conn = _conn(db_path)
@@ -41,12 +81,55 @@ def create_google_tokens_table(db_path: str) -> None:
             )
         """)
         conn.commit()
-        # Migration: add alert_sent_at column if missing
-        try:
-            conn.execute("ALTER TABLE google_tokens ADD COLUMN alert_sent_at TEXT")
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass  # Column already exists
+        # Migration: add alert_sent_at and sync_token columns if missing
+        for col_def in ["alert_sent_at TEXT", "sync_token TEXT"]:
+            try:
+                conn.execute(f"ALTER TABLE google_tokens ADD COLUMN {col_def}")
+                conn.commit()
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+        # Local mirror of the remote WeatherCal calendar, kept current via syncToken
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS google_events (
+                user_id    INTEGER NOT NULL,
+                event_id   TEXT    NOT NULL,
+                ical_uid   TEXT,
+                start_date TEXT,
+                is_allday  INTEGER NOT NULL DEFAULT 0,
+                status     TEXT,
+                PRIMARY KEY (user_id, event_id)
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_google_events_uid ON google_events (user_id, ical_uid)"
+        )
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS google_push_log (
+                id               INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at       TEXT    NOT NULL,
+                duration_seconds REAL    NOT NULL,
+                users_total      INTEGER NOT NULL,
+                users_succeeded  INTEGER NOT NULL,
+                users_failed     INTEGER NOT NULL,
+                rate_limited     INTEGER NOT NULL,
+                api_requests     INTEGER NOT NULL,
+                error            TEXT
+            )
+        """)
+        # Durable per-user push queue drained by the scheduler (see push_queue)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS push_jobs (
+                user_id     INTEGER PRIMARY KEY,
+                status      TEXT    NOT NULL DEFAULT 'pending',
+                attempts    INTEGER NOT NULL DEFAULT 0,
+                run_after   TEXT    NOT NULL,
+                enqueued_at TEXT    NOT NULL,
+                last_error  TEXT,
+                updated_at  TEXT    NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_push_jobs_run_after ON push_jobs (run_after)")
+        conn.commit()
     finally:
         conn.close()
 
@@ -56,6 +139,8 @@ def google_oauth_enabled() -> bool:
 
 
 def get_oauth_flow(redirect_uri: str) -> Flow:
+    from google_auth_oauthlib.flow import Flow
+
     client_config = {
         "web": {
             "client_id": os.getenv("GOOGLE_CLIENT_ID"),
@@ -86,12 +171,17 @@ def store_google_tokens(
             (user_id, credentials.token, credentials.refresh_token, token_expiry,
              calendar_id, user_id, now, now),
         )
+        # A (re)connect creates a fresh calendar, so any mirrored state is obsolete
+        conn.execute("DELETE FROM google_events WHERE user_id = ?", (user_id,))
         conn.commit()
     finally:
         conn.close()
+    invalidate_google_service(user_id)
 
 
 def get_google_credentials(db_path: str, user_id: int) -> Credentials | None:
+    from google.oauth2.credentials import Credentials
+
     conn = _conn(db_path)
     try:
         row = conn.execute(
@@ -113,8 +203,21 @@ def get_google_credentials(db_path: str, user_id: int) -> Credentials | None:
         conn.close()
 
 
+def _expires_soon(credentials: Credentials) -> bool:
+    if not credentials.expiry:
+        return False
+    expiry = credentials.expiry
+    if expiry.tzinfo is not None:
+        expiry = expiry.astimezone(timezone.utc).replace(tzinfo=None)
+    # google-auth keeps expiry as naive UTC
+    return expiry - TOKEN_REFRESH_MARGIN <= datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 def refresh_and_persist(db_path: str, user_id: int, credentials: Credentials) -> Credentials | None:
-    if credentials.valid:
+    from google.auth.exceptions import RefreshError
+    from google.auth.transport.requests import Request
+
+    if credentials.valid and not _expires_soon(credentials):
         return credentials
     try:
         credentials.refresh(Request())
@@ -150,11 +253,14 @@ def _mark_revoked(db_path: str, user_id: int) -> None:
         conn.commit()
     finally:
         conn.close()
+    invalidate_google_service(user_id)
     send_google_alert(db_path, user_id, "revoked")
 
 
 def delete_google_calendar(db_path: str, user_id: int) -> None:
     """Delete the WeatherCal calendar from the user's Google account."""
+    from googleapiclient.errors import HttpError
+
     credentials = get_google_credentials(db_path, user_id)
     if not credentials:
         return
@@ -192,9 +298,11 @@ def delete_google_tokens(db_path: str, user_id: int) -> None:
     conn = _conn(db_path)
     try:
         conn.execute("DELETE FROM google_tokens WHERE user_id = ?", (user_id,))
+        conn.execute("DELETE FROM google_events WHERE user_id = ?", (user_id,))
         conn.commit()
     finally:
         conn.close()
+    invalidate_google_service(user_id)
 
 
 def is_google_connected(db_path: str, user_id: int) -> bool:
@@ -209,19 +317,49 @@ def is_google_connected(db_path: str, user_id: int) -> bool:
         conn.close()
 
 
-def get_google_connected_users(db_path: str) -> list[dict]:
+def get_google_connected_users(db_path: str, locations=None) -> list[dict]:
+    """Return active Google users, optionally only those subscribed to one of `locations`."""
     conn = _conn(db_path)
     try:
-        rows = conn.execute(
-            "SELECT user_id, google_calendar_id FROM google_tokens WHERE status = 'active'"
-        ).fetchall()
+        if locations is None:
+            rows = conn.execute(
+                "SELECT user_id, google_calendar_id FROM google_tokens WHERE status = 'active'"
+            ).fetchall()
+        else:
+            locations = list(locations)
+            if not locations:
+                return []
+            placeholders = ",".join("?" * len(locations))
+            rows = conn.execute(
+                f"""SELECT DISTINCT gt.user_id, gt.google_calendar_id
+                    FROM google_tokens gt
+                    JOIN user_locations ul ON ul.user_id = gt.user_id
+                    WHERE gt.status = 'active' AND ul.location IN ({placeholders})""",
+                locations,
+            ).fetchall()
         return [dict(r) for r in rows]
     finally:
         conn.close()
 
 
+@lru_cache(maxsize=1)
+def _discovery_document() -> dict:
+    """Calendar v3 discovery document, parsed once from the copy bundled with googleapiclient."""
+    from googleapiclient import discovery_cache
+
+    return json.loads(discovery_cache.get_static_doc("calendar", "v3"))
+
+
 def build_google_service(credentials: Credentials):
-    return build("calendar", "v3", credentials=credentials)
+    from googleapiclient.discovery import build_from_document
+
+    return build_from_document(_discovery_document(), credentials=credentials)
+
+
+def invalidate_google_service(user_id: int) -> None:
+    """Drop the cached credentials and service for a user."""
+    with _service_cache_lock:
+        _service_cache.pop(user_id, None)
 
 
 def create_weathercal_calendar(service, location: str = "") -> str:
@@ -234,194 +372,420 @@ def create_weathercal_calendar(service, location: str = "") -> str:
     return created["id"]
 
 
-def _get_valid_credentials(db_path, user_id):
-    """Retrieve and refresh Google credentials. Returns (credentials, calendar_id) or (None, None)."""
-    credentials = get_google_credentials(db_path, user_id)
-    if not credentials:
-        return None, None
-    credentials = refresh_and_persist(db_path, user_id, credentials)
-    if not credentials:
-        return None, None
+def _get_calendar_service(db_path, user_id):
+    """Return (service, calendar_id) for a user, or (None, None) if they can't be pushed.
 
+    Services are cached per user and reused while the stored access token and
+    calendar id still match, so a steady-state push costs one primary-key read.
+    A token change made elsewhere (refresh, reconnect) rebuilds the entry.
+    """
     conn = _conn(db_path)
     try:
         row = conn.execute(
-            "SELECT google_calendar_id FROM google_tokens WHERE user_id = ?", (user_id,)
+            """SELECT access_token, google_calendar_id FROM google_tokens
+               WHERE user_id = ? AND status = 'active'""",
+            (user_id,),
         ).fetchone()
     finally:
         conn.close()
-
-    calendar_id = row["google_calendar_id"] if row else None
+    if not row:
+        invalidate_google_service(user_id)
+        return None, None
+    calendar_id = row["google_calendar_id"]
     if not calendar_id:
+        invalidate_google_service(user_id)
         logger.warning("No calendar_id for user_id=%s, skipping push", user_id)
         return None, None
 
-    return credentials, calendar_id
+    with _service_cache_lock:
+        cached = _service_cache.get(user_id)
+    if cached and cached[0].token == row["access_token"] and cached[1] == calendar_id:
+        credentials, _, service = cached
+        # Refreshing updates the credentials object the service already holds
+        if not refresh_and_persist(db_path, user_id, credentials):
+            return None, None
+        return service, calendar_id
 
-
-def push_events_for_user(db_path, user_id, forecasts, prefs, location, tz_name):
-    credentials, calendar_id = _get_valid_credentials(db_path, user_id)
+    credentials = get_google_credentials(db_path, user_id)
     if not credentials:
-        return
+        return None, None
+    credentials = refresh_and_persist(db_path, user_id, credentials)
+    if not credentials:
+        return None, None
+
+    service = build_google_service(credentials)
+    with _service_cache_lock:
+        _service_cache[user_id] = (credentials, calendar_id, service)
+    return service, calendar_id
+
+
+def _push_lock(user_id: int) -> threading.Lock:
+    with _push_locks_lock:
+        return _push_locks.setdefault(user_id, threading.Lock())
+
+
+def push_events_for_user(db_path, user_id, forecasts, prefs, location, tz_name, prune_beyond=True):
+    """Push the given forecast days to the user's WeatherCal calendar.
+
+    With prune_beyond=False only the pushed dates are reconciled, so a partial
+    push (e.g. days 0-1 from a tier 1 refresh) leaves later days untouched.
+    Pushes for the same user are serialised.
+    """
+    with _push_lock(user_id):
+        _push_events_for_user(db_path, user_id, forecasts, prefs, tz_name, prune_beyond)
+
+
+def _push_events_for_user(db_path, user_id, forecasts, prefs, tz_name, prune_beyond):
+    from google.auth.exceptions import RefreshError
+    from googleapiclient.errors import HttpError
 
     try:
-        service = build_google_service(credentials)
+        service, calendar_id = _get_calendar_service(db_path, user_id)
     except Exception:
         logger.exception("Failed to build Google service for user_id=%s", user_id)
         return
+    if not service:
+        return
 
+    expected_by_date = {}
+    event_bodies = []
     try:
-        tz = ZoneInfo(tz_name) if tz_name else timezone.utc
-    except ZoneInfoNotFoundError:
-        tz = timezone.utc
+        # A failed sync aborts the push: diffing against a stale mirror could
+        # delete events that were changed remotely
+        _sync_remote_events(db_path, user_id, service, calendar_id, tz_name)
+
+        for forecast in forecasts:
+            events = _build_forecast_events(forecast, prefs)
+            expected_by_date[forecast.date] = (
+                {e.uid for e in events if e.is_allday},
+                {e.uid for e in events if not e.is_allday},
+            )
+            event_bodies.extend(_calendar_event_to_google_body(ce, tz_name) for ce in events)
 
-    forecast_dates = set()
-    for forecast in forecasts:
-        forecast_dates.add(forecast.date)
-        try:
-            _push_forecast_events(service, calendar_id, forecast, prefs, tz, tz_name)
-        except HttpError as e:
-            if e.resp.status == 404:
-                logger.warning("Calendar %s not found for user_id=%s, clearing calendar_id", calendar_id, user_id)
-                _clear_calendar_id(db_path, user_id)
-                return
-            raise
-        except RefreshError:
-            _mark_revoked(db_path, user_id)
+        stale_event_ids = _find_stale_event_ids(db_path, user_id, expected_by_date, prune_beyond)
+        existing = _get_event_ids_by_uid(db_path, user_id, [b["iCalUID"] for b in event_bodies])
+        _apply_event_changes(service, calendar_id, event_bodies, stale_event_ids, existing)
+    except HttpError as e:
+        if e.resp.status == 404:
+            logger.warning("Calendar %s not found for user_id=%s, clearing calendar_id", calendar_id, user_id)
+            _clear_calendar_id(db_path, user_id)
             return
+        raise
+    except RefreshError:
+        _mark_revoked(db_path, user_id)
+        return
+
 
-    # Clean up events beyond the forecast window
-    if forecast_dates:
+def _list_event_changes(service, calendar_id, sync_token):
+    """Page through events().list; incremental when a sync token is given.
+
+    Returns (items, next_sync_token). Deleted events come back with
+    status 'cancelled' so their iCalUIDs stay known for later updates.
+    """
+    items = []
+    page_token = None
+    while True:
+        kwargs = {"calendarId": calendar_id, "showDeleted": True, "maxResults": 2500}
+        if sync_token:
+            kwargs["syncToken"] = sync_token
+        if page_token:
+            kwargs["pageToken"] = page_token
+        response = _execute(service.events().list(**kwargs))
+        items.extend(response.get("items", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return items, response.get("nextSyncToken")
+
+
+def _event_start_date(start: dict, tz_name: str | None) -> str | None:
+    """Local date of a Google event start, in tz_name (else the event's own zone).
+
+    Timed events come back in the calendar's zone (UTC for WeatherCal
+    calendars), so the date has to be taken after converting to the zone the
+    forecast dates are in.
+    """
+    if start.get("date"):
+        return start["date"]
+    raw = start.get("dateTime")
+    if not raw:
+        return None
+    start_dt = datetime.fromisoformat(raw)
+    for zone in (tz_name, start.get("timeZone")):
+        if not zone or start_dt.tzinfo is None:
+            continue
         try:
-            _cleanup_beyond_forecast(service, calendar_id, forecast_dates, tz)
-        except HttpError:
-            logger.warning("Failed to clean up events beyond forecast window", exc_info=True)
+            return start_dt.astimezone(ZoneInfo(zone)).date().isoformat()
+        except (ZoneInfoNotFoundError, ValueError):
+            continue
+    return start_dt.date().isoformat()
 
 
-def _upsert_event(service, calendar_id, event_body):
-    """Insert or update an event by iCalUID.
+def _sync_remote_events(db_path, user_id, service, calendar_id, tz_name: str | None = None) -> None:
+    """Bring the google_events mirror up to date with the remote calendar.
 
-    Uses update() (HTTP PUT) for all existing events — full replacement ensures
-    changes propagate to all clients, including iCal. patch() can silently
-    succeed without syncing visibility changes for corrupted/cancelled events.
+    Uses the stored syncToken so only changes since the last run are fetched.
+    A 410 Gone means the token expired; the mirror is then rebuilt from a full sync.
+    Timed events are dated in tz_name, the zone the forecast dates are in.
     """
-    ical_uid = event_body["iCalUID"]
-
-    # Check for existing event (including soft-deleted)
-    existing = service.events().list(
-        calendarId=calendar_id, iCalUID=ical_uid,
-        showDeleted=True, maxResults=1
-    ).execute()
-    items = existing.get("items", [])
-
-    if items:
-        event_id = items[0]["id"]
-        update_body = {k: v for k, v in event_body.items() if k != "iCalUID"}
-        update_body["status"] = "confirmed"
-        service.events().update(
-            calendarId=calendar_id, eventId=event_id, body=update_body
-        ).execute()
-        logger.info("Updated event uid=%s summary=%s", ical_uid, event_body.get("summary", "")[:50])
-    else:
-        service.events().import_(calendarId=calendar_id, body=event_body).execute()
-        logger.info("Inserted event uid=%s summary=%s", ical_uid, event_body.get("summary", "")[:50])
+    from googleapiclient.errors import HttpError
+
+    conn = _conn(db_path)
+    try:
+        row = conn.execute(
+            "SELECT sync_token FROM google_tokens WHERE user_id = ?", (user_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+    sync_token = row["sync_token"] if row else None
+
+    try:
+        items, next_sync_token = _list_event_changes(service, calendar_id, sync_token)
+    except HttpError as e:
+        if e.resp.status != 410 or not sync_token:
+            raise
+        logger.info("Sync token expired for user_id=%s, running full resync", user_id)
+        sync_token = None
+        items, next_sync_token = _list_event_changes(service, calendar_id, None)
+
+    conn = _conn(db_path)
+    try:
+        if sync_token is None:
+            conn.execute("DELETE FROM google_events WHERE user_id = ?", (user_id,))
+        for event in items:
+            start = event.get("start", {})
+            is_allday = "date" in start and "dateTime" not in start
+            start_date = _event_start_date(start, tz_name)
+            conn.execute(
+                """INSERT INTO google_events (user_id, event_id, ical_uid, start_date, is_allday, status)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(user_id, event_id) DO UPDATE SET
+                       ical_uid   = COALESCE(excluded.ical_uid, ical_uid),
+                       start_date = COALESCE(excluded.start_date, start_date),
+                       is_allday  = CASE WHEN excluded.start_date IS NULL
+                                         THEN is_allday ELSE excluded.is_allday END,
+                       status     = excluded.status""",
+                (user_id, event["id"], event.get("iCalUID"), start_date,
+                 1 if is_allday else 0, event.get("status", "confirmed")),
+            )
+        conn.execute(
+            "UPDATE google_tokens SET sync_token = ? WHERE user_id = ?",
+            (next_sync_token, user_id),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    logger.info("Synced %d remote event changes for user_id=%s (%s)", len(items), user_id,
+                "incremental" if sync_token else "full")
 
 
-def _cleanup_stale_events(service, calendar_id, date_str,
-                          expected_allday_uids, expected_timed_uids, tz):
-    """Delete WeatherCal events for a date whose iCalUID is not in the expected sets.
+def _find_stale_event_ids(db_path, user_id, expected_by_date: dict, prune_beyond: bool = True) -> list[str]:
+    """Return IDs of mirrored WeatherCal events that should no longer exist.
 
-    Only deletes events with @weathercal.app UIDs to avoid touching
-    user-created events in the same calendar.
+    expected_by_date maps date -> (expected_allday_uids, expected_timed_uids).
+    An event is stale if it falls on a forecast date but its iCalUID is not
+    expected for its kind, or (with prune_beyond) if it falls beyond the last
+    forecast date. Only @weathercal.app UIDs are considered, so user-created
+    events are never touched.
     """
-    from datetime import date as date_type
+    if not expected_by_date:
+        return []
+    first_date, last_date = min(expected_by_date), max(expected_by_date)
+    conn = _conn(db_path)
+    try:
+        rows = conn.execute(
+            """SELECT event_id, ical_uid, start_date, is_allday FROM google_events
+               WHERE user_id = ? AND status != 'cancelled' AND start_date >= ?
+                 AND ical_uid LIKE '%@weathercal.app'""",
+            (user_id, first_date),
+        ).fetchall()
+    finally:
+        conn.close()
 
+    stale_ids = []
+    for row in rows:
+        if row["start_date"] > last_date:
+            if prune_beyond:
+                stale_ids.append(row["event_id"])
+        elif row["start_date"] in expected_by_date:
+            expected_allday_uids, expected_timed_uids = expected_by_date[row["start_date"]]
+            expected = expected_allday_uids if row["is_allday"] else expected_timed_uids
+            if row["ical_uid"] not in expected:
+                stale_ids.append(row["event_id"])
+    return stale_ids
+
+
+def _get_event_ids_by_uid(db_path, user_id, ical_uids) -> dict:
+    """Map iCalUIDs to mirrored Google event IDs (including soft-deleted events)."""
+    if not ical_uids:
+        return {}
+    placeholders = ",".join("?" * len(ical_uids))
+    conn = _conn(db_path)
     try:
-        day = date_type.fromisoformat(date_str)
-        day_start = datetime.combine(day, datetime.min.time()).replace(tzinfo=tz)
-        day_end = day_start + timedelta(days=1)
-
-        existing = service.events().list(
-            calendarId=calendar_id,
-            timeMin=day_start.isoformat(),
-            timeMax=day_end.isoformat(),
-            singleEvents=True,
-            maxResults=100,
-        ).execute()
-
-        for event in existing.get("items", []):
-            ical_uid = event.get("iCalUID", "")
-            if not ical_uid:
-                continue
-            if "@weathercal.app" not in ical_uid:
-                continue
+        rows = conn.execute(
+            f"""SELECT ical_uid, event_id FROM google_events
+                WHERE user_id = ? AND ical_uid IN ({placeholders})
+                ORDER BY status = 'cancelled' DESC""",
+            [user_id] + list(ical_uids),
+        ).fetchall()
+    finally:
+        conn.close()
+    # Live events sort last, so they win over cancelled copies of the same UID
+    return {row["ical_uid"]: row["event_id"] for row in rows}
 
-            is_timed = "dateTime" in event.get("start", {})
-            is_allday = "date" in event.get("start", {}) and "dateTime" not in event.get("start", {})
 
-            # Skip all-day events that belong to a different date — timezone
-            # offsets cause Google's time-range query to return adjacent days'
-            # all-day events (e.g. querying for Mar 13 in Europe/Berlin returns
-            # the Mar 12 all-day event because timeMin in UTC is Mar 12 23:00).
-            if is_allday and event.get("start", {}).get("date") != date_str:
-                continue
+def _acquire_api_calls(n: int = 1) -> None:
+    api_rate_limiter.acquire(n)
+    _api_calls.count = getattr(_api_calls, "count", 0) + n
 
-            should_delete = False
-            if is_timed and ical_uid not in expected_timed_uids:
-                should_delete = True
-            elif is_allday and ical_uid not in expected_allday_uids:
-                should_delete = True
-
-            if should_delete:
-                try:
-                    service.events().delete(
-                        calendarId=calendar_id, eventId=event["id"],
-                    ).execute()
-                except HttpError:
-                    logger.warning("Failed to delete stale event %s", event["id"], exc_info=True)
-    except HttpError:
-        logger.warning("Failed to list events for cleanup on %s", date_str, exc_info=True)
-
-
-def _cleanup_beyond_forecast(service, calendar_id, forecast_dates, tz):
-    """Delete WeatherCal events for dates beyond the current forecast window."""
-    from datetime import date as date_type
 
-    parsed_dates = sorted(date_type.fromisoformat(d) for d in forecast_dates)
-    last_forecast = parsed_dates[-1]
-    # Look 14 days past the last forecast date to catch any stale events
-    scan_start = last_forecast + timedelta(days=1)
-    scan_end = last_forecast + timedelta(days=15)
-
-    start_dt = datetime.combine(scan_start, datetime.min.time()).replace(tzinfo=tz)
-    end_dt = datetime.combine(scan_end, datetime.min.time()).replace(tzinfo=tz)
-
-    existing = service.events().list(
-        calendarId=calendar_id,
-        timeMin=start_dt.isoformat(),
-        timeMax=end_dt.isoformat(),
-        singleEvents=True,
-        maxResults=250,
-    ).execute()
-
-    for event in existing.get("items", []):
-        ical_uid = event.get("iCalUID", "")
-        if not ical_uid or "@weathercal.app" not in ical_uid:
-            continue
-        # Skip all-day events that belong to a forecast date — timezone offsets
-        # cause the last forecast day's all-day event to appear in this query.
-        start = event.get("start", {})
-        if "date" in start and "dateTime" not in start:
-            event_date = start["date"]
-            if event_date in forecast_dates:
-                continue
+def api_calls_in_thread() -> int:
+    """Running total of Calendar API calls made by the current thread."""
+    return getattr(_api_calls, "count", 0)
+
+
+def _execute(request):
+    """Execute one Calendar API request, retrying rate-limited attempts like _run_batch."""
+    from googleapiclient.errors import HttpError
+
+    for attempt in range(1, BATCH_MAX_ATTEMPTS + 1):
+        _acquire_api_calls()
+        try:
+            return request.execute()
+        except HttpError as e:
+            if not is_rate_limited_error(e) or attempt == BATCH_MAX_ATTEMPTS:
+                raise
+        delay = BATCH_RETRY_DELAY_SECONDS * attempt
+        logger.warning("Google request rate limited, retrying in %ss", delay)
+        time.sleep(delay)
+
+
+def is_rate_limited_error(exc: HttpError) -> bool:
+    """True for Google's 429 and 403 rate/quota errors (as opposed to permission 403s)."""
+    status = exc.resp.status
+    if status == 429:
+        return True
+    if status != 403:
+        return False
+    content = exc.content.decode(errors="ignore") if isinstance(exc.content, bytes) else str(exc.content)
+    return any(reason in content for reason in _RATE_LIMIT_REASONS)
+
+
+def rate_limit_cooldown(exc: HttpError) -> float:
+    """Seconds to wait before pushing a rate-limited user again.
+
+    Uses the response's Retry-After (seconds or an HTTP date) when present,
+    otherwise RATE_LIMIT_COOLDOWN_SECONDS.
+    """
+    value = exc.resp.get("retry-after") if isinstance(exc.resp, dict) else None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
         try:
-            service.events().delete(
-                calendarId=calendar_id, eventId=event["id"]
-            ).execute()
-            logger.debug("Deleted beyond-window event %s (uid=%s)", event["id"], ical_uid)
-        except HttpError:
-            logger.warning("Failed to delete beyond-window event %s", event["id"], exc_info=True)
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            when = None
+        if when is not None:
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    return float(RATE_LIMIT_COOLDOWN_SECONDS)
+
+
+def _run_batch(service, requests: dict) -> dict:
+    """Execute Calendar API requests via batch HTTP, BATCH_SIZE per round trip.
+
+    Returns {request_id: (response, HttpError | None)}. Items that fail with a
+    rate-limit error are retried in a follow-up batch with linear backoff; any
+    other per-item error is handed back to the caller to interpret.
+    """
+    from googleapiclient.errors import HttpError
+
+    results = {}
+    pending = dict(requests)
+    for attempt in range(1, BATCH_MAX_ATTEMPTS + 1):
+        rate_limited = {}
+
+        def _callback(request_id, response, exception):
+            if (isinstance(exception, HttpError) and is_rate_limited_error(exception)
+                    and attempt < BATCH_MAX_ATTEMPTS):
+                rate_limited[request_id] = pending[request_id]
+            else:
+                results[request_id] = (response, exception)
+
+        request_ids = list(pending)
+        for start in range(0, len(request_ids), BATCH_SIZE):
+            chunk = request_ids[start:start + BATCH_SIZE]
+            batch = service.new_batch_http_request(callback=_callback)
+            for request_id in chunk:
+                batch.add(pending[request_id], request_id=request_id)
+            _acquire_api_calls(len(chunk))
+            batch.execute()
+
+        if not rate_limited:
+            break
+        delay = BATCH_RETRY_DELAY_SECONDS * attempt
+        logger.warning("%d Google requests rate limited, retrying in %ss", len(rate_limited), delay)
+        time.sleep(delay)
+        pending = rate_limited
+    return results
+
+
+def _apply_event_changes(service, calendar_id, event_bodies, stale_event_ids, existing):
+    """Delete stale events and insert or update current ones in batched round trips.
+
+    existing maps iCalUID -> event ID (including soft-deleted events). Uses
+    update() (HTTP PUT) for all existing events — full replacement ensures
+    changes propagate to all clients, including iCal. patch() can silently
+    succeed without syncing visibility changes for corrupted/cancelled events.
+    """
+    requests = {}
+    for i, event_id in enumerate(stale_event_ids):
+        requests[f"delete-{i}"] = service.events().delete(
+            calendarId=calendar_id, eventId=event_id,
+        )
+    for i, event_body in enumerate(event_bodies):
+        ical_uid = event_body["iCalUID"]
+        if ical_uid in existing:
+            update_body = {k: v for k, v in event_body.items() if k != "iCalUID"}
+            update_body["status"] = "confirmed"
+            requests[f"update-{i}"] = service.events().update(
+                calendarId=calendar_id, eventId=existing[ical_uid], body=update_body,
+            )
+        else:
+            requests[f"insert-{i}"] = service.events().import_(
+                calendarId=calendar_id, body=event_body,
+            )
+
+    results = _run_batch(service, requests)
+    rate_limited = [exc for _, exc in results.values()
+                    if exc is not None and is_rate_limited_error(exc)]
+
+    for i, event_id in enumerate(stale_event_ids):
+        _, exception = results.get(f"delete-{i}", (None, None))
+        if exception is None:
+            logger.debug("Deleted stale event %s", event_id)
+        elif exception.resp.status in (404, 410):
+            logger.debug("Stale event %s already deleted", event_id)
+        else:
+            logger.warning("Failed to delete stale event %s: %s", event_id, exception)
+    for i, event_body in enumerate(event_bodies):
+        for action, verb in (("update", "Updated"), ("insert", "Inserted")):
+            request_id = f"{action}-{i}"
+            if request_id not in results:
+                continue
+            _, exception = results[request_id]
+            if exception is None:
+                logger.info("%s event uid=%s summary=%s", verb, event_body["iCalUID"],
+                            event_body.get("summary", "")[:50])
+            else:
+                logger.error("Failed to upsert event uid=%s: %s", event_body["iCalUID"], exception)
+
+    # Surface exhausted rate limits so the run counts this user as rate limited;
+    # everything that did succeed is picked up by the next incremental sync.
+    if rate_limited:
+        raise rate_limited[0]
 
 
 def _calendar_event_to_google_body(ce: CalendarEvent, tz_name: str | None) -> dict:
@@ -454,7 +818,7 @@ def _calendar_event_to_google_body(ce: CalendarEvent, tz_name: str | None) -> di
     return body
 
 
-def _push_forecast_events(service, calendar_id, forecast, prefs, tz, tz_name):
+def _build_forecast_events(forecast, prefs) -> list[CalendarEvent]:
     show_allday = prefs.get("show_allday_events", 1) if prefs else 1
     timed_enabled = prefs.get("timed_events_enabled", 1) if prefs else 1
     logger.info("push forecast date=%s show_allday=%s timed=%s", forecast.date, show_allday, timed_enabled)
@@ -465,20 +829,7 @@ def _push_forecast_events(service, calendar_id, forecast, prefs, tz, tz_name):
                 len(events), forecast.date,
                 sum(1 for e in events if e.is_allday),
                 sum(1 for e in events if not e.is_allday))
-    expected_allday_uids = {e.uid for e in events if e.is_allday}
-    expected_timed_uids = {e.uid for e in events if not e.is_allday}
-
-    # Clean up stale events for this date
-    _cleanup_stale_events(service, calendar_id, forecast.date,
-                          expected_allday_uids, expected_timed_uids, tz)
-
-    # Upsert current events
-    for ce in events:
-        event_body = _calendar_event_to_google_body(ce, tz_name)
-        try:
-            _upsert_event(service, calendar_id, event_body)
-        except Exception:
-            logger.exception("Failed to upsert event uid=%s date=%s", ce.uid, forecast.date)
+    return events
 
 
 def _clear_calendar_id(db_path: str, user_id: int) -> None:
@@ -486,10 +837,13 @@ def _clear_calendar_id(db_path: str, user_id: int) -> None:
     conn = _conn(db_path)
     try:
         conn.execute(
-            "UPDATE google_tokens SET google_calendar_id = NULL, updated_at = ? WHERE user_id = ?",
+            """UPDATE google_tokens SET google_calendar_id = NULL, sync_token = NULL, updated_at = ?
+               WHERE user_id = ?""",
             (now, user_id),
         )
+        conn.execute("DELETE FROM google_events WHERE user_id = ?", (user_id,))
         conn.commit()
     finally:
         conn.close()
+    invalidate_google_service(user_id)
     send_google_alert(db_path, user_id, "calendar_deleted")
@@ -0,0 +1,101 @@
+"""Concurrent Google Calendar push across connected users.
+
+Users are pushed on a bounded thread pool that shares the global API rate
+limiter in google_push. Rate-limited requests (403/429) are retried inside
+google_push, so a user whose push still fails is not re-pushed here (that would
+redo the writes that did succeed); run_push reports the failed users, with a
+cool-down for rate-limited ones, so the caller can queue them for later.
+Each run records its throughput and error counts in google_push_log.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from src.integrations import google_push
+from src.utils.db import get_connection as _conn
+
+logger = logging.getLogger(__name__)
+
+PUSH_WORKERS = max(1, int(os.getenv("GOOGLE_PUSH_WORKERS", "4")))
+
+
+def _push_user(user_id: int, push_fn) -> tuple[bool, float | None, str | None, int]:
+    """Push one user. Returns (ok, cooldown, error, api_requests).
+
+    cooldown is set only when the push ended rate limited: the seconds to wait
+    before pushing this user again.
+    """
+    from googleapiclient.errors import HttpError
+
+    calls_before = google_push.api_calls_in_thread()
+    ok, cooldown, error = True, None, None
+    try:
+        push_fn(user_id)
+    except HttpError as e:
+        ok, error = False, str(e)
+        if google_push.is_rate_limited_error(e):
+            cooldown = google_push.rate_limit_cooldown(e)
+        logger.exception("Google push failed for user_id=%s", user_id)
+    except Exception as e:
+        ok, error = False, str(e)
+        logger.exception("Google push failed for user_id=%s", user_id)
+    return ok, cooldown, error, google_push.api_calls_in_thread() - calls_before
+
+
+def log_push_run(db_path: str, metrics: dict) -> None:
+    """Record a push run's metrics in google_push_log."""
+    conn = _conn(db_path)
+    try:
+        conn.execute(
+            """INSERT INTO google_push_log
+               (started_at, duration_seconds, users_total, users_succeeded, users_failed,
+                rate_limited, api_requests, error)
+               VALUES (:started_at, :duration_seconds, :users_total, :users_succeeded,
+                       :users_failed, :rate_limited, :api_requests, :error)""",
+            metrics,
+        )
+        conn.commit()
+    except Exception:
+        logger.exception("Failed to log push run")
+    finally:
+        conn.close()
+
+
+def run_push(db_path: str, user_ids: list[int], push_fn) -> dict:
+    """Call push_fn(user_id) for every user on a bounded pool and log run metrics.
+
+    The returned metrics include failed_users: {user_id: cooldown_seconds} for
+    every user whose push failed (0 unless it was rate limited).
+    """
+    if not user_ids:
+        return {}
+    started_at = datetime.now(timezone.utc).isoformat()
+    started = time.monotonic()
+
+    workers = min(PUSH_WORKERS, len(user_ids))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="google-push") as pool:
+        results = list(pool.map(lambda uid: _push_user(uid, push_fn), user_ids))
+
+    errors = [error for ok, _, error, _ in results if not ok and error]
+    failed_users = {uid: cooldown or 0 for uid, (ok, cooldown, _, _) in zip(user_ids, results) if not ok}
+    metrics = {
+        "started_at": started_at,
+        "duration_seconds": round(time.monotonic() - started, 3),
+        "users_total": len(user_ids),
+        "users_succeeded": sum(1 for ok, _, _, _ in results if ok),
+        "users_failed": len(failed_users),
+        "rate_limited": sum(1 for _, cooldown, _, _ in results if cooldown is not None),
+        "api_requests": int(sum(calls for _, _, _, calls in results)),
+        "error": errors[0][:500] if errors else None,
+        "failed_users": failed_users,
+    }
+    log_push_run(db_path, metrics)
+    logger.info(
+        "Google push run: %d/%d users ok in %.1fs (%d API requests, %d users rate limited)",
+        metrics["users_succeeded"], metrics["users_total"], metrics["duration_seconds"],
+        metrics["api_requests"], metrics["rate_limited"],
+    )
+    return metrics
@@ -0,0 +1,167 @@
+"""Durable Google push queue.
+
+Web routes enqueue a user instead of pushing inline; the scheduler process
+drains the queue. There is at most one job per user, so repeated enqueues
+(e.g. rapid settings edits) collapse into a single push. Failed jobs are
+retried with exponential backoff until PUSH_JOB_MAX_ATTEMPTS, after which
+they are kept with status 'failed' for inspection. A job that fails rate limited
+(403/429) waits at least Google's Retry-After before its next attempt.
+
+A claimed job is leased until `run_after`; if the worker dies mid-push the
+lease expires and the job becomes claimable again.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from src.integrations import google_push
+from src.integrations.push_executor import run_push
+from src.utils.db import get_connection as _conn
+
+logger = logging.getLogger(__name__)
+
+PUSH_JOB_MAX_ATTEMPTS = 5
+PUSH_JOB_RETRY_SECONDS = 30
+PUSH_JOB_LEASE_SECONDS = 600
+PUSH_JOB_BATCH = 50
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat(timespec="microseconds")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue_push_job(db_path: str, user_id: int, delay_seconds: float = 0) -> None:
+    """Queue a full Google push for a user, merging with any job already queued.
+
+    The job becomes due after delay_seconds (e.g. a rate-limited user's cool-down).
+    """
+    now = _now()
+    run_after = _iso(now + timedelta(seconds=delay_seconds))
+    now = _iso(now)
+    conn = _conn(db_path)
+    try:
+        # A running job keeps its lease; complete_push_job re-queues it because
+        # enqueued_at has moved on.
+        conn.execute(
+            """INSERT INTO push_jobs (user_id, status, attempts, run_after, enqueued_at, updated_at)
+               VALUES (?, 'pending', 0, ?, ?, ?)
+               ON CONFLICT(user_id) DO UPDATE SET
+                   status = CASE WHEN status = 'running' THEN 'running' ELSE 'pending' END,
+                   run_after = CASE WHEN status = 'running' THEN run_after ELSE excluded.run_after END,
+                   attempts = 0,
+                   last_error = NULL,
+                   enqueued_at = excluded.enqueued_at,
+                   updated_at = excluded.updated_at""",
+            (user_id, run_after, now, now),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def claim_push_jobs(db_path: str, limit: int = PUSH_JOB_BATCH) -> list[dict]:
+    """Lease up to `limit` due jobs. Returns [{user_id, enqueued_at, attempts}]."""
+    now = _now()
+    conn = _conn(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(
+            """SELECT user_id, enqueued_at, attempts FROM push_jobs
+               WHERE status != 'failed' AND run_after <= ?
+               ORDER BY run_after LIMIT ?""",
+            (_iso(now), limit),
+        ).fetchall()
+        lease = _iso(now + timedelta(seconds=PUSH_JOB_LEASE_SECONDS))
+        conn.executemany(
+            "UPDATE push_jobs SET status = 'running', run_after = ?, updated_at = ? WHERE user_id = ?",
+            [(lease, _iso(now), r["user_id"]) for r in rows],
+        )
+        conn.commit()
+        return [dict(r) for r in rows]
+    finally:
+        conn.close()
+
+
+def complete_push_job(db_path: str, user_id: int, enqueued_at: str) -> None:
+    """Remove a finished job, or re-queue it if the user was enqueued again meanwhile."""
+    now = _iso(_now())
+    conn = _conn(db_path)
+    try:
+        cur = conn.execute(
+            "DELETE FROM push_jobs WHERE user_id = ? AND enqueued_at = ?", (user_id, enqueued_at)
+        )
+        if cur.rowcount == 0:
+            conn.execute(
+                """UPDATE push_jobs SET status = 'pending', run_after = ?, updated_at = ?
+                   WHERE user_id = ?""",
+                (now, now, user_id),
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def fail_push_job(db_path: str, user_id: int, enqueued_at: str, error: str,
+                  cooldown_seconds: float = 0) -> None:
+    """Record a failed attempt and schedule a retry with exponential backoff.
+
+    The retry waits at least cooldown_seconds (a rate-limited user's Retry-After).
+    """
+    now = _now()
+    conn = _conn(db_path)
+    try:
+        row = conn.execute(
+            "SELECT attempts, enqueued_at FROM push_jobs WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if not row:
+            return
+        if row["enqueued_at"] != enqueued_at:
+            # Re-enqueued while running: retry straight away with a fresh budget
+            attempts, status, run_after = 0, "pending", now
+        else:
+            attempts = row["attempts"] + 1
+            if attempts >= PUSH_JOB_MAX_ATTEMPTS:
+                status, run_after = "failed", now
+                logger.error("Google push job for user_id=%s failed after %d attempts: %s",
+                             user_id, attempts, error)
+            else:
+                status = "pending"
+                backoff = PUSH_JOB_RETRY_SECONDS * 2 ** (attempts - 1)
+                run_after = now + timedelta(seconds=max(backoff, cooldown_seconds))
+        conn.execute(
+            """UPDATE push_jobs SET status = ?, attempts = ?, run_after = ?, last_error = ?, updated_at = ?
+               WHERE user_id = ?""",
+            (status, attempts, _iso(run_after), error[:500], _iso(now), user_id),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def process_push_jobs(db_path: str, push_fn, limit: int = PUSH_JOB_BATCH) -> int:
+    """Claim due jobs and run push_fn(user_id) for each. Returns the number claimed."""
+    jobs = claim_push_jobs(db_path, limit)
+    if not jobs:
+        return 0
+    enqueued = {job["user_id"]: job["enqueued_at"] for job in jobs}
+
+    # run_push calls this once per claim; retries are the queue's backoff alone
+    def _run(user_id):
+        from googleapiclient.errors import HttpError
+
+        try:
+            push_fn(user_id)
+        except Exception as e:
+            cooldown = 0
+            if isinstance(e, HttpError) and google_push.is_rate_limited_error(e):
+                cooldown = google_push.rate_limit_cooldown(e)
+            fail_push_job(db_path, user_id, enqueued[user_id], str(e), cooldown)
+            raise
+        complete_push_job(db_path, user_id, enqueued[user_id])
+
+    run_push(db_path, list(enqueued), _run)
+    return len(jobs)
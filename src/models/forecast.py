@@ -1,31 +1,121 @@
 # forecast.py
 
-from dataclasses import dataclass, field
+import json
 from typing import List, Optional
 
-@dataclass
+# Per-time-slot series, in constructor order
+HOURLY_FIELDS = ("times", "temps", "codes", "rain", "precipitation", "winds", "gusts", "apparent_temps")
+
+
+class _Series:
+    """An hourly series, decoded from the stored JSON the first time any series is read."""
+
+    def __set_name__(self, owner, name):
+        self.slot = f"_{name}"
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if obj._hourly_json is not None:
+            obj._decode_hourly()
+        return getattr(obj, self.slot)
+
+    def __set__(self, obj, value):
+        if obj._hourly_json is not None:
+            obj._decode_hourly()
+        setattr(obj, self.slot, value)
+
+
 class Forecast:
     """
     Weather forecast for a single day at a single location.
+
+    Forecasts loaded from the database (from_stored) keep their hourly series
+    as the stored JSON until one is read, so loading many days for feeds that
+    only need summary/description skips the decode entirely.
     """
-    date: str                       # e.g. "2025-08-01"
-    location: str                   # e.g. "Munich"
-    high: float                     # Daily high temperature
-    low: float                      # Daily low temperature
-    summary: Optional[str] = None                    # Short summary, e.g. "AM⛅15° / PM☁️19°"
-    description: Optional[str] = None                      # Multiline description for calendar event
-    times: List[str] = field(default_factory=list)     # e.g. ["2025-08-01T06:00", ...]
-    temps: List[float] = field(default_factory=list)   # temperatures for each time slot
-    codes: List[int] = field(default_factory=list)     # weather codes for each time slot
-    rain: List[float] = field(default_factory=list)    # % chance of rain per time slot
-    precipitation: List[float] = field(default_factory=list)  # mm per time slot
-    winds: List[float] = field(default_factory=list)   # wind speed per time slot
-    gusts: List[float] = field(default_factory=list)   # wind gusts per time slot
-    apparent_temps: List[float] = field(default_factory=list)  # feels-like temperatures per time slot
-    fetch_time: Optional[str] = None                   # When the forecast was retrieved (ISO string)
-    timezone: Optional[str] = None                     # IANA timezone name, e.g. "Europe/Berlin"
-
-    def __post_init__(self):
-        if self.fetch_time is None:
-            from datetime import datetime
-            self.fetch_time = datetime.now().isoformat()
\ No newline at end of file
+    __slots__ = ("date", "location", "high", "low", "summary", "description", "fetch_time", "timezone",
+                 "_hourly_json") + tuple(f"_{name}" for name in HOURLY_FIELDS)
+
+    times = _Series()           # e.g. ["2025-08-01T06:00", ...]
+    temps = _Series()           # temperatures for each time slot
+    codes = _Series()           # weather codes for each time slot
+    rain = _Series()            # % chance of rain per time slot
+    precipitation = _Series()   # mm per time slot
+    winds = _Series()           # wind speed per time slot
+    gusts = _Series()           # wind gusts per time slot
+    apparent_temps = _Series()  # feels-like temperatures per time slot
+
+    def __init__(
+        self,
+        date: str,                              # e.g. "2025-08-01"
+        location: str,                          # e.g. "Munich"
+        high: float,                            # Daily high temperature
+        low: float,                             # Daily low temperature
+        summary: Optional[str] = None,          # Short summary, e.g. "AM⛅15° / PM☁️19°"
+        description: Optional[str] = None,      # Multiline description for calendar event
+        times: Optional[List[str]] = None,
+        temps: Optional[List[float]] = None,
+        codes: Optional[List[int]] = None,
+        rain: Optional[List[float]] = None,
+        precipitation: Optional[List[float]] = None,
+        winds: Optional[List[float]] = None,
+        gusts: Optional[List[float]] = None,
+        apparent_temps: Optional[List[float]] = None,
+        fetch_time: Optional[str] = None,       # When the forecast was retrieved (ISO string); None = not yet stored
+        timezone: Optional[str] = None,         # IANA timezone name, e.g. "Europe/Berlin"
+    ):
+        self.date = date
+        self.location = location
+        self.high = high
+        self.low = low
+        self.summary = summary
+        self.description = description
+        self.fetch_time = fetch_time
+        self.timezone = timezone
+        self._hourly_json = None
+        self._times = times if times is not None else []
+        self._temps = temps if temps is not None else []
+        self._codes = codes if codes is not None else []
+        self._rain = rain if rain is not None else []
+        self._precipitation = precipitation if precipitation is not None else []
+        self._winds = winds if winds is not None else []
+        self._gusts = gusts if gusts is not None else []
+        self._apparent_temps = apparent_temps if apparent_temps is not None else []
+
+    @classmethod
+    def from_stored(cls, date, location, high, low, summary, description, fetch_time,
+                    hourly_json: Optional[str], timezone) -> "Forecast":
+        """Build a forecast from a stored row, deferring the hourly JSON decode."""
+        forecast = cls(date, location, high, low, summary, description, fetch_time=fetch_time, timezone=timezone)
+        forecast._hourly_json = hourly_json or None
+        return forecast
+
+    def _decode_hourly(self):
+        hourly = json.loads(self._hourly_json)
+        for name in HOURLY_FIELDS:
+            setattr(self, f"_{name}", hourly.get(name, []))
+        # Rows stored before feels-like temperatures were kept
+        if "apparent_temps" not in hourly:
+            self._apparent_temps = self._temps
+        # Cleared last, so a concurrent reader never sees unset series
+        self._hourly_json = None
+
+    def replace(self, **changes) -> "Forecast":
+        """Copy with some fields changed (the dataclasses.replace equivalent)."""
+        fields = {name: getattr(self, name) for name in _FIELDS}
+        fields.update(changes)
+        return Forecast(**fields)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Forecast({', '.join(f'{name}={getattr(self, name)!r}' for name in _FIELDS)})"
+
+
+_FIELDS = ("date", "location", "high", "low", "summary", "description") + HOURLY_FIELDS + ("fetch_time", "timezone")
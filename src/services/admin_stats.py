@@ -0,0 +1,172 @@
+"""Materialised per-user stats for the admin dashboard.
+
+admin_user_stats holds one row per active user with everything the admin
+table and CSV export show, so /admin reads precomputed rows instead of joining
+users, locations, feed tokens, preferences and Google tokens on every load.
+
+Rows are kept current by SQLite triggers on the source tables, so every
+writer (signup, location and prefs changes, feed polls, Google connect and
+revoke, account deletion) updates them without going through this module.
+Feed-token updates, which happen on every poll flush, copy the counters
+straight across; other changes recompute the one affected user.
+The table is backfilled once when it is first created; after that
+reconcile_admin_user_stats, run by the scheduler or on demand, rebuilds it as
+a safety net.
+"""
+
+import logging
+
+from src.utils.db import get_connection as _conn
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_INTERVAL_SECONDS = 6 * 3600
+
+# A user's preferences differ from the defaults
+CHANGED_PREFS_SQL = """
+    cold_threshold != 3.0
+    OR warm_threshold != 14.0
+    OR hot_threshold != 28.0
+    OR warn_in_allday != 1
+    OR warn_rain != 1
+    OR warn_wind != 1
+    OR warn_cold != 1
+    OR warn_snow != 1
+    OR warn_sunny != 0
+    OR warn_hot != 1
+    OR show_allday_events != 1
+    OR timed_events_enabled != 1
+    OR allday_rain != 1
+    OR allday_wind != 1
+    OR allday_cold != 1
+    OR allday_snow != 1
+    OR allday_sunny != 0
+    OR allday_hot != 1
+    OR title_format != 'simple'
+    OR temp_display != 'feels_like'
+"""
+
+_COLUMNS = ("user_id, email, location, country, created_at, utm_source, token, token_created_at, "
+            "last_polled_at, poll_count, last_user_agent, settings_clicks, changed_prefs, google_status")
+
+# Latest location and first feed token per user, as the dashboard shows one row per user
+_STATS_SELECT = f"""
+    SELECT u.id, u.email, ul.location, ul.country, u.created_at, u.utm_source,
+           ft.token, ft.created_at, ft.last_polled_at, COALESCE(ft.poll_count, 0),
+           ft.last_user_agent, COALESCE(ft.settings_clicks, 0),
+           EXISTS (SELECT 1 FROM user_preferences up WHERE up.user_id = u.id AND ({CHANGED_PREFS_SQL})),
+           (SELECT gt.status FROM google_tokens gt WHERE gt.user_id = u.id)
+    FROM users u
+    LEFT JOIN user_locations ul ON ul.id = (SELECT MAX(id) FROM user_locations WHERE user_id = u.id)
+    LEFT JOIN feed_tokens ft ON ft.id = (SELECT MIN(id) FROM feed_tokens WHERE user_id = u.id)
+    WHERE u.is_active = 1
+"""
+
+
+def _refresh_user_sql(user_id: str) -> str:
+    return f"""
+        DELETE FROM admin_user_stats WHERE user_id = {user_id};
+        INSERT INTO admin_user_stats ({_COLUMNS}) {_STATS_SELECT} AND u.id = {user_id};
+    """
+
+
+# (trigger name, event, user_id expression) for changes that recompute one user
+_REFRESH_TRIGGERS = [
+    ("users_insert", "AFTER INSERT ON users", "NEW.id"),
+    ("users_update", "AFTER UPDATE ON users", "NEW.id"),
+    ("locations_insert", "AFTER INSERT ON user_locations", "NEW.user_id"),
+    ("locations_update", "AFTER UPDATE ON user_locations", "NEW.user_id"),
+    ("locations_delete", "AFTER DELETE ON user_locations", "OLD.user_id"),
+    ("tokens_insert", "AFTER INSERT ON feed_tokens", "NEW.user_id"),
+    ("tokens_delete", "AFTER DELETE ON feed_tokens", "OLD.user_id"),
+    ("prefs_insert", "AFTER INSERT ON user_preferences", "NEW.user_id"),
+    ("prefs_update", "AFTER UPDATE ON user_preferences", "NEW.user_id"),
+    ("prefs_delete", "AFTER DELETE ON user_preferences", "OLD.user_id"),
+    ("google_insert", "AFTER INSERT ON google_tokens", "NEW.user_id"),
+    ("google_update", "AFTER UPDATE ON google_tokens", "NEW.user_id"),
+    ("google_delete", "AFTER DELETE ON google_tokens", "OLD.user_id"),
+]
+
+_TOKEN_UPDATE_TRIGGER = """
+    CREATE TRIGGER admin_stats_tokens_update AFTER UPDATE ON feed_tokens BEGIN
+        UPDATE admin_user_stats
+        SET token_created_at = NEW.created_at,
+            last_polled_at = NEW.last_polled_at,
+            poll_count = COALESCE(NEW.poll_count, 0),
+            last_user_agent = NEW.last_user_agent,
+            settings_clicks = COALESCE(NEW.settings_clicks, 0)
+        WHERE token = NEW.token;
+    END
+"""
+
+
+def create_admin_user_stats_table(db_path: str) -> None:
+    """Create admin_user_stats and its triggers, backfilling it if the table is new.
+
+    Needs users, user_locations, feed_tokens, user_preferences and
+    google_tokens to exist, so call it after their create functions.
+    """
+    conn = _conn(db_path)
+    try:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'admin_user_stats'"
+        ).fetchone()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS admin_user_stats (
+                user_id          INTEGER PRIMARY KEY,
+                email            TEXT NOT NULL,
+                location         TEXT,
+                country          TEXT,
+                created_at       TEXT,
+                utm_source       TEXT,
+                token            TEXT,
+                token_created_at TEXT,
+                last_polled_at   TEXT,
+                poll_count       INTEGER NOT NULL DEFAULT 0,
+                last_user_agent  TEXT,
+                settings_clicks  INTEGER NOT NULL DEFAULT 0,
+                changed_prefs    INTEGER NOT NULL DEFAULT 0,
+                google_status    TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_admin_user_stats_token ON admin_user_stats (token)")
+        # Per-user recomputes look these up by user_id
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_user_locations_user ON user_locations (user_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_feed_tokens_user ON feed_tokens (user_id)")
+        # Recreated every time so trigger bodies follow schema changes
+        for name, event, user_id in _REFRESH_TRIGGERS:
+            conn.execute(f"DROP TRIGGER IF EXISTS admin_stats_{name}")
+            conn.execute(f"CREATE TRIGGER admin_stats_{name} {event} BEGIN {_refresh_user_sql(user_id)} END")
+        conn.execute("DROP TRIGGER IF EXISTS admin_stats_tokens_update")
+        conn.execute(_TOKEN_UPDATE_TRIGGER)
+        if not exists:
+            conn.execute(f"INSERT INTO admin_user_stats ({_COLUMNS}) {_STATS_SELECT}")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def reconcile_admin_user_stats(db_path: str) -> int:
+    """Rebuild admin_user_stats from the source tables. Returns the number of rows repaired."""
+    conn = _conn(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(f"CREATE TEMP TABLE fresh_admin_user_stats AS SELECT {_COLUMNS} FROM admin_user_stats LIMIT 0")
+        conn.execute(f"INSERT INTO fresh_admin_user_stats {_STATS_SELECT}")
+        repaired = conn.execute(f"""
+            SELECT
+                (SELECT COUNT(*) FROM (SELECT {_COLUMNS} FROM fresh_admin_user_stats
+                                       EXCEPT SELECT {_COLUMNS} FROM admin_user_stats))
+              + (SELECT COUNT(*) FROM admin_user_stats
+                 WHERE user_id NOT IN (SELECT user_id FROM fresh_admin_user_stats))
+        """).fetchone()[0]
+        if repaired:
+            conn.execute("DELETE FROM admin_user_stats")
+            conn.execute(f"INSERT INTO admin_user_stats ({_COLUMNS}) SELECT {_COLUMNS} FROM fresh_admin_user_stats")
+        conn.execute("DROP TABLE fresh_admin_user_stats")
+        conn.commit()
+    finally:
+        conn.close()
+    if repaired:
+        logger.info("Admin stats reconcile repaired %d rows", repaired)
+    return repaired
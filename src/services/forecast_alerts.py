@@ -34,6 +34,21 @@ def log_refresh_result(db_path: str, tier: str, success: bool, error: str = None
         conn.close()
 
 
+def log_refresh_skip(db_path: str, tier: str, reason: str) -> None:
+    """Record a refresh that was skipped on purpose (e.g. no new upstream model run)."""
+    conn = _conn(db_path)
+    try:
+        conn.execute(
+            "INSERT INTO forecast_refresh_log (tier, status, created_at, details) VALUES (?, 'skipped', ?, ?)",
+            (tier, datetime.now(timezone.utc).isoformat(), reason),
+        )
+        conn.commit()
+    except Exception:
+        logger.exception("Failed to log refresh skip")
+    finally:
+        conn.close()
+
+
 def check_consecutive_failures(db_path: str) -> tuple:
     """Check if the last N refresh attempts all failed.
 
@@ -43,7 +58,7 @@ def check_consecutive_failures(db_path: str) -> tuple:
     conn = _conn(db_path)
     try:
         rows = conn.execute(
-            "SELECT status, error FROM forecast_refresh_log ORDER BY id DESC LIMIT ?",
+            "SELECT status, error FROM forecast_refresh_log WHERE status != 'skipped' ORDER BY id DESC LIMIT ?",
             (threshold,),
         ).fetchall()
         if len(rows) < threshold:
@@ -1,19 +1,19 @@
+from __future__ import annotations
+
 import os
 import logging
 import time
 
-from typing import List, Optional
-from datetime import datetime
-from dotenv import load_dotenv
-import requests
+from typing import TYPE_CHECKING, List, Optional
+from datetime import datetime, timezone as dt_timezone
 
-from src.utils.logging_config import setup_logging
 from src.models.forecast import Forecast
 
-setup_logging()
-logger = logging.getLogger(__name__)
+# requests is imported on first use so web workers that never geocode skip it
+if TYPE_CHECKING:
+    import requests
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 class ForecastService:
     OPEN_METEO_URL = os.getenv("OPEN_METEO_URL")
@@ -25,6 +25,13 @@ class ForecastService:
         int(os.getenv("WEATHER_API_RETRY_DELAY_FIRST", "15")),
         int(os.getenv("WEATHER_API_RETRY_DELAY_SECOND", "45")),
     )
+    # Model metadata used to tell whether upstream published a new run; empty URL disables the check
+    MODEL_META_URL = os.getenv("OPEN_METEO_META_URL", "https://api.open-meteo.com/data/{model}/static/meta.json")
+    MODEL_RUN_MODELS = tuple(
+        m.strip() for m in os.getenv("OPEN_METEO_MODELS", "dwd_icon,ecmwf_ifs025,ncep_gfs025").split(",") if m.strip()
+    )
+    MODEL_RUN_CACHE_SECONDS = 300
+    _model_run_cache: Optional[tuple[float, Optional[datetime]]] = None
 
     @classmethod
     def _get_request_timeout(cls) -> tuple[float, float]:
@@ -39,6 +46,8 @@ class ForecastService:
 
     @classmethod
     def _request_json_with_retry(cls, url: str, *, params: dict, context: str) -> dict:
+        import requests
+
         timeout = cls._get_request_timeout()
         last_exc = None
 
@@ -85,6 +94,36 @@ class ForecastService:
         if last_exc is not None:
             raise last_exc
 
+    @classmethod
+    def get_latest_model_run(cls) -> Optional[datetime]:
+        """Newest run availability time (UTC) across MODEL_RUN_MODELS, or None if unknown.
+
+        Reads Open-Meteo's per-model meta.json. Any failure returns None so callers
+        fetch as usual. Cached for MODEL_RUN_CACHE_SECONDS so groups refreshing close
+        together share one check.
+        """
+        if not cls.MODEL_META_URL or not cls.MODEL_RUN_MODELS:
+            return None
+        cached = cls._model_run_cache
+        if cached and time.monotonic() - cached[0] < cls.MODEL_RUN_CACHE_SECONDS:
+            return cached[1]
+
+        import requests
+
+        latest = None
+        for model in cls.MODEL_RUN_MODELS:
+            try:
+                response = requests.get(cls.MODEL_META_URL.format(model=model), timeout=cls._get_request_timeout())
+                response.raise_for_status()
+                available = datetime.fromtimestamp(response.json()["last_run_availability_time"], tz=dt_timezone.utc)
+            except Exception:
+                logger.warning("Could not read model run metadata for %s", model, exc_info=True)
+                latest = None
+                break
+            latest = max(latest, available) if latest else available
+        cls._model_run_cache = (time.monotonic(), latest)
+        return latest
+
     @classmethod
     def get_coordinates_with_timezone(cls, location_name: str, language: str = "en"):
         try:
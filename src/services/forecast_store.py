@@ -1,20 +1,56 @@
 # forecast_store.py
 
+import hashlib
 import json
 import sqlite3
 import os
 import logging
+import threading
+from collections import OrderedDict
 
 from datetime import datetime
-from src.utils.logging_config import setup_logging
-from dotenv import load_dotenv
 
-setup_logging()
 logger = logging.getLogger(__name__)
 
-load_dotenv()
 DB_PATH = os.getenv("DB_PATH", "data/forecast.db")
 
+# Read-through cache of stored forecasts per (db_path, location), LRU-bounded.
+# Each entry is checked against the location's last_updated high-water mark,
+# so writes from other processes are picked up on the next read.
+FORECAST_CACHE_SIZE = int(os.getenv("FORECAST_CACHE_SIZE", "512"))
+_forecast_cache: OrderedDict = OrderedDict()
+_forecast_cache_lock = threading.Lock()
+
+
+def _invalidate_cached(db_path: str, locations) -> None:
+    with _forecast_cache_lock:
+        for location in locations:
+            _forecast_cache.pop((db_path, location), None)
+
+
+def clear_forecast_cache() -> None:
+    with _forecast_cache_lock:
+        _forecast_cache.clear()
+
+def _hourly_json(forecast) -> str:
+    return json.dumps({
+        "times": forecast.times or [],
+        "temps": forecast.temps or [],
+        "apparent_temps": forecast.apparent_temps or [],
+        "codes": forecast.codes or [],
+        "rain": forecast.rain or [],
+        "precipitation": forecast.precipitation or [],
+        "winds": forecast.winds or [],
+        "gusts": forecast.gusts or [],
+    })
+
+
+def content_hash(forecast) -> str:
+    """Hash of the fetched data for one (date, location): hourly arrays, high/low and timezone."""
+    payload = json.dumps([forecast.high, forecast.low, forecast.timezone, _hourly_json(forecast)])
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
 class ForecastStore:
     def __init__(self, db_path=DB_PATH):
         self.db_path = db_path
@@ -25,6 +61,8 @@ class ForecastStore:
         """Initialize the SQLite database and create tables if not exists."""
         conn = sqlite3.connect(self.db_path)
         cur = conn.cursor()
+        # Web routes run in a threadpool; WAL lets feed reads proceed alongside analytics writes
+        cur.execute("PRAGMA journal_mode=WAL")
         cur.execute("""
             CREATE TABLE IF NOT EXISTS forecast (
                 date TEXT,
@@ -41,6 +79,9 @@ class ForecastStore:
                 PRIMARY KEY (date, location)
             )
         """)
+        # Per-location date ranges; also covers the cache's last_updated high-water check
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_forecast_location_date "
+                    "ON forecast (location, date, last_updated)")
         cur.execute("""
             CREATE TABLE IF NOT EXISTS users (
                 id            INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -70,7 +111,7 @@ class ForecastStore:
             )
         """)
         # Add columns introduced after initial schema (idempotent)
-        for col_def in ["hourly_json TEXT", "timezone TEXT"]:
+        for col_def in ["hourly_json TEXT", "timezone TEXT", "content_hash TEXT"]:
             try:
                 cur.execute(f"ALTER TABLE forecast ADD COLUMN {col_def}")
             except sqlite3.OperationalError:
@@ -104,6 +145,30 @@ class ForecastStore:
             CREATE INDEX IF NOT EXISTS idx_poll_log_token_polled
             ON poll_log (token, polled_at)
         """)
+        # Per-token poll counters maintained by src.services.poll_rollups
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS poll_rollup_hourly (
+                token TEXT NOT NULL,
+                hour  TEXT NOT NULL,
+                polls INTEGER NOT NULL,
+                PRIMARY KEY (token, hour)
+            )
+        """)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS poll_rollup_daily (
+                token TEXT NOT NULL,
+                day   TEXT NOT NULL,
+                polls INTEGER NOT NULL,
+                PRIMARY KEY (token, day)
+            )
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_poll_rollup_hourly_hour ON poll_rollup_hourly (hour)")
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS rollup_watermarks (
+                name    TEXT PRIMARY KEY,
+                last_id INTEGER NOT NULL
+            )
+        """)
         # Add analytics columns to feed_tokens (idempotent)
         for col_def in [
             "last_polled_at TEXT",
@@ -115,6 +180,13 @@ class ForecastStore:
                 cur.execute(f"ALTER TABLE feed_tokens ADD COLUMN {col_def}")
             except sqlite3.OperationalError:
                 pass  # column already exists
+        # Set once by the feed route's first poll (mark_feed_first_polled); tokens
+        # polled before the column existed are backfilled so they don't count again
+        try:
+            cur.execute("ALTER TABLE feed_tokens ADD COLUMN first_polled_at TEXT")
+            cur.execute("UPDATE feed_tokens SET first_polled_at = last_polled_at WHERE poll_count > 0")
+        except sqlite3.OperationalError:
+            pass  # column already exists
         cur.execute("""
             CREATE TABLE IF NOT EXISTS funnel_events (
                 id         INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -124,6 +196,13 @@ class ForecastStore:
             )
         """)
         cur.execute("CREATE INDEX IF NOT EXISTS idx_funnel_user ON funnel_events (user_id)")
+        # Calendar day of created_at, so daily funnel counts can use an index (idempotent)
+        try:
+            cur.execute("ALTER TABLE funnel_events ADD COLUMN event_date TEXT")
+        except sqlite3.OperationalError:
+            pass  # column already exists
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_funnel_date ON funnel_events (event_date, event_name)")
+        cur.execute("UPDATE funnel_events SET event_date = SUBSTR(created_at, 1, 10) WHERE event_date IS NULL")
         cur.execute("""
             CREATE TABLE IF NOT EXISTS page_views (
                 path      TEXT NOT NULL,
@@ -168,6 +247,18 @@ class ForecastStore:
                 error       TEXT
             )
         """)
+        try:
+            cur.execute("ALTER TABLE forecast_refresh_log ADD COLUMN details TEXT")
+        except sqlite3.OperationalError:
+            pass  # column already exists
+        # Upstream model run each tier fetch last saw (see services/model_runs.py)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS model_run_fetches (
+                fetch_key   TEXT PRIMARY KEY,
+                run_time    TEXT NOT NULL,
+                fetched_at  TEXT NOT NULL
+            )
+        """)
         conn.commit()
         conn.close()
 
@@ -176,19 +267,10 @@ class ForecastStore:
         logger.info(f"Upserting forecast for date={forecast.date}, location={forecast.location}")
         conn = sqlite3.connect(self.db_path)
         cur = conn.cursor()
-        hourly_json = json.dumps({
-            "times": forecast.times or [],
-            "temps": forecast.temps or [],
-            "apparent_temps": forecast.apparent_temps or [],
-            "codes": forecast.codes or [],
-            "rain": forecast.rain or [],
-            "precipitation": forecast.precipitation or [],
-            "winds": forecast.winds or [],
-            "gusts": forecast.gusts or [],
-        })
         cur.execute("""
-            INSERT INTO forecast (date, location, high, low, summary, description, last_updated, hourly_json, timezone)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO forecast (date, location, high, low, summary, description, last_updated, hourly_json,
+                                  timezone, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(date, location) DO UPDATE SET
                 high=excluded.high,
                 low=excluded.low,
@@ -196,54 +278,116 @@ class ForecastStore:
                 description=excluded.description,
                 last_updated=excluded.last_updated,
                 hourly_json=excluded.hourly_json,
-                timezone=excluded.timezone
+                timezone=excluded.timezone,
+                content_hash=excluded.content_hash
         """, (forecast.date, forecast.location, forecast.high, forecast.low,
               forecast.summary, forecast.description, forecast.fetch_time or datetime.now().isoformat(),
-              hourly_json, forecast.timezone))
+              _hourly_json(forecast), forecast.timezone, content_hash(forecast)))
         conn.commit()
         conn.close()
+        _invalidate_cached(self.db_path, [forecast.location])
+
+    def changed_forecasts(self, forecasts: list) -> list:
+        """Return the forecasts whose content hash differs from the stored row (or that have none)."""
+        if not forecasts:
+            return []
+        conn = sqlite3.connect(self.db_path)
+        try:
+            stored = {}
+            for location in {f.location for f in forecasts}:
+                dates = [f.date for f in forecasts if f.location == location]
+                placeholders = ",".join("?" * len(dates))
+                for date_, hash_ in conn.execute(
+                    f"SELECT date, content_hash FROM forecast WHERE location = ? AND date IN ({placeholders})",
+                    [location] + dates,
+                ):
+                    stored[(date_, location)] = hash_
+        finally:
+            conn.close()
+        return [f for f in forecasts if stored.get((f.date, f.location)) != content_hash(f)]
+
+    def touch_forecasts(self, forecasts: list) -> None:
+        """Bump last_updated for rows re-fetched unchanged, without rewriting them."""
+        if not forecasts:
+            return
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.executemany(
+                "UPDATE forecast SET last_updated = ? WHERE date = ? AND location = ?",
+                [(f.fetch_time or datetime.now().isoformat(), f.date, f.location) for f in forecasts],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def touch_locations(self, locations: list, start_date: str, end_date: str) -> None:
+        """Bump last_updated for the stored rows of `locations` within [start_date, end_date]."""
+        if not locations:
+            return
+        placeholders = ",".join("?" * len(locations))
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute(
+                f"""UPDATE forecast SET last_updated = ?
+                    WHERE date BETWEEN ? AND ? AND location IN ({placeholders})""",
+                [datetime.now().isoformat(), start_date, end_date] + list(locations),
+            )
+            conn.commit()
+        finally:
+            conn.close()
 
     def get_forecasts_for_locations(self, locations: list, days: int = 14) -> list:
-        """Retrieve forecasts from today onwards for a list of locations."""
+        """Retrieve up to `days` forecasts from today onwards for each location.
+
+        Ordered by location, then date. Served from the forecast cache when a
+        location's rows are unchanged since they were cached. The returned
+        Forecasts are shared; treat them as read-only.
+        """
         if not locations:
             return []
         from datetime import date
         today = date.today().isoformat()
-        placeholders = ",".join("?" * len(locations))
+        wanted = sorted(set(locations))
         conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-        cur.execute(f"""
-            SELECT date, location, high, low, summary, description, last_updated, hourly_json, timezone
-            FROM forecast
-            WHERE date >= ? AND location IN ({placeholders})
-            ORDER BY location, date ASC
-            LIMIT ?
-        """, [today] + list(locations) + [days * len(locations)])
-        rows = cur.fetchall()
-        conn.close()
-        from src.models.forecast import Forecast
-        forecasts = []
-        for row in rows:
-            hourly = json.loads(row[7]) if row[7] else {}
-            forecasts.append(Forecast(
-                date=row[0],
-                location=row[1],
-                high=row[2],
-                low=row[3],
-                summary=row[4],
-                description=row[5],
-                fetch_time=row[6],
-                times=hourly.get("times", []),
-                temps=hourly.get("temps", []),
-                codes=hourly.get("codes", []),
-                rain=hourly.get("rain", []),
-                precipitation=hourly.get("precipitation", []),
-                winds=hourly.get("winds", []),
-                gusts=hourly.get("gusts", []),
-                apparent_temps=hourly.get("apparent_temps", hourly.get("temps", [])),
-                timezone=row[8],
-            ))
-        return forecasts
+        try:
+            placeholders = ",".join("?" * len(wanted))
+            marks = {loc: (today, updated, count) for loc, updated, count in conn.execute(f"""
+                SELECT location, MAX(last_updated), COUNT(*) FROM forecast
+                WHERE date >= ? AND location IN ({placeholders})
+                GROUP BY location
+            """, [today] + wanted)}
+
+            by_location, stale = {}, []
+            with _forecast_cache_lock:
+                for loc in wanted:
+                    entry = _forecast_cache.get((self.db_path, loc))
+                    if entry is not None and entry[0] == marks.get(loc):
+                        _forecast_cache.move_to_end((self.db_path, loc))
+                        by_location[loc] = entry[1]
+                    else:
+                        stale.append(loc)
+
+            if stale:
+                from src.models.forecast import Forecast
+                loaded = {loc: [] for loc in stale}
+                placeholders = ",".join("?" * len(stale))
+                for row in conn.execute(f"""
+                    SELECT date, location, high, low, summary, description, last_updated, hourly_json, timezone
+                    FROM forecast
+                    WHERE date >= ? AND location IN ({placeholders})
+                    ORDER BY location, date ASC
+                """, [today] + stale):
+                    loaded[row[1]].append(Forecast.from_stored(*row))
+                with _forecast_cache_lock:
+                    for loc, forecasts in loaded.items():
+                        _forecast_cache[(self.db_path, loc)] = (marks.get(loc), forecasts)
+                        _forecast_cache.move_to_end((self.db_path, loc))
+                    while len(_forecast_cache) > FORECAST_CACHE_SIZE:
+                        _forecast_cache.popitem(last=False)
+                by_location.update(loaded)
+        finally:
+            conn.close()
+        return [f for loc in wanted for f in by_location[loc][:days]]
 
     def get_forecasts_future(self, days:int = 7):
         """Retrieve forecasts from today onwards, limited to the given number of days."""
@@ -261,26 +405,5 @@ class ForecastStore:
         """, (today, days))
         rows = cur.fetchall()
         conn.close()
-        forecasts = []
         from src.models.forecast import Forecast
-        for row in rows:
-            hourly = json.loads(row[7]) if row[7] else {}
-            forecasts.append(Forecast(
-                date=row[0],
-                location=row[1],
-                high=row[2],
-                low=row[3],
-                summary=row[4],
-                description=row[5],
-                fetch_time=row[6],
-                times=hourly.get("times", []),
-                temps=hourly.get("temps", []),
-                codes=hourly.get("codes", []),
-                rain=hourly.get("rain", []),
-                precipitation=hourly.get("precipitation", []),
-                winds=hourly.get("winds", []),
-                gusts=hourly.get("gusts", []),
-                apparent_temps=hourly.get("apparent_temps", hourly.get("temps", [])),
-                timezone=row[8],
-            ))
-        return forecasts
+        return [Forecast.from_stored(*row) for row in rows]
@@ -0,0 +1,66 @@
+"""Track which upstream model run each tier fetch has already seen.
+
+A tier fetch for a set of locations and date window is redundant if Open-Meteo
+has not published a newer model run since the last successful fetch of that
+same key. MODEL_RUN_MAX_SKIP_HOURS bounds how long a key may go unfetched,
+as a safety net against bad metadata.
+"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+
+from src.utils.db import get_connection as _conn
+
+logger = logging.getLogger(__name__)
+
+MODEL_RUN_MAX_SKIP_HOURS = float(os.getenv("MODEL_RUN_MAX_SKIP_HOURS", "12"))
+# Keys are per date window, so old ones stop being used after a day or two
+_RETENTION = timedelta(days=3)
+
+
+def fetch_key(tier: str, locations: list[dict], window_start: str) -> str:
+    """Key for a tier fetch of these locations starting on window_start."""
+    names = "\n".join(sorted(loc["location"] for loc in locations))
+    return f"{tier}:{window_start}:{hashlib.sha1(names.encode()).hexdigest()[:16]}"
+
+
+def has_current_run(db_path: str, key: str, latest_run: datetime | None) -> bool:
+    """True if the last fetch for `key` already reflects `latest_run`."""
+    if latest_run is None:
+        return False
+    conn = _conn(db_path)
+    try:
+        row = conn.execute(
+            "SELECT run_time, fetched_at FROM model_run_fetches WHERE fetch_key = ?", (key,)
+        ).fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return False
+    fetched_at = datetime.fromisoformat(row["fetched_at"])
+    if datetime.now(timezone.utc) - fetched_at > timedelta(hours=MODEL_RUN_MAX_SKIP_HOURS):
+        return False
+    return datetime.fromisoformat(row["run_time"]) >= latest_run
+
+
+def record_fetch(db_path: str, key: str, latest_run: datetime | None) -> None:
+    """Remember that `key` was fetched with `latest_run` as the newest upstream run."""
+    if latest_run is None:
+        return
+    now = datetime.now(timezone.utc)
+    conn = _conn(db_path)
+    try:
+        conn.execute(
+            """INSERT INTO model_run_fetches (fetch_key, run_time, fetched_at) VALUES (?, ?, ?)
+               ON CONFLICT(fetch_key) DO UPDATE SET run_time = excluded.run_time,
+                                                    fetched_at = excluded.fetched_at""",
+            (key, latest_run.isoformat(), now.isoformat()),
+        )
+        conn.execute("DELETE FROM model_run_fetches WHERE fetched_at < ?", ((now - _RETENTION).isoformat(),))
+        conn.commit()
+    except Exception:
+        logger.exception("Failed to record model run fetch for %s", key)
+    finally:
+        conn.close()
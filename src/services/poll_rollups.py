@@ -0,0 +1,98 @@
+"""Poll-log rollups and retention.
+
+rollup_poll_log folds poll_log rows past the rollup watermark into per-token
+hourly and daily counters, then deletes raw rows older than
+POLL_LOG_RETENTION_DAYS. Hourly counters are kept for
+HOURLY_ROLLUP_RETENTION_DAYS; daily counters (one row per token per day) are
+kept indefinitely and give the user data export its poll history past the raw
+retention. Readers combine the rollups with the raw rows past the watermark,
+which is at most one rollup interval of polls (see polls_since).
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+
+from src.utils.db import get_connection as _conn
+
+logger = logging.getLogger(__name__)
+
+POLL_LOG_RETENTION_DAYS = int(os.getenv("POLL_LOG_RETENTION_DAYS", "30"))
+HOURLY_ROLLUP_RETENTION_DAYS = 7
+ROLLUP_INTERVAL_SECONDS = 3600
+
+_WATERMARK = "poll_log"
+
+
+def _watermark(cur) -> int:
+    row = cur.execute("SELECT last_id FROM rollup_watermarks WHERE name = ?", (_WATERMARK,)).fetchone()
+    return row[0] if row else 0
+
+
+def rollup_poll_log(db_path: str, now: datetime | None = None) -> dict:
+    """Roll new poll_log rows into the hourly/daily tables and prune expired rows.
+
+    Returns {"rolled_up": rows aggregated, "pruned": raw rows deleted}.
+    """
+    now = now or datetime.now()
+    conn = _conn(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        last_id = _watermark(conn)
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM poll_log").fetchone()[0]
+        rolled_up = 0
+        if max_id > last_id:
+            rolled_up = conn.execute(
+                "SELECT COUNT(*) FROM poll_log WHERE id > ? AND id <= ?", (last_id, max_id)
+            ).fetchone()[0]
+            for table, bucket, width in (("poll_rollup_hourly", "hour", 13), ("poll_rollup_daily", "day", 10)):
+                conn.execute(
+                    f"""INSERT INTO {table} (token, {bucket}, polls)
+                        SELECT token, substr(polled_at, 1, {width}), COUNT(*) FROM poll_log
+                        WHERE id > ? AND id <= ?
+                        GROUP BY token, substr(polled_at, 1, {width})
+                        ON CONFLICT(token, {bucket}) DO UPDATE SET polls = polls + excluded.polls""",
+                    (last_id, max_id),
+                )
+            conn.execute(
+                """INSERT INTO rollup_watermarks (name, last_id) VALUES (?, ?)
+                   ON CONFLICT(name) DO UPDATE SET last_id = excluded.last_id""",
+                (_WATERMARK, max_id),
+            )
+        # Only rows already counted in the rollups may be deleted
+        pruned = conn.execute(
+            "DELETE FROM poll_log WHERE id <= ? AND polled_at < ?",
+            (max_id, (now - timedelta(days=POLL_LOG_RETENTION_DAYS)).isoformat()),
+        ).rowcount
+        conn.execute(
+            "DELETE FROM poll_rollup_hourly WHERE hour < ?",
+            ((now - timedelta(days=HOURLY_ROLLUP_RETENTION_DAYS)).isoformat()[:13],),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    if rolled_up or pruned:
+        logger.info("Poll rollup: %d rows aggregated, %d expired rows pruned", rolled_up, pruned)
+    return {"rolled_up": rolled_up, "pruned": pruned}
+
+
+def polls_since(cur, since: datetime) -> dict[str, int]:
+    """Polls per token since `since`, from the hourly rollups plus not-yet-rolled-up rows.
+
+    Rolled-up polls are counted by whole hour, so the hour containing `since`
+    is included in full.
+    """
+    counts: dict[str, int] = {}
+    cur.execute(
+        "SELECT token, SUM(polls) FROM poll_rollup_hourly WHERE hour >= ? GROUP BY token",
+        (since.isoformat()[:13],),
+    )
+    for token, polls in cur.fetchall():
+        counts[token] = polls
+    cur.execute(
+        "SELECT token, COUNT(*) FROM poll_log WHERE id > ? AND polled_at >= ? GROUP BY token",
+        (_watermark(cur), since.isoformat()),
+    )
+    for token, polls in cur.fetchall():
+        counts[token] = counts.get(token, 0) + polls
+    return counts
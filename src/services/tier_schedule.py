@@ -0,0 +1,172 @@
+"""Tier refresh plan: which timezone group refreshes which tier, and when.
+
+Each (tier, group, local time) slot fires at its exact local time plus a
+deterministic stagger within TIER_STAGGER_SECONDS, so groups sharing a local
+time (every zone's 05:30) don't all hit Open-Meteo and Google at once. The
+stagger is derived from the slot's identity, so it is stable across restarts
+and the timeline can be computed anywhere (e.g. the admin page) without
+access to the running scheduler.
+
+In REFRESH_MODE=unified, each group instead fetches its whole 15-day horizon
+in one batch call at the tier 1 times, and a per-range write policy decides
+which tiers' days each of those runs persists and pushes.
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from src.utils.scheduler import NextRun, daily_at_local, staggered
+
+# Tier schedule defaults (local times)
+DEFAULT_TIER1_TIMES = "05:30,11:00,15:30,18:30,22:00"
+DEFAULT_TIER2_TIMES = "06:00,17:00"
+DEFAULT_TIER3_TIME = "02:00"
+
+TIER_STAGGER_SECONDS = int(os.getenv("TIER_STAGGER_SECONDS", "600"))
+STARTUP_STAGGER_SECONDS = int(os.getenv("STARTUP_STAGGER_SECONDS", "120"))
+# Cap on tier refreshes starting per minute across all groups
+TIER_MAX_STARTS_PER_MINUTE = float(os.getenv("TIER_MAX_STARTS_PER_MINUTE", "6"))
+if TIER_MAX_STARTS_PER_MINUTE <= 0:
+    raise ValueError(f"TIER_MAX_STARTS_PER_MINUTE must be positive, got {TIER_MAX_STARTS_PER_MINUTE}")
+
+TIERS = ("tier1", "tier2", "tier3")
+# Day offsets from today (inclusive) covered by each tier
+TIER_DAY_RANGES = {"tier1": (0, 1), "tier2": (2, 4), "tier3": (5, 14)}
+
+# "tiered": one fetch per tier slot; "unified": one full-horizon fetch per tier 1 slot
+REFRESH_MODE = os.getenv("REFRESH_MODE", "tiered").strip().lower()
+
+
+def get_tier_times() -> tuple[list[str], list[str], list[str]]:
+    """Read tier schedule times from env vars or use defaults."""
+    tier1 = os.getenv("TIER1_TIMES", DEFAULT_TIER1_TIMES).split(",")
+    tier2 = os.getenv("TIER2_TIMES", DEFAULT_TIER2_TIMES).split(",")
+    tier3 = os.getenv("TIER3_TIME", DEFAULT_TIER3_TIME).split(",")
+    return [t.strip() for t in tier1], [t.strip() for t in tier2], [t.strip() for t in tier3]
+
+
+def stagger_seconds(key: str, window: float) -> int:
+    """Deterministic offset in [0, window) seconds for `key`."""
+    if window <= 0:
+        return 0
+    digest = hashlib.sha1(key.encode()).digest()
+    return int(int.from_bytes(digest[:4], "big") / 2 ** 32 * window)
+
+
+def _minutes(hhmm: str) -> int:
+    hour, minute = (int(p) for p in hhmm.split(":"))
+    return hour * 60 + minute
+
+
+def unified_write_plan(tier_times=None) -> dict[str, tuple[str, ...]]:
+    """Map each unified run time (the tier 1 times) to the tiers whose days it writes.
+
+    Every run writes tier 1's days. Each tier 2/3 time is served by the nearest
+    run (the earlier one on a tie, wrapping around midnight), so those days keep
+    their tiered write cadence without a fetch of their own.
+    """
+    tier1, *others = tier_times or get_tier_times()
+    plan = {t: ["tier1"] for t in tier1}
+
+    def distance(run_time: str, target: int) -> tuple[int, bool]:
+        since = (target - _minutes(run_time)) % 1440  # run before target
+        until = (_minutes(run_time) - target) % 1440  # run after target
+        return min(since, until), since > until
+
+    for tier, times in zip(TIERS[1:], others):
+        for local_time in times:
+            nearest = min(tier1, key=lambda t: distance(t, _minutes(local_time)))
+            if tier not in plan[nearest]:
+                plan[nearest].append(tier)
+    return {t: tuple(tiers) for t, tiers in plan.items()}
+
+
+def shard_for(zone: str, shards: int) -> int:
+    """Scheduler shard in [0, shards) that owns the timezone group keyed by `zone`."""
+    if shards <= 1:
+        return 0
+    return int.from_bytes(hashlib.sha1(zone.encode()).digest()[:4], "big") % shards
+
+
+@dataclass
+class TierSlot:
+    tier: str
+    zone: str
+    local_time: str
+    locations: list[dict]
+    stagger: int
+    # Unified slots only: tiers whose day ranges this run writes
+    writes: tuple[str, ...] = ()
+
+    @property
+    def name(self) -> str:
+        return f"{self.tier}_{self.zone}_{self.local_time}"
+
+    @property
+    def next_run(self) -> NextRun:
+        return staggered(daily_at_local(self.local_time, self.zone), self.stagger)
+
+
+def tier_slots(tz_groups: dict[str, list[dict]], tier_times=None,
+               window: float | None = None, mode: str | None = None) -> list[TierSlot]:
+    """One slot per (tier, timezone group, local time), or per (group, tier 1 time) when unified."""
+    tier_times = tier_times or get_tier_times()
+    window = TIER_STAGGER_SECONDS if window is None else window
+    if (mode or REFRESH_MODE) == "unified":
+        plan = unified_write_plan(tier_times)
+        return [
+            TierSlot("unified", zone, local_time, locations,
+                     stagger_seconds(f"unified:{zone}:{local_time}", window), writes)
+            for zone, locations in tz_groups.items()
+            for local_time, writes in plan.items()
+        ]
+    return [
+        TierSlot(tier, zone, local_time, locations, stagger_seconds(f"{tier}:{zone}:{local_time}", window))
+        for zone, locations in tz_groups.items()
+        for tier, times in zip(TIERS, tier_times)
+        for local_time in times
+    ]
+
+
+def startup_stagger(zone: str, window: float | None = None) -> int:
+    """Delay for a group's startup tier 1 run, so a restart doesn't refresh everything at once."""
+    return stagger_seconds(f"startup:{zone}", STARTUP_STAGGER_SECONDS if window is None else window)
+
+
+def build_timeline(tz_groups: dict[str, list[dict]], start: datetime | None = None,
+                   hours: float = 24, tier_times=None, mode: str | None = None) -> list[dict]:
+    """Planned tier runs between `start` and `start + hours`, in run order."""
+    start = start or datetime.now(timezone.utc)
+    end = start + timedelta(hours=hours)
+    runs = []
+    for slot in tier_slots(tz_groups, tier_times, mode=mode):
+        next_run = slot.next_run
+        at = next_run(start)
+        while at < end:
+            run = {
+                "at": at.isoformat(),
+                "tier": slot.tier,
+                "zone": slot.zone,
+                "local_time": slot.local_time,
+                "locations": len(slot.locations),
+            }
+            if slot.writes:
+                run["writes"] = list(slot.writes)
+            runs.append(run)
+            at = next_run(at)
+    runs.sort(key=lambda r: r["at"])
+    return runs
+
+
+def load_profile(timeline: list[dict], bucket_minutes: int = 15) -> list[dict]:
+    """Aggregate a timeline into per-bucket run and location counts (non-empty buckets only)."""
+    buckets: dict[str, dict] = {}
+    for run in timeline:
+        at = datetime.fromisoformat(run["at"])
+        floored = at.replace(minute=at.minute - at.minute % bucket_minutes, second=0, microsecond=0)
+        bucket = buckets.setdefault(floored.isoformat(), {"start": floored.isoformat(), "runs": 0, "locations": 0})
+        bucket["runs"] += 1
+        bucket["locations"] += run["locations"]
+    return [buckets[k] for k in sorted(buckets)]
@@ -0,0 +1,67 @@
+"""SQLite leases coordinating sharded scheduler processes.
+
+A lease is held by one owner until `expires_at`; the owner keeps it by
+acquiring it again before then, and anyone may take it over once it lapses.
+Scheduler shards hold a lease on their shard so two processes configured with
+the same shard never run side by side, and each tier run takes a short-lived
+lease on its slot so a slot is refreshed once even while processes are being
+resharded.
+"""
+
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+
+from src.utils.db import get_connection as _conn
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process as a lease owner
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def create_worker_leases_table(db_path: str) -> None:
+    conn = _conn(db_path)
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS worker_leases (
+                lease_key TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at TEXT NOT NULL
+            )
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat(timespec="microseconds")
+
+
+def acquire_lease(db_path: str, key: str, ttl_seconds: float, owner: str = WORKER_ID) -> bool:
+    """Take or renew `key` for `ttl_seconds`. False if another owner holds an unexpired lease."""
+    now = datetime.now(timezone.utc)
+    conn = _conn(db_path)
+    try:
+        cur = conn.execute(
+            """INSERT INTO worker_leases (lease_key, owner, expires_at) VALUES (?, ?, ?)
+               ON CONFLICT(lease_key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+               WHERE worker_leases.owner = excluded.owner OR worker_leases.expires_at <= ?""",
+            (key, owner, _iso(now + timedelta(seconds=ttl_seconds)), _iso(now)),
+        )
+        conn.commit()
+        return cur.rowcount == 1
+    finally:
+        conn.close()
+
+
+def release_lease(db_path: str, key: str, owner: str = WORKER_ID) -> None:
+    """Give up `key` if `owner` holds it."""
+    conn = _conn(db_path)
+    try:
+        conn.execute("DELETE FROM worker_leases WHERE lease_key = ? AND owner = ?", (key, owner))
+        conn.commit()
+    finally:
+        conn.close()
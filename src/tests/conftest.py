@@ -11,6 +11,7 @@ from icalendar import Calendar
 from src.events.db import create_event_tables
 from src.events.sources import create_source_tables
 from src.integrations.google_push import create_google_tokens_table
+from src.services.admin_stats import create_admin_user_stats_table
 from src.models.forecast import Forecast
 from src.services.forecast_store import ForecastStore
 from src.web.auth import create_session_token
@@ -41,6 +42,7 @@ def db_path(tmp_path):
     create_event_tables(path)
     create_source_tables(path)
     create_google_tokens_table(path)
+    create_admin_user_stats_table(path)
     return path
 
 
@@ -0,0 +1,148 @@
+import sqlite3
+
+from src.constants import DEFAULT_PREFS
+from src.services.admin_stats import create_admin_user_stats_table, reconcile_admin_user_stats
+from src.web.db import (
+    create_feed_token,
+    create_user,
+    delete_user_account,
+    get_admin_stats,
+    record_feed_polls,
+    set_user_location,
+    upsert_user_preferences,
+)
+
+
+def _stats(db_path, user_id):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    row = conn.execute("SELECT * FROM admin_user_stats WHERE user_id = ?", (user_id,)).fetchone()
+    conn.close()
+    return row
+
+
+def _user(db_path, email="stats@example.com"):
+    user_id = create_user(db_path, email, "password123456", utm_source="newsletter")
+    set_user_location(db_path, user_id, "Berlin", 52.52, 13.405, "Europe/Berlin", country="Germany")
+    token = create_feed_token(db_path, user_id)
+    return user_id, token
+
+
+def test_signup_location_and_token_fill_row(db_path):
+    user_id, token = _user(db_path)
+    row = _stats(db_path, user_id)
+    assert (row["email"], row["location"], row["country"], row["utm_source"]) == \
+        ("stats@example.com", "Berlin", "Germany", "newsletter")
+    assert row["token"] == token
+    assert row["poll_count"] == 0
+
+
+def test_poll_flush_updates_counters(db_path):
+    user_id, token = _user(db_path)
+    record_feed_polls(db_path, [(token, "2026-03-15T10:00:00", "Agent/1"), (token, "2026-03-15T11:00:00", "Agent/2")])
+    row = _stats(db_path, user_id)
+    assert row["poll_count"] == 2
+    assert row["last_polled_at"] == "2026-03-15T11:00:00"
+    assert row["last_user_agent"] == "Agent/2"
+
+
+def test_prefs_change_sets_changed_prefs(db_path):
+    user_id, _ = _user(db_path)
+    unchanged = {**DEFAULT_PREFS, "warn_sunny": 0, "allday_sunny": 0}
+    upsert_user_preferences(db_path, user_id, **unchanged)
+    assert _stats(db_path, user_id)["changed_prefs"] == 0
+    upsert_user_preferences(db_path, user_id, **{**unchanged, "cold_threshold": 0.0})
+    assert _stats(db_path, user_id)["changed_prefs"] == 1
+
+
+def test_google_connect_and_revoke(db_path):
+    from src.integrations.google_push import _mark_revoked
+    user_id, _ = _user(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO google_tokens (user_id, access_token, refresh_token, status, connected_at, updated_at) "
+        "VALUES (?, 'tok', 'ref', 'active', '2026-01-01', '2026-01-01')",
+        (user_id,),
+    )
+    conn.commit()
+    conn.close()
+    assert _stats(db_path, user_id)["google_status"] == "active"
+    _mark_revoked(db_path, user_id)
+    assert _stats(db_path, user_id)["google_status"] == "revoked"
+
+
+def test_deleted_account_removes_row(db_path):
+    user_id, _ = _user(db_path)
+    delete_user_account(db_path, user_id)
+    assert _stats(db_path, user_id) is None
+
+
+def test_reconcile_repairs_drift(db_path):
+    user_id, _ = _user(db_path)
+    other_id, _ = _user(db_path, "other@example.com")
+    assert reconcile_admin_user_stats(db_path) == 0
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE admin_user_stats SET poll_count = 99 WHERE user_id = ?", (user_id,))
+    conn.execute("DELETE FROM admin_user_stats WHERE user_id = ?", (other_id,))
+    conn.execute("INSERT INTO admin_user_stats (user_id, email) VALUES (12345, 'ghost@example.com')")
+    conn.commit()
+    conn.close()
+
+    assert reconcile_admin_user_stats(db_path) == 3
+    assert _stats(db_path, user_id)["poll_count"] == 0
+    assert _stats(db_path, other_id)["email"] == "other@example.com"
+    assert _stats(db_path, 12345) is None
+
+
+def test_create_backfills_new_table_only(db_path):
+    user_id, _ = _user(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE admin_user_stats SET poll_count = 99 WHERE user_id = ?", (user_id,))
+    conn.commit()
+    conn.close()
+
+    # Existing table: startup leaves repairs to the scheduled reconcile
+    create_admin_user_stats_table(db_path)
+    assert _stats(db_path, user_id)["poll_count"] == 99
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP TABLE admin_user_stats")
+    conn.commit()
+    conn.close()
+    create_admin_user_stats_table(db_path)
+    assert _stats(db_path, user_id)["poll_count"] == 0
+
+
+def test_location_update_refreshes_stats(db_path):
+    user_id, _ = _user(db_path)
+    # e.g. the forecast_store migration that rewrites location labels
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE user_locations SET location = 'Berlin, Germany', country = 'DE' WHERE user_id = ?",
+                 (user_id,))
+    conn.commit()
+    conn.close()
+
+    row = get_admin_stats(db_path)["users"][0]
+    assert row["city"] == "Berlin, Germany"
+    assert row["country"] == "DE"
+    assert reconcile_admin_user_stats(db_path) == 0
+
+
+def test_summary_counts_every_location_and_token(db_path):
+    user_id, token = _user(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """INSERT INTO user_locations (user_id, location, lat, lon, timezone, created_at)
+           VALUES (?, 'Hamburg', 53.55, 9.99, 'Europe/Berlin', '2026-03-15')""",
+        (user_id,),
+    )
+    conn.commit()
+    conn.close()
+    second_token = create_feed_token(db_path, user_id)
+    now = "2026-03-15T12:00:00"
+    record_feed_polls(db_path, [(token, now, "ua"), (second_token, now, "ua"), (second_token, now, "ua")])
+
+    stats = get_admin_stats(db_path)
+    assert stats["unique_locations"] == 2
+    assert stats["total_polls"] == 3
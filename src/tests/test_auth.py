@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
 from jose import jwt
 
@@ -23,3 +24,28 @@ def test_decode_expired_token_returns_none(monkeypatch):
         algorithm=ALGORITHM,
     )
     assert decode_session_token(expired_token) is None
+
+
+def test_decode_caches_verified_tokens(monkeypatch):
+    monkeypatch.setattr("src.web.auth.SECRET_KEY", "test-secret")
+    token = create_session_token(7)
+    assert decode_session_token(token) == 7
+    with patch("src.web.auth.jwt.decode") as decode:
+        assert decode_session_token(token) == 7
+    decode.assert_not_called()
+
+
+def test_cached_token_expires(monkeypatch):
+    monkeypatch.setattr("src.web.auth.SECRET_KEY", "test-secret")
+    token = create_session_token(7)
+    assert decode_session_token(token) == 7
+    monkeypatch.setattr("src.web.auth.time.time", lambda: (datetime.now() + timedelta(days=31)).timestamp())
+    assert decode_session_token(token) is None
+
+
+def test_cache_does_not_survive_key_change(monkeypatch):
+    monkeypatch.setattr("src.web.auth.SECRET_KEY", "test-secret")
+    token = create_session_token(7)
+    assert decode_session_token(token) == 7
+    monkeypatch.setattr("src.web.auth.SECRET_KEY", "rotated-secret")
+    assert decode_session_token(token) is None
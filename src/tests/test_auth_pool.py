@@ -0,0 +1,81 @@
+import asyncio
+import threading
+
+import pytest
+
+import src.web.app as web_app
+from src.web.auth_pool import AuthPool, AuthPoolBusy
+
+
+def test_run_returns_result_and_counts_completed():
+    pool = AuthPool(workers=1, max_queue=0)
+    assert asyncio.run(pool.run(lambda a, b=0: a + b, 2, b=3)) == 5
+    assert pool.metrics()["completed"] == 1
+
+
+def test_sheds_when_queue_is_full():
+    pool = AuthPool(workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.run(release.wait))
+        second = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        assert pool.metrics()["running"] == 1
+        assert pool.metrics()["queued"] == 1
+        with pytest.raises(AuthPoolBusy):
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(scenario())
+    metrics = pool.metrics()
+    assert (metrics["queued"], metrics["peak_queued"], metrics["completed"], metrics["shed"]) == (0, 1, 2, 1)
+
+
+def test_errors_propagate_and_free_the_slot():
+    pool = AuthPool(workers=1, max_queue=0)
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(pool.run(fail))
+    assert asyncio.run(pool.run(lambda: "ok")) == "ok"
+
+
+def test_cancelled_call_holds_its_slot_until_the_thread_finishes():
+    pool = AuthPool(workers=1, max_queue=0)
+    started, release = threading.Event(), threading.Event()
+
+    def hash_call():
+        started.set()
+        release.wait(5)
+
+    async def scenario():
+        task = asyncio.ensure_future(pool.run(hash_call))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The bcrypt call is still on the thread, so the pool is still full
+        assert pool.metrics()["running"] == 1
+        with pytest.raises(AuthPoolBusy):
+            await pool.run(lambda: None)
+        release.set()
+        await asyncio.get_running_loop().run_in_executor(None, pool._executor.shutdown)
+
+    asyncio.run(scenario())
+    assert pool.metrics()["running"] == 0
+    assert pool.metrics()["completed"] == 1
+
+
+def test_login_returns_503_when_pool_saturated(client, monkeypatch):
+    async def busy(*args, **kwargs):
+        raise AuthPoolBusy()
+
+    client.post("/signup", data={"email": "busy@example.com", "password": "supersecretpass1"})
+    monkeypatch.setattr(web_app.auth_pool, "run", busy)
+    resp = client.post("/login", data={"email": "busy@example.com", "password": "supersecretpass1"})
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "5"
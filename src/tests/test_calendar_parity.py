@@ -1,11 +1,11 @@
 """Tests ensuring ICS feed and Google Calendar push produce the same events."""
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 from icalendar import Calendar
 
-from src.integrations.google_push import _push_forecast_events
+from src.integrations.google_push import _build_forecast_events, _calendar_event_to_google_body
 from src.integrations.ics_service import generate_ics
 from src.models.forecast import Forecast
 from src.services.forecast_formatting import get_warning_windows, merge_overlapping_windows
@@ -79,25 +79,9 @@ def _parse_ics_events(ics_bytes):
 
 
 def _capture_google_upserts(forecast, prefs):
-    """Run _push_forecast_events with mocked service and return upserted event bodies."""
-    from zoneinfo import ZoneInfo
-
-    service = MagicMock()
-    upserted = []
-
-    def capture_import(calendarId, body):
-        upserted.append(body)
-        result = MagicMock()
-        result.execute.return_value = {}
-        return result
-
-    service.events().import_ = capture_import
-    # Also mock list for cleanup (return no existing events)
-    service.events().list().execute.return_value = {"items": []}
-
-    tz = ZoneInfo(forecast.timezone) if forecast.timezone else ZoneInfo("UTC")
-    _push_forecast_events(service, "cal123", forecast, prefs, tz, forecast.timezone)
-    return upserted
+    """Build the Google event bodies that a push would upsert for a forecast."""
+    events = _build_forecast_events(forecast, prefs)
+    return [_calendar_event_to_google_body(ce, forecast.timezone) for ce in events]
 
 
 class TestAlldayParity:
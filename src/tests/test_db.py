@@ -26,6 +26,7 @@ from src.web.db import (
     increment_settings_clicks,
     log_feed_poll,
     log_funnel_event,
+    mark_feed_first_polled,
     update_feed_poll,
     upsert_user_preferences,
 )
@@ -152,6 +153,29 @@ def test_update_feed_poll_unknown_token_is_noop(db_path):
     update_feed_poll(db_path, "nonexistent-token", "agent")
 
 
+def test_mark_feed_first_polled_only_once(db_path):
+    user_id = create_user(db_path, "firstpoll@example.com", "password123456")
+    token = create_feed_token(db_path, user_id)
+    assert mark_feed_first_polled(db_path, token) is True
+    assert mark_feed_first_polled(db_path, token) is False
+    assert mark_feed_first_polled(db_path, "nonexistent-token") is False
+
+
+def test_first_polled_at_backfilled_for_polled_tokens(db_path):
+    polled = create_feed_token(db_path, create_user(db_path, "polled@example.com", "password123456"))
+    unpolled = create_feed_token(db_path, create_user(db_path, "unpolled@example.com", "password123456"))
+    update_feed_poll(db_path, polled, "TestAgent/1.0")
+    conn = sqlite3.connect(db_path)
+    conn.execute("ALTER TABLE feed_tokens DROP COLUMN first_polled_at")  # schema before the column
+    conn.commit()
+    conn.close()
+
+    ForecastStore(db_path=db_path)
+
+    assert mark_feed_first_polled(db_path, polled) is False
+    assert mark_feed_first_polled(db_path, unpolled) is True
+
+
 def test_log_feed_poll_inserts_rows(db_path):
     user_id = create_user(db_path, "logpoll@example.com", "password123456")
     token = create_feed_token(db_path, user_id)
@@ -644,6 +668,32 @@ def test_get_funnel_timeseries_days_param_limits_range(db_path):
     assert len(rows_30) == 30
 
 
+def test_get_funnel_timeseries_excludes_days_outside_range(db_path):
+    old = (datetime.now() - timedelta(days=10)).isoformat()
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO funnel_events (user_id, event_name, created_at, event_date) VALUES (1, 'signup_completed', ?, ?)",
+        (old, old[:10]),
+    )
+    conn.commit()
+    conn.close()
+    assert sum(r["signups"] for r in get_funnel_timeseries(db_path, days=7)) == 0
+    assert sum(r["signups"] for r in get_funnel_timeseries(db_path, days=30)) == 1
+
+
+def test_funnel_event_date_backfilled_on_init(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO funnel_events (user_id, event_name, created_at) VALUES (1, 'signup_completed', ?)",
+        (datetime.now().isoformat(),),
+    )
+    conn.commit()
+    conn.close()
+    ForecastStore(db_path=db_path)
+    today = datetime.now().date().isoformat()
+    assert next(r for r in get_funnel_timeseries(db_path, days=7) if r["date"] == today)["signups"] == 1
+
+
 # --- Funnel by source ---
 
 
@@ -18,7 +18,7 @@ from src.web.db import (
     set_user_location,
     upsert_user_preferences,
 )
-from src.integrations.google_push import _get_valid_credentials
+from src.integrations.google_push import _get_calendar_service
 
 
 # --- export helpers ---
@@ -111,11 +111,11 @@ def test_get_per_user_stats(db_path):
         conn.close()
 
 
-# --- _get_valid_credentials ---
+# --- _get_calendar_service ---
 
-def test_get_valid_credentials_no_tokens(db_path):
+def test_get_calendar_service_no_tokens(db_path):
     """Should return (None, None) when user has no Google tokens."""
     user_id = create_user(db_path, "nocreds@test.com", "supersecretpass1")
-    creds, cal_id = _get_valid_credentials(db_path, user_id)
-    assert creds is None
+    service, cal_id = _get_calendar_service(db_path, user_id)
+    assert service is None
     assert cal_id is None
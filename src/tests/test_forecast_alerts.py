@@ -15,6 +15,7 @@ from src.services.forecast_alerts import (
     check_consecutive_failures,
     check_staleness,
     log_refresh_result,
+    log_refresh_skip,
 )
 
 
@@ -49,7 +50,8 @@ def db_path(tmp_path):
             tier TEXT NOT NULL,
             status TEXT NOT NULL,
             created_at TEXT NOT NULL,
-            error TEXT
+            error TEXT,
+            details TEXT
         )
     """)
     conn.commit()
@@ -92,6 +94,21 @@ def test_consecutive_failures_at_threshold(db_path):
     assert "400" in last_error
 
 
+def test_skipped_refreshes_do_not_break_failure_streak(db_path):
+    for _ in range(3):
+        log_refresh_result(db_path, "tier1", success=False, error="400 Bad Request")
+        log_refresh_skip(db_path, "tier2", "no new model run")
+    is_failing, _, _ = check_consecutive_failures(db_path)
+    assert is_failing is True
+
+    conn = sqlite3.connect(db_path)
+    row = conn.execute(
+        "SELECT status, details FROM forecast_refresh_log WHERE tier = 'tier2' LIMIT 1"
+    ).fetchone()
+    conn.close()
+    assert row == ("skipped", "no new model run")
+
+
 def test_staleness_fresh_data(db_path):
     now = datetime.now(timezone.utc).isoformat()
     conn = sqlite3.connect(db_path)
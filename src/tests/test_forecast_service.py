@@ -535,3 +535,29 @@ def test_request_json_does_not_retry_client_error(monkeypatch):
         )
 
     assert sleep_calls == []
+
+
+def test_get_latest_model_run_takes_newest_model(monkeypatch):
+    runs = {"dwd_icon": 1773554400, "ncep_gfs025": 1773576000}
+    monkeypatch.setattr(ForecastService, "MODEL_RUN_MODELS", list(runs))
+    monkeypatch.setattr(ForecastService, "_model_run_cache", None)
+    calls = []
+
+    def mock_get(url, **kwargs):
+        calls.append(url)
+        model = next(m for m in runs if f"/{m}/" in url)
+        return MockResponse({"last_run_availability_time": runs[model]})
+    monkeypatch.setattr("requests.get", mock_get)
+
+    latest = ForecastService.get_latest_model_run()
+    assert latest.timestamp() == 1773576000
+    assert latest.tzinfo is not None
+    # Second call is served from the cache
+    assert ForecastService.get_latest_model_run() == latest
+    assert len(calls) == 2
+
+
+def test_get_latest_model_run_unknown_on_error(monkeypatch):
+    monkeypatch.setattr(ForecastService, "_model_run_cache", None)
+    monkeypatch.setattr("requests.get", lambda *a, **k: MockResponse({}, status_code=503))
+    assert ForecastService.get_latest_model_run() is None
@@ -173,6 +173,34 @@ def test_upsert_forecast_updates_existing_row(store):
     assert stored.fetch_time == "2099-01-31T23:00:00"
 
 
+def test_changed_forecasts_compares_content_hash(store):
+    def fc(date, temps, fetch_time="2099-01-31T22:00:00"):
+        return Forecast(date=date, location="Munich", high=10, low=1, times=[f"{date}T12:00"],
+                        temps=temps, fetch_time=fetch_time)
+
+    store.upsert_forecast(fc("2099-02-01", [5.0]))
+    store.upsert_forecast(fc("2099-02-02", [6.0]))
+
+    refetched = [fc("2099-02-01", [5.0]), fc("2099-02-02", [7.0]), fc("2099-02-03", [8.0])]
+    changed = store.changed_forecasts(refetched)
+
+    assert [f.date for f in changed] == ["2099-02-02", "2099-02-03"]
+
+
+def test_touch_forecasts_bumps_last_updated_only(store):
+    original = Forecast(date="2099-02-01", location="Munich", high=10, low=1, summary="Cloudy",
+                        fetch_time="2099-01-31T22:00:00")
+    store.upsert_forecast(original)
+
+    store.touch_forecasts([Forecast(date="2099-02-01", location="Munich", high=99, low=99,
+                                    fetch_time="2099-01-31T23:00:00")])
+
+    stored = store.get_forecasts_future(days=10)[0]
+    assert stored.fetch_time == "2099-01-31T23:00:00"
+    assert stored.high == 10
+    assert stored.summary == "Cloudy"
+
+
 def test_init_db_migrates_old_location_format(tmp_path):
     """Locations stored as 'City, Country' are migrated to 'City' on init."""
     import sqlite3
@@ -222,3 +250,76 @@ def test_init_db_creates_admin1_and_country_columns(tmp_path):
     conn.close()
     assert "admin1" in cols
     assert "country" in cols
+
+
+def test_stored_forecasts_decode_hourly_lazily(store):
+    store.upsert_forecast(Forecast(date="2099-01-01", location="Munich", high=20, low=10,
+                                   times=["2099-01-01T12:00"], temps=[20.5], codes=[1],
+                                   apparent_temps=[19.0], fetch_time="2098-12-31T23:00:00"))
+
+    stored = store.get_forecasts_for_locations(["Munich"])[0]
+    assert not hasattr(stored, "__dict__")
+    assert stored._hourly_json is not None
+    assert stored.summary is None  # scalar fields don't trigger the decode
+    assert stored._hourly_json is not None
+
+    assert stored.temps == [20.5]
+    assert stored._hourly_json is None
+    assert stored.apparent_temps == [19.0]
+    assert stored.replace(temps=stored.apparent_temps).temps == [19.0]
+    assert stored.temps == [20.5]
+
+
+def test_forecast_construction_leaves_fetch_time_unset():
+    forecast = Forecast(date="2099-01-01", location="Munich", high=20, low=10)
+    assert forecast.fetch_time is None
+    assert forecast.times == [] and forecast.times is not Forecast(date="x", location="y", high=0, low=0).times
+
+
+def test_get_forecasts_for_locations_is_served_from_cache(store, monkeypatch):
+    from src.services import forecast_store
+    store.upsert_forecast(Forecast(date="2099-01-01", location="Munich", high=20, low=10, summary="v1",
+                                   fetch_time="2099-01-01T06:00:00"))
+    first = store.get_forecasts_for_locations(["Munich"])
+    assert store.get_forecasts_for_locations(["Munich"])[0] is first[0]
+
+    # In-process write: invalidated by upsert_forecast even with the same last_updated
+    store.upsert_forecast(Forecast(date="2099-01-01", location="Munich", high=21, low=10, summary="v2",
+                                   fetch_time="2099-01-01T06:00:00"))
+    assert store.get_forecasts_for_locations(["Munich"])[0].summary == "v2"
+
+    # Write from another process: picked up through the last_updated high-water mark
+    import sqlite3
+    conn = sqlite3.connect(store.db_path)
+    conn.execute("UPDATE forecast SET summary = 'v3', last_updated = '2099-01-01T12:00:00'")
+    conn.commit()
+    conn.close()
+    assert store.get_forecasts_for_locations(["Munich"])[0].summary == "v3"
+
+    monkeypatch.setattr(forecast_store, "FORECAST_CACHE_SIZE", 1)
+    store.upsert_forecast(Forecast(date="2099-01-01", location="Berlin", high=5, low=1))
+    store.get_forecasts_for_locations(["Berlin", "Munich"])
+    assert len(forecast_store._forecast_cache) == 1
+
+
+def test_get_forecasts_for_locations_returns_days_per_location(store):
+    from datetime import date, timedelta
+    start = date.today()
+    for n in range(20):
+        store.upsert_forecast(Forecast(date=(start + timedelta(days=n)).isoformat(), location="Munich", high=1, low=0))
+    for n in range(2):
+        store.upsert_forecast(Forecast(date=(start + timedelta(days=n)).isoformat(), location="Berlin", high=1, low=0))
+
+    forecasts = store.get_forecasts_for_locations(["Munich", "Berlin"], days=14)
+    assert [f.location for f in forecasts] == ["Berlin"] * 2 + ["Munich"] * 14
+    assert forecasts[-1].date == (start + timedelta(days=13)).isoformat()
+
+
+def test_forecast_location_reads_use_index(store):
+    import sqlite3
+    conn = sqlite3.connect(store.db_path)
+    plan = " ".join(row[-1] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT location, MAX(last_updated), COUNT(*) FROM forecast "
+        "WHERE date >= ? AND location IN (?, ?) GROUP BY location", ("2099-01-01", "Munich", "Berlin")))
+    conn.close()
+    assert "idx_forecast_location_date" in plan
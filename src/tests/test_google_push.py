@@ -4,11 +4,17 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+import httplib2
+from googleapiclient.errors import HttpError
+
 from src.integrations.google_push import (
-    _cleanup_beyond_forecast,
-    _cleanup_stale_events,
-    _push_forecast_events,
-    _upsert_event,
+    _apply_event_changes,
+    _build_forecast_events,
+    _calendar_event_to_google_body,
+    _find_stale_event_ids,
+    _get_event_ids_by_uid,
+    _run_batch,
+    _sync_remote_events,
     create_google_tokens_table,
     delete_google_calendar,
     delete_google_tokens,
@@ -19,12 +25,51 @@ from src.integrations.google_push import (
     store_google_tokens,
     create_weathercal_calendar,
     push_events_for_user,
+    rate_limit_cooldown,
     refresh_and_persist,
 )
 from src.constants import DEFAULT_PREFS
+from src.utils.rate_limit import TokenBucket
 from src.web.db import create_user
 
 
+@pytest.fixture(autouse=True)
+def unlimited_api_rate(monkeypatch):
+    monkeypatch.setattr("src.integrations.google_push.api_rate_limiter", TokenBucket(rate=1e6))
+    monkeypatch.setattr("src.integrations.google_push._service_cache", {})
+
+
+class _FakeBatch:
+    """Stand-in for BatchHttpRequest that executes each added request in turn."""
+
+    def __init__(self, callback):
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id=None):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self._requests:
+            try:
+                response, exception = request.execute(), None
+            except HttpError as e:
+                response, exception = None, e
+            self._callback(request_id, response, exception)
+
+
+def _batching_service():
+    service = MagicMock()
+    service.new_batch_http_request.side_effect = lambda callback=None: _FakeBatch(callback)
+    return service
+
+
+def _http_error(status, content=b"error"):
+    resp = MagicMock()
+    resp.status = status
+    return HttpError(resp, content)
+
+
 def _make_credentials(token="access_tok", refresh="refresh_tok", expiry=None):
     cred = MagicMock()
     cred.token = token
@@ -98,6 +143,21 @@ def test_get_google_connected_users_filters_revoked(db_path):
     assert user2 not in user_ids
 
 
+def test_get_google_connected_users_filters_by_location(db_path):
+    from src.web.db import set_user_location
+
+    munich = create_user(db_path, "munich@example.com", "supersecretpass1")
+    tokyo = create_user(db_path, "tokyo@example.com", "supersecretpass1")
+    set_user_location(db_path, munich, "Munich", 48.1, 11.6, "Europe/Berlin")
+    set_user_location(db_path, tokyo, "Tokyo", 35.7, 139.7, "Asia/Tokyo")
+    cred = _make_credentials()
+    store_google_tokens(db_path, munich, cred, "cal1")
+    store_google_tokens(db_path, tokyo, cred, "cal2")
+
+    assert [u["user_id"] for u in get_google_connected_users(db_path, locations=["Munich"])] == [munich]
+    assert get_google_connected_users(db_path, locations=[]) == []
+
+
 # --- google_oauth_enabled ---
 
 def test_google_oauth_enabled_when_set(monkeypatch):
@@ -177,144 +237,422 @@ def test_delete_google_calendar_handles_404(db_path, monkeypatch):
         delete_google_calendar(db_path, user_id)  # should not raise
 
 
-# --- Stale event cleanup ---
+# --- Credential / service cache ---
 
-class TestCleanupStaleEvents:
-    """Tests for _cleanup_stale_events."""
+def _naive_utc_in(minutes):
+    return datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(minutes=minutes)
 
-    def _mock_service(self, existing_items):
-        service = MagicMock()
-        service.events().list().execute.return_value = {"items": existing_items}
-        return service
 
-    def test_deletes_stale_timed_events(self):
-        from zoneinfo import ZoneInfo
-        tz = ZoneInfo("Europe/Berlin")
-        stale_event = {
-            "id": "evt_stale",
-            "iCalUID": "stale_uid@weathercal.app",
-            "start": {"dateTime": "2026-03-11T08:00:00+01:00"},
-        }
-        service = self._mock_service([stale_event])
+def test_build_google_service_uses_bundled_discovery_doc():
+    from google.oauth2.credentials import Credentials
+    from src.integrations import google_push
 
-        _cleanup_stale_events(service, "cal123", "2026-03-11",
-                              expected_allday_uids=set(),
-                              expected_timed_uids={"current_uid@weathercal.app"},
-                              tz=tz)
+    with patch("googleapiclient.discovery.build") as network_build:
+        service = google_push.build_google_service(Credentials(token="tok"))
+        google_push.build_google_service(Credentials(token="tok"))
 
-        service.events().delete.assert_called_with(
-            calendarId="cal123", eventId="evt_stale"
-        )
+    network_build.assert_not_called()
+    assert hasattr(service, "events")
+    assert google_push._discovery_document.cache_info().currsize == 1
 
-    def test_preserves_current_timed_events(self):
-        from zoneinfo import ZoneInfo
-        tz = ZoneInfo("Europe/Berlin")
-        current_uid = "current_uid@weathercal.app"
-        current_event = {
-            "id": "evt_current",
-            "iCalUID": current_uid,
-            "start": {"dateTime": "2026-03-11T08:00:00+01:00"},
+
+def test_calendar_service_is_cached_per_user(db_path):
+    from src.integrations.google_push import _get_calendar_service
+    user_id = create_user(db_path, "cache@example.com", "supersecretpass1")
+    store_google_tokens(db_path, user_id, _make_credentials(expiry=_naive_utc_in(60)), "cal123")
+
+    with patch("src.integrations.google_push.build_google_service",
+               side_effect=lambda c: MagicMock()) as build:
+        first = _get_calendar_service(db_path, user_id)
+        second = _get_calendar_service(db_path, user_id)
+
+    assert build.call_count == 1
+    assert first == second
+    assert first[1] == "cal123"
+
+
+def test_calendar_service_rebuilt_when_stored_token_changes(db_path):
+    from src.integrations.google_push import _get_calendar_service
+    user_id = create_user(db_path, "cache2@example.com", "supersecretpass1")
+    store_google_tokens(db_path, user_id, _make_credentials(expiry=_naive_utc_in(60)), "cal123")
+
+    with patch("src.integrations.google_push.build_google_service",
+               side_effect=lambda c: MagicMock()) as build:
+        _get_calendar_service(db_path, user_id)
+        # Another process (e.g. the web app) refreshed the token
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE google_tokens SET access_token = 'new_tok' WHERE user_id = ?", (user_id,))
+        conn.commit()
+        conn.close()
+        _get_calendar_service(db_path, user_id)
+
+    assert build.call_count == 2
+
+
+def test_calendar_service_refreshes_token_before_expiry(db_path):
+    from src.integrations.google_push import _get_calendar_service
+    user_id = create_user(db_path, "cache3@example.com", "supersecretpass1")
+    store_google_tokens(db_path, user_id, _make_credentials(expiry=_naive_utc_in(2)), "cal123")
+
+    def fake_refresh(self, request):
+        self.token = "refreshed_tok"
+        self.expiry = _naive_utc_in(60)
+
+    with patch("google.oauth2.credentials.Credentials.refresh", fake_refresh), \
+         patch("src.integrations.google_push.build_google_service", return_value=MagicMock()):
+        service, _ = _get_calendar_service(db_path, user_id)
+
+    assert service is not None
+    assert get_google_credentials(db_path, user_id).token == "refreshed_tok"
+
+
+def test_calendar_service_cache_invalidated_on_disconnect(db_path):
+    from src.integrations import google_push
+    user_id = create_user(db_path, "cache4@example.com", "supersecretpass1")
+    store_google_tokens(db_path, user_id, _make_credentials(expiry=_naive_utc_in(60)), "cal123")
+
+    with patch("src.integrations.google_push.build_google_service", return_value=MagicMock()):
+        google_push._get_calendar_service(db_path, user_id)
+    assert user_id in google_push._service_cache
+
+    delete_google_tokens(db_path, user_id)
+    assert user_id not in google_push._service_cache
+    assert google_push._get_calendar_service(db_path, user_id) == (None, None)
+
+
+# --- Remote sync (syncToken mirror) ---
+
+def _connected_user(db_path, email="sync@example.com"):
+    user_id = create_user(db_path, email, "supersecretpass1")
+    store_google_tokens(db_path, user_id, _make_credentials(), "cal123")
+    return user_id
+
+
+def _mirror(db_path, user_id, *events):
+    """Insert (event_id, ical_uid, start_date, is_allday, status) rows into google_events."""
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        """INSERT INTO google_events (user_id, event_id, ical_uid, start_date, is_allday, status)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        [(user_id, *e) for e in events],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _sync_token(db_path, user_id):
+    conn = sqlite3.connect(db_path)
+    row = conn.execute("SELECT sync_token FROM google_tokens WHERE user_id = ?", (user_id,)).fetchone()
+    conn.close()
+    return row[0]
+
+
+def _mirrored_ids(db_path, user_id):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT event_id, status FROM google_events WHERE user_id = ? ORDER BY event_id", (user_id,)
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def _start_dates(db_path, user_id):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT event_id, start_date FROM google_events WHERE user_id = ?", (user_id,)).fetchall()
+    conn.close()
+    return dict(rows)
+
+
+class TestSyncRemoteEvents:
+    """Tests for _sync_remote_events."""
+
+    def test_full_sync_populates_mirror_and_token(self, db_path):
+        user_id = _connected_user(db_path)
+        service = MagicMock()
+        service.events().list().execute.return_value = {
+            "items": [
+                {"id": "e1", "iCalUID": "a@weathercal.app", "start": {"date": "2026-03-11"}, "status": "confirmed"},
+                {"id": "e2", "iCalUID": "b@weathercal.app",
+                 "start": {"dateTime": "2026-03-11T08:00:00+01:00"}, "status": "confirmed"},
+            ],
+            "nextSyncToken": "tok1",
         }
-        service = self._mock_service([current_event])
 
-        _cleanup_stale_events(service, "cal123", "2026-03-11",
-                              expected_allday_uids=set(),
-                              expected_timed_uids={current_uid},
-                              tz=tz)
+        _sync_remote_events(db_path, user_id, service, "cal123")
 
-        service.events().delete.assert_not_called()
+        assert _sync_token(db_path, user_id) == "tok1"
+        assert _mirrored_ids(db_path, user_id) == [("e1", "confirmed"), ("e2", "confirmed")]
+        kwargs = service.events().list.call_args[1]
+        assert "syncToken" not in kwargs
 
-    def test_deletes_allday_when_disabled(self):
-        from zoneinfo import ZoneInfo
-        tz = ZoneInfo("Europe/Berlin")
-        allday_event = {
-            "id": "evt_allday",
-            "iCalUID": "allday_uid@weathercal.app",
-            "start": {"date": "2026-03-11"},
+    def test_incremental_sync_uses_token_and_applies_cancellations(self, db_path):
+        user_id = _connected_user(db_path)
+        _mirror(db_path, user_id, ("e1", "a@weathercal.app", "2026-03-11", 1, "confirmed"))
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE google_tokens SET sync_token = 'tok1' WHERE user_id = ?", (user_id,))
+        conn.commit()
+        conn.close()
+
+        service = MagicMock()
+        service.events().list().execute.return_value = {
+            "items": [{"id": "e1", "status": "cancelled"}],
+            "nextSyncToken": "tok2",
         }
-        service = self._mock_service([allday_event])
 
-        # Empty expected_allday_uids = all-day events disabled
-        _cleanup_stale_events(service, "cal123", "2026-03-11",
-                              expected_allday_uids=set(),
-                              expected_timed_uids=set(),
-                              tz=tz)
+        _sync_remote_events(db_path, user_id, service, "cal123")
 
-        service.events().delete.assert_called_with(
-            calendarId="cal123", eventId="evt_allday"
-        )
+        assert service.events().list.call_args[1]["syncToken"] == "tok1"
+        assert _sync_token(db_path, user_id) == "tok2"
+        assert _mirrored_ids(db_path, user_id) == [("e1", "cancelled")]
+        # UID survives the minimal cancelled payload so the event can be restored via update
+        assert _get_event_ids_by_uid(db_path, user_id, ["a@weathercal.app"]) == {"a@weathercal.app": "e1"}
 
-    def test_preserves_allday_when_enabled(self):
-        from zoneinfo import ZoneInfo
-        tz = ZoneInfo("Europe/Berlin")
-        allday_uid = "allday_uid@weathercal.app"
-        allday_event = {
-            "id": "evt_allday",
-            "iCalUID": allday_uid,
-            "start": {"date": "2026-03-11"},
+    def test_follows_pagination(self, db_path):
+        user_id = _connected_user(db_path)
+        service = MagicMock()
+        service.events().list().execute.side_effect = [
+            {"items": [{"id": "e1", "iCalUID": "a@weathercal.app", "start": {"date": "2026-03-11"}}],
+             "nextPageToken": "page2"},
+            {"items": [{"id": "e2", "iCalUID": "b@weathercal.app", "start": {"date": "2026-03-12"}}],
+             "nextSyncToken": "tok1"},
+        ]
+
+        _sync_remote_events(db_path, user_id, service, "cal123")
+
+        assert [r[0] for r in _mirrored_ids(db_path, user_id)] == ["e1", "e2"]
+        assert service.events().list.call_args[1]["pageToken"] == "page2"
+
+    def test_410_gone_triggers_full_resync(self, db_path):
+        user_id = _connected_user(db_path)
+        _mirror(db_path, user_id, ("old", "old@weathercal.app", "2026-03-11", 1, "confirmed"))
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE google_tokens SET sync_token = 'expired' WHERE user_id = ?", (user_id,))
+        conn.commit()
+        conn.close()
+
+        service = MagicMock()
+        service.events().list().execute.side_effect = [
+            _http_error(410, b"Gone"),
+            {"items": [{"id": "new", "iCalUID": "new@weathercal.app", "start": {"date": "2026-03-11"}}],
+             "nextSyncToken": "fresh"},
+        ]
+
+        _sync_remote_events(db_path, user_id, service, "cal123")
+
+        assert _sync_token(db_path, user_id) == "fresh"
+        assert _mirrored_ids(db_path, user_id) == [("new", "confirmed")]
+        assert "syncToken" not in service.events().list.call_args[1]
+
+    def test_timed_events_are_dated_in_location_zone(self, db_path):
+        user_id = _connected_user(db_path)
+        service = MagicMock()
+        service.events().list().execute.return_value = {
+            "items": [
+                # 07:30 on the 11th in Tokyo, still the 10th in UTC
+                {"id": "tokyo", "iCalUID": "a@weathercal.app",
+                 "start": {"dateTime": "2026-03-10T22:30:00Z", "timeZone": "UTC"}},
+            ],
+            "nextSyncToken": "tok1",
         }
-        service = self._mock_service([allday_event])
 
-        _cleanup_stale_events(service, "cal123", "2026-03-11",
-                              expected_allday_uids={allday_uid},
-                              expected_timed_uids=set(),
-                              tz=tz)
+        _sync_remote_events(db_path, user_id, service, "cal123", "Asia/Tokyo")
 
-        service.events().delete.assert_not_called()
+        assert _start_dates(db_path, user_id) == {"tokyo": "2026-03-11"}
 
-    def test_skips_allday_from_adjacent_date(self):
-        """All-day events from adjacent dates (returned due to timezone overlap) must not be deleted."""
-        from zoneinfo import ZoneInfo
-        tz = ZoneInfo("Europe/Berlin")
-        # Google returns Mar 12's all-day event when querying Mar 13 due to UTC offset
-        prev_day_allday = {
-            "id": "evt_prev_allday",
-            "iCalUID": "prev_allday_uid@weathercal.app",
-            "start": {"date": "2026-03-12"},
+    def test_timed_events_fall_back_to_event_zone(self, db_path):
+        user_id = _connected_user(db_path)
+        service = MagicMock()
+        service.events().list().execute.return_value = {
+            "items": [
+                # 22:00 on the 11th in Los Angeles, already the 12th in UTC
+                {"id": "la", "iCalUID": "b@weathercal.app",
+                 "start": {"dateTime": "2026-03-12T05:00:00Z", "timeZone": "America/Los_Angeles"}},
+            ],
+            "nextSyncToken": "tok1",
         }
-        current_allday = {
-            "id": "evt_current_allday",
-            "iCalUID": "current_allday_uid@weathercal.app",
-            "start": {"date": "2026-03-13"},
+
+        _sync_remote_events(db_path, user_id, service, "cal123")
+
+        assert _start_dates(db_path, user_id) == {"la": "2026-03-11"}
+
+    def test_retries_rate_limited_list(self, db_path, monkeypatch):
+        monkeypatch.setattr("src.integrations.google_push.time.sleep", lambda s: None)
+        user_id = _connected_user(db_path)
+        service = MagicMock()
+        service.events().list().execute.side_effect = [
+            _http_error(429, b"Too Many Requests"),
+            {"items": [], "nextSyncToken": "tok1"},
+        ]
+
+        _sync_remote_events(db_path, user_id, service, "cal123")
+
+        assert _sync_token(db_path, user_id) == "tok1"
+
+    def test_reconnect_resets_mirror(self, db_path):
+        user_id = _connected_user(db_path)
+        _mirror(db_path, user_id, ("e1", "a@weathercal.app", "2026-03-11", 1, "confirmed"))
+
+        store_google_tokens(db_path, user_id, _make_credentials(), "new_cal")
+
+        assert _mirrored_ids(db_path, user_id) == []
+        assert _sync_token(db_path, user_id) is None
+
+
+# --- Stale event detection ---
+
+class TestFindStaleEventIds:
+    """Tests for _find_stale_event_ids against the local mirror."""
+
+    def test_selects_stale_timed_events(self, db_path):
+        user_id = _connected_user(db_path)
+        _mirror(db_path, user_id,
+                ("evt_stale", "stale_uid@weathercal.app", "2026-03-11", 0, "confirmed"),
+                ("evt_current", "current_uid@weathercal.app", "2026-03-11", 0, "confirmed"))
+
+        stale = _find_stale_event_ids(db_path, user_id, {
+            "2026-03-11": (set(), {"current_uid@weathercal.app"}),
+        })
+        assert stale == ["evt_stale"]
+
+    def test_selects_allday_when_disabled(self, db_path):
+        user_id = _connected_user(db_path)
+        _mirror(db_path, user_id, ("evt_allday", "allday_uid@weathercal.app", "2026-03-11", 1, "confirmed"))
+
+        # Empty expected_allday_uids = all-day events disabled
+        stale = _find_stale_event_ids(db_path, user_id, {"2026-03-11": (set(), set())})
+        assert stale == ["evt_allday"]
+
+    def test_preserves_allday_when_enabled(self, db_path):
+        user_id = _connected_user(db_path)
+        _mirror(db_path, user_id, ("evt_allday", "allday_uid@weathercal.app", "2026-03-11", 1, "confirmed"))
+
+        stale = _find_stale_event_ids(db_path, user_id, {
+            "2026-03-11": ({"allday_uid@weathercal.app"}, set()),
+        })
+        assert stale == []
+
+    def test_allday_uid_expected_as_timed_is_stale(self, db_path):
+        """An all-day event is only kept if its UID is expected among the all-day events."""
+        user_id = _connected_user(db_path)
+        _mirror(db_path, user_id, ("evt", "uid@weathercal.app", "2026-03-11", 1, "confirmed"))
+
+        stale = _find_stale_event_ids(db_path, user_id, {"2026-03-11": (set(), {"uid@weathercal.app"})})
+        assert stale == ["evt"]
+
+    def test_selects_events_beyond_window(self, db_path):
+        user_id = _connected_user(db_path)
+        _mirror(db_path, user_id,
+                ("evt_last", "last@weathercal.app", "2026-03-24", 1, "confirmed"),
+                ("evt_beyond", "beyond@weathercal.app", "2026-03-26", 1, "confirmed"))
+
+        stale = _find_stale_event_ids(db_path, user_id, {
+            "2026-03-11": (set(), set()),
+            "2026-03-24": ({"last@weathercal.app"}, set()),
+        })
+        assert stale == ["evt_beyond"]
+
+    def test_keeps_events_beyond_window_for_partial_push(self, db_path):
+        user_id = _connected_user(db_path)
+        _mirror(db_path, user_id, ("evt_later", "later@weathercal.app", "2026-03-20", 1, "confirmed"))
+
+        stale = _find_stale_event_ids(db_path, user_id, {"2026-03-11": (set(), set())}, prune_beyond=False)
+        assert stale == []
+
+    def test_ignores_past_and_cancelled_events(self, db_path):
+        user_id = _connected_user(db_path)
+        _mirror(db_path, user_id,
+                ("evt_past", "past@weathercal.app", "2026-03-01", 1, "confirmed"),
+                ("evt_cancelled", "gone@weathercal.app", "2026-03-11", 1, "cancelled"))
+
+        stale = _find_stale_event_ids(db_path, user_id, {"2026-03-11": (set(), set())})
+        assert stale == []
+
+    def test_skips_non_weathercal_events(self, db_path):
+        user_id = _connected_user(db_path)
+        _mirror(db_path, user_id,
+                ("evt_other", "something@gmail.com", "2026-03-11", 0, "confirmed"),
+                ("evt_wc", "abc123@weathercal.app", "2026-03-11", 0, "confirmed"))
+
+        stale = _find_stale_event_ids(db_path, user_id, {"2026-03-11": (set(), set())})
+        assert stale == ["evt_wc"]
+
+    def test_event_ids_by_uid_prefers_live_event(self, db_path):
+        user_id = _connected_user(db_path)
+        _mirror(db_path, user_id,
+                ("evt_live", "uid@weathercal.app", "2026-03-11", 1, "confirmed"),
+                ("evt_old", "uid@weathercal.app", "2026-03-11", 1, "cancelled"))
+
+        assert _get_event_ids_by_uid(db_path, user_id, ["uid@weathercal.app"]) == {
+            "uid@weathercal.app": "evt_live"
         }
-        service = self._mock_service([prev_day_allday, current_allday])
 
-        _cleanup_stale_events(service, "cal123", "2026-03-13",
-                              expected_allday_uids={"current_allday_uid@weathercal.app"},
-                              expected_timed_uids=set(),
-                              tz=tz)
 
-        # prev_day_allday should be skipped (wrong date), not deleted
-        service.events().delete.assert_not_called()
+# --- Batch execution ---
 
-    def test_handles_list_api_error(self):
-        from googleapiclient.errors import HttpError
-        from zoneinfo import ZoneInfo
-        tz = ZoneInfo("Europe/Berlin")
+class TestRunBatch:
+    """Tests for _run_batch."""
 
-        service = MagicMock()
-        mock_resp = MagicMock()
-        mock_resp.status = 500
-        service.events().list().execute.side_effect = HttpError(mock_resp, b"Server Error")
+    def _request(self, *outcomes):
+        request = MagicMock()
+        request.execute.side_effect = list(outcomes)
+        return request
 
-        # Should not raise
-        _cleanup_stale_events(service, "cal123", "2026-03-11",
-                              expected_allday_uids=set(),
-                              expected_timed_uids=set(),
-                              tz=tz)
+    def test_splits_into_batches_and_maps_results(self):
+        service = _batching_service()
+        requests = {f"r{i}": self._request({"id": i}) for i in range(51)}
+        requests["bad"] = self._request(_http_error(400, b"Bad Request"))
 
+        results = _run_batch(service, requests)
 
-# --- Upsert event (list-first approach) ---
+        # 52 calls at BATCH_SIZE 50 per batch = 2 round trips
+        assert service.new_batch_http_request.call_count == 2
+        assert results["r7"] == ({"id": 7}, None)
+        assert results["bad"][0] is None
+        assert results["bad"][1].resp.status == 400
 
-class TestUpsertEvent:
-    """Tests for _upsert_event — always lists first (including soft-deleted)."""
+    def test_retries_only_rate_limited_items(self, monkeypatch):
+        monkeypatch.setattr("src.integrations.google_push.time.sleep", lambda s: None)
+        service = _batching_service()
+        limited = self._request(_http_error(429, b"Too Many Requests"), {"id": "later"})
+        ok = self._request({"id": "now"})
+
+        results = _run_batch(service, {"limited": limited, "ok": ok})
+
+        assert results == {"limited": ({"id": "later"}, None), "ok": ({"id": "now"}, None)}
+        assert ok.execute.call_count == 1
+        assert limited.execute.call_count == 2
+
+
+class TestRateLimitCooldown:
+    """Tests for rate_limit_cooldown."""
+
+    def _error(self, headers):
+        return HttpError(httplib2.Response({"status": 429, **headers}), b"Too Many Requests")
+
+    def test_uses_retry_after_seconds(self):
+        assert rate_limit_cooldown(self._error({"retry-after": "120"})) == 120
+
+    def test_uses_retry_after_http_date(self):
+        when = datetime.now(timezone.utc) + timedelta(minutes=10)
+        header = when.strftime("%a, %d %b %Y %H:%M:%S GMT")
+        assert rate_limit_cooldown(self._error({"retry-after": header})) == pytest.approx(600, abs=2)
+
+    def test_defaults_without_retry_after(self, monkeypatch):
+        monkeypatch.setattr("src.integrations.google_push.RATE_LIMIT_COOLDOWN_SECONDS", 300)
+        assert rate_limit_cooldown(self._error({})) == 300
+        assert rate_limit_cooldown(self._error({"retry-after": "soon"})) == 300
+
+
+# --- Apply event changes (batched writes) ---
+
+class TestApplyEventChanges:
+    """Tests for _apply_event_changes — update() for known UIDs, import_() otherwise."""
 
     def test_inserts_new_event(self):
-        service = MagicMock()
-        service.events().list().execute.return_value = {"items": []}
+        service = _batching_service()
 
         event_body = {"iCalUID": "uid@weathercal.app", "summary": "Sunny"}
-        _upsert_event(service, "cal123", event_body)
+        _apply_event_changes(service, "cal123", [event_body], [], {})
 
         service.events().import_.assert_called_with(calendarId="cal123", body=event_body)
         service.events().update.assert_not_called()
@@ -322,13 +660,11 @@ class TestUpsertEvent:
 
     def test_updates_existing_event(self):
         """All existing events use update() (PUT) for full replacement."""
-        service = MagicMock()
-        service.events().list().execute.return_value = {
-            "items": [{"id": "evt_existing", "iCalUID": "uid@weathercal.app"}]
-        }
+        service = _batching_service()
 
         event_body = {"iCalUID": "uid@weathercal.app", "summary": "Sunny"}
-        _upsert_event(service, "cal123", event_body)
+        _apply_event_changes(service, "cal123", [event_body], [],
+                             {"uid@weathercal.app": "evt_existing"})
 
         service.events().update.assert_called_with(
             calendarId="cal123", eventId="evt_existing",
@@ -337,139 +673,139 @@ class TestUpsertEvent:
         service.events().patch.assert_not_called()
         service.events().import_.assert_not_called()
 
-    def test_restores_cancelled_event_via_update(self):
-        """Cancelled events use the same update() path as confirmed events."""
-        service = MagicMock()
-        service.events().list().execute.return_value = {
-            "items": [{"id": "evt_cancelled", "iCalUID": "uid@weathercal.app", "status": "cancelled"}]
-        }
-
-        event_body = {"iCalUID": "uid@weathercal.app", "summary": "Sunny"}
-        _upsert_event(service, "cal123", event_body)
-
-        service.events().update.assert_called_with(
-            calendarId="cal123", eventId="evt_cancelled",
-            body={"summary": "Sunny", "status": "confirmed"}
-        )
-        service.events().patch.assert_not_called()
-        service.events().import_.assert_not_called()
-
+    def test_deletes_stale_events(self):
+        service = _batching_service()
+        _apply_event_changes(service, "cal123", [], ["evt_a", "evt_b"], {})
 
-# --- Cleanup beyond forecast window ---
+        service.events().delete.assert_any_call(calendarId="cal123", eventId="evt_a")
+        service.events().delete.assert_any_call(calendarId="cal123", eventId="evt_b")
 
-class TestCleanupBeyondForecast:
-    """Tests for _cleanup_beyond_forecast."""
+    def test_ignores_already_deleted_event(self):
+        service = _batching_service()
+        service.events().delete().execute.side_effect = _http_error(410, b"Gone")
 
-    def test_deletes_weathercal_events_beyond_window(self):
-        from zoneinfo import ZoneInfo
-        tz = ZoneInfo("Europe/Berlin")
-        service = MagicMock()
-        service.events().list().execute.return_value = {
-            "items": [
-                {"id": "evt_stale", "iCalUID": "abc123@weathercal.app", "start": {"date": "2026-03-26"}},
-            ]
-        }
+        _apply_event_changes(service, "cal123", [], ["evt_gone"], {})  # should not raise
 
-        forecast_dates = {"2026-03-11", "2026-03-12", "2026-03-24"}
-        _cleanup_beyond_forecast(service, "cal123", forecast_dates, tz)
+    def test_raises_when_rate_limit_persists(self, monkeypatch):
+        monkeypatch.setattr("src.integrations.google_push.time.sleep", lambda s: None)
+        service = _batching_service()
+        service.events().import_().execute.side_effect = _http_error(429, b"Too Many Requests")
 
-        service.events().delete.assert_called_with(calendarId="cal123", eventId="evt_stale")
+        with pytest.raises(HttpError):
+            _apply_event_changes(service, "cal123", [{"iCalUID": "uid@weathercal.app"}], [], {})
 
-    def test_ignores_non_weathercal_events(self):
-        from zoneinfo import ZoneInfo
-        tz = ZoneInfo("Europe/Berlin")
-        service = MagicMock()
-        service.events().list().execute.return_value = {
-            "items": [
-                {"id": "evt_other", "iCalUID": "something@gmail.com", "start": {"date": "2026-03-26"}},
-            ]
-        }
+    def test_groups_requests_into_batches(self):
+        service = _batching_service()
+        bodies = [{"iCalUID": f"uid{i}@weathercal.app"} for i in range(60)]
 
-        forecast_dates = {"2026-03-11", "2026-03-24"}
-        _cleanup_beyond_forecast(service, "cal123", forecast_dates, tz)
+        _apply_event_changes(service, "cal123", bodies, ["stale"], {})
 
-        service.events().delete.assert_not_called()
+        # 61 writes at 50 per batch = 2 round trips
+        assert service.new_batch_http_request.call_count == 2
 
-    def test_no_crash_on_empty_response(self):
-        from zoneinfo import ZoneInfo
-        tz = ZoneInfo("Europe/Berlin")
-        service = MagicMock()
-        service.events().list().execute.return_value = {"items": []}
 
-        _cleanup_beyond_forecast(service, "cal123", {"2026-03-11"}, tz)
-        service.events().delete.assert_not_called()
+class TestPushEventsForUser:
+    """End-to-end push flow against a mocked Calendar service."""
 
-    def test_skips_allday_from_last_forecast_date(self):
-        """Last forecast day's all-day event appears in beyond-window query due to timezone overlap."""
-        from zoneinfo import ZoneInfo
-        tz = ZoneInfo("Europe/Berlin")
-        service = MagicMock()
+    def _forecast(self):
+        from src.models.forecast import Forecast
+        return Forecast(date="2026-03-15", location="Munich", high=18.0, low=8.0,
+                        summary="AM☀️10° / PM⛅15°", description="A nice day",
+                        timezone="Europe/Berlin")
+
+    def test_updates_mirrored_event_and_deletes_stale(self, db_path):
+        user_id = _connected_user(db_path)
+        forecast = self._forecast()
+        allday_uid = _build_forecast_events(forecast, DEFAULT_PREFS)[0].uid
+        service = _batching_service()
         service.events().list().execute.return_value = {
             "items": [
-                # Last forecast day's all-day event bleeds into scan window
-                {"id": "evt_last_allday", "iCalUID": "last@weathercal.app", "start": {"date": "2026-03-24"}},
-                # Genuinely stale event beyond window
-                {"id": "evt_stale", "iCalUID": "stale@weathercal.app", "start": {"date": "2026-03-26"}},
-            ]
+                {"id": "evt_allday", "iCalUID": allday_uid, "start": {"date": "2026-03-15"}},
+                {"id": "evt_stale", "iCalUID": "old@weathercal.app", "start": {"date": "2026-03-20"}},
+            ],
+            "nextSyncToken": "tok1",
         }
 
-        forecast_dates = {"2026-03-11", "2026-03-12", "2026-03-24"}
-        _cleanup_beyond_forecast(service, "cal123", forecast_dates, tz)
+        with patch("src.integrations.google_push._get_calendar_service",
+                   return_value=(service, "cal123")):
+            push_events_for_user(db_path, user_id, [forecast], DEFAULT_PREFS, "Munich", "Europe/Berlin")
 
-        # Should only delete the stale event, not the last forecast day's all-day
+        service.events().update.assert_called_once()
+        assert service.events().update.call_args[1]["eventId"] == "evt_allday"
         service.events().delete.assert_called_once_with(calendarId="cal123", eventId="evt_stale")
+        assert _sync_token(db_path, user_id) == "tok1"
+
+    def test_calendar_404_on_sync_clears_calendar_id(self, db_path):
+        user_id = _connected_user(db_path)
+        service = _batching_service()
+        service.events().list().execute.side_effect = _http_error(404, b"Not Found")
+
+        with patch("src.integrations.google_push._get_calendar_service",
+                   return_value=(service, "cal123")), \
+             patch("src.integrations.google_push.send_google_alert"):
+            push_events_for_user(db_path, user_id, [self._forecast()], DEFAULT_PREFS, "Munich", "Europe/Berlin")
+
+        conn = sqlite3.connect(db_path)
+        row = conn.execute("SELECT google_calendar_id FROM google_tokens WHERE user_id = ?", (user_id,)).fetchone()
+        conn.close()
+        assert row[0] is None
+        service.events().import_.assert_not_called()
 
+    def test_failed_sync_aborts_push(self, db_path):
+        user_id = _connected_user(db_path)
+        service = _batching_service()
+        service.events().list().execute.side_effect = _http_error(500, b"Backend Error")
 
-# --- @weathercal.app filter in cleanup ---
+        with patch("src.integrations.google_push._get_calendar_service",
+                   return_value=(service, "cal123")):
+            with pytest.raises(HttpError):
+                push_events_for_user(db_path, user_id, [self._forecast()], DEFAULT_PREFS,
+                                     "Munich", "Europe/Berlin")
 
-class TestCleanupWeathercalFilter:
-    """Verify _cleanup_stale_events only deletes @weathercal.app events."""
+        service.new_batch_http_request.assert_not_called()
 
-    def _mock_service(self, existing_items):
+    def test_timed_event_in_non_utc_zone_is_not_stale(self, db_path):
+        user_id = _connected_user(db_path)
         service = MagicMock()
-        service.events().list().execute.return_value = {"items": existing_items}
-        return service
-
-    def test_skips_non_weathercal_events(self):
-        from zoneinfo import ZoneInfo
-        tz = ZoneInfo("Europe/Berlin")
-        non_wc_event = {
-            "id": "evt_other",
-            "iCalUID": "something@gmail.com",
-            "start": {"dateTime": "2026-03-11T10:00:00+01:00"},
+        service.events().list().execute.return_value = {
+            "items": [{"id": "evt_morning", "iCalUID": "morning@weathercal.app",
+                       "start": {"dateTime": "2026-03-14T23:30:00Z", "timeZone": "UTC"}}],
+            "nextSyncToken": "tok1",
         }
-        service = self._mock_service([non_wc_event])
 
-        _cleanup_stale_events(service, "cal123", "2026-03-11",
-                              expected_allday_uids=set(),
-                              expected_timed_uids=set(),
-                              tz=tz)
+        _sync_remote_events(db_path, user_id, service, "cal123", "Asia/Tokyo")
 
-        service.events().delete.assert_not_called()
+        # 08:30 on the 15th in Tokyo belongs to the 15th's forecast, not the 14th's
+        expected = {"2026-03-15": (set(), {"morning@weathercal.app"})}
+        assert _find_stale_event_ids(db_path, user_id, expected) == []
 
-    def test_cleanup_deletes_weathercal_events_only(self):
-        from zoneinfo import ZoneInfo
-        tz = ZoneInfo("Europe/Berlin")
-        wc_event = {
-            "id": "evt_wc",
-            "iCalUID": "abc123@weathercal.app",
-            "start": {"dateTime": "2026-03-11T10:00:00+01:00"},
-        }
-        non_wc_event = {
-            "id": "evt_other",
-            "iCalUID": "meeting@gmail.com",
-            "start": {"dateTime": "2026-03-11T11:00:00+01:00"},
-        }
-        service = self._mock_service([wc_event, non_wc_event])
+    def test_pushes_for_same_user_do_not_overlap(self, db_path):
+        import threading
+        import time
 
-        _cleanup_stale_events(service, "cal123", "2026-03-11",
-                              expected_allday_uids=set(),
-                              expected_timed_uids=set(),
-                              tz=tz)
+        user_id = _connected_user(db_path)
+        active, overlaps = [], []
 
-        service.events().delete.assert_called_once_with(
-            calendarId="cal123", eventId="evt_wc"
-        )
+        def get_service(db_path, uid):
+            active.append(uid)
+            if len(active) > 1:
+                overlaps.append(uid)
+            time.sleep(0.05)
+            active.remove(uid)
+            return None, None
+
+        with patch("src.integrations.google_push._get_calendar_service", side_effect=get_service):
+            threads = [
+                threading.Thread(target=push_events_for_user,
+                                 args=(db_path, user_id, [self._forecast()], DEFAULT_PREFS, "Munich", "Europe/Berlin"))
+                for _ in range(3)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert overlaps == []
 
 
 # --- Settings URL in pushed events ---
@@ -478,10 +814,8 @@ class TestPushForecastEventsSettingsUrl:
     """Verify Google-pushed events include settings link in description."""
 
     def test_pushed_events_contain_settings_url(self):
-        from zoneinfo import ZoneInfo
         from src.models.forecast import Forecast
 
-        tz = ZoneInfo("Europe/Berlin")
         forecast = Forecast(
             date="2026-03-15",
             location="Munich",
@@ -493,16 +827,11 @@ class TestPushForecastEventsSettingsUrl:
         )
         prefs = {"show_allday_events": 1, "timed_events_enabled": 0}
 
-        service = MagicMock()
-        service.events().list().execute.return_value = {"items": []}
-
-        _push_forecast_events(service, "cal123", forecast, prefs, tz, "Europe/Berlin")
+        events = _build_forecast_events(forecast, prefs)
+        bodies = [_calendar_event_to_google_body(ce, "Europe/Berlin") for ce in events]
 
-        # Check that the import_ call included the settings URL in description
-        call_args = service.events().import_.call_args
-        assert call_args is not None, "Expected import_ to be called"
-        body = call_args[1]["body"] if "body" in call_args[1] else call_args[0][0]
-        assert "https://weathercal.app/settings" in body.get("description", "")
+        assert bodies, "Expected at least one event body"
+        assert "https://weathercal.app/settings" in bodies[0].get("description", "")
 
 
 # --- Reminders in Google Calendar events ---
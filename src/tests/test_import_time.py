@@ -0,0 +1,79 @@
+"""Cold-start checks for the web and scheduler entry points.
+
+Each entry module is imported in a fresh interpreter under `python -X importtime`.
+The Google client libraries and requests are only needed by OAuth, push and
+forecast fetches, so they must stay out of startup; the total import time is
+held to the startup targets: under 1s for the web app and 0.5s for the
+scheduler (IMPORT_BUDGET_SCALE stretches them on slow CI machines). Loading
+.env and setting up logging are left to the `python -m` launchers, so importing
+an entry module (from tests or scripts) has no logging side effects.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+BUDGET_SCALE = float(os.getenv("IMPORT_BUDGET_SCALE", "1"))
+
+# module -> cumulative import budget in ms
+ENTRY_POINTS = {
+    "src.web.app": 1000,
+    "src.app.main": 500,
+}
+LAZY_MODULES = ("googleapiclient", "google_auth_oauthlib", "google.oauth2", "google.auth.transport", "requests")
+
+
+def _importtime(module: str, tmp_path) -> dict[str, int]:
+    """Import `module` in a fresh interpreter; returns {module: cumulative_us}."""
+    env = dict(os.environ, DB_PATH=str(tmp_path / "forecast.db"), LOG_FILE=str(tmp_path / "app.log"))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", sorted(ENTRY_POINTS))
+def test_entry_point_skips_heavy_integrations(module, tmp_path):
+    times = _importtime(module, tmp_path)
+    assert module in times
+    loaded = sorted(name for name in times if name.startswith(LAZY_MODULES))
+    assert loaded == []
+
+
+@pytest.mark.parametrize("module", sorted(ENTRY_POINTS))
+def test_entry_point_import_budget(module, tmp_path):
+    _importtime(module, tmp_path)  # first run writes bytecode, as the image build does
+    elapsed_ms = _importtime(module, tmp_path)[module] / 1000
+    assert elapsed_ms < ENTRY_POINTS[module] * BUDGET_SCALE
+
+
+@pytest.mark.parametrize("module", sorted(ENTRY_POINTS))
+def test_entry_point_import_does_not_set_up_logging(module, tmp_path):
+    _importtime(module, tmp_path)
+    assert not (tmp_path / "app.log").exists()
+
+
+def test_web_launcher_sets_up_logging_before_uvicorn_imports_app(tmp_path):
+    env = dict(os.environ, DB_PATH=str(tmp_path / "forecast.db"), LOG_FILE=str(tmp_path / "app.log"))
+    code = ("import sys, uvicorn; uvicorn.main = lambda args: print(args, 'src.web.app' in sys.modules); "
+            "from src.web.__main__ import main; main()")
+    result = subprocess.run(
+        [sys.executable, "-c", code, "--port", "9000"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert result.stdout.strip() == "['src.web.app:app', '--port', '9000'] False"
+    assert (tmp_path / "app.log").exists()
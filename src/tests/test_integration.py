@@ -2,7 +2,6 @@
 
 import sqlite3
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock
 
 import pytest
 from icalendar import Calendar
@@ -10,7 +9,7 @@ from icalendar import Calendar
 from src.events.db import get_future_events
 from src.events.ics_events import build_event_ics
 from src.events.store import store_events
-from src.integrations.google_push import _push_forecast_events
+from src.integrations.google_push import _build_forecast_events, _calendar_event_to_google_body
 from src.integrations.ics_service import generate_ics
 from src.models.forecast import Forecast
 from src.services.calendar_events import build_calendar_events
@@ -276,23 +275,9 @@ def _cold_forecast(date="2099-01-15"):
 
 
 def _capture_google_upserts(forecast, prefs):
-    """Run _push_forecast_events with mocked service, return upserted event bodies."""
-    from zoneinfo import ZoneInfo
-    service = MagicMock()
-    upserted = []
-
-    def capture_import(calendarId, body):
-        upserted.append(body)
-        result = MagicMock()
-        result.execute.return_value = {}
-        return result
-
-    service.events().import_ = capture_import
-    service.events().list().execute.return_value = {"items": []}
-
-    tz = ZoneInfo(forecast.timezone) if forecast.timezone else ZoneInfo("UTC")
-    _push_forecast_events(service, "cal123", forecast, prefs, tz, forecast.timezone)
-    return upserted
+    """Build the Google event bodies that a push would upsert for a forecast."""
+    events = _build_forecast_events(forecast, prefs)
+    return [_calendar_event_to_google_body(ce, forecast.timezone) for ce in events]
 
 
 @pytest.mark.integration
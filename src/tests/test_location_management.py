@@ -1,14 +1,14 @@
 import os
 import sqlite3
+from datetime import datetime, timezone
 
 import pytest
 
 from src.services.forecast_store import ForecastStore
 from src.utils.location_management import (
     get_locations,
-    group_locations_by_tz_offset,
+    group_locations_by_timezone,
     load_locations_from_db,
-    local_to_utc,
 )
 
 
@@ -76,18 +76,20 @@ def test_get_locations_raises_when_no_locations(monkeypatch, tmp_path):
         get_locations()
 
 
-# --- group_locations_by_tz_offset tests ---
+# --- group_locations_by_timezone tests ---
 
-def test_group_locations_same_timezone():
+WINTER = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def test_group_locations_same_timezone_rules_coalesce():
     locs = [
         {"location": "Munich", "lat": 48.13, "lon": 11.58, "timezone": "Europe/Berlin"},
         {"location": "Paris", "lat": 48.85, "lon": 2.35, "timezone": "Europe/Paris"},
     ]
-    groups = group_locations_by_tz_offset(locs)
-    # Berlin and Paris share the same UTC offset
-    assert len(groups) == 1
-    offset = list(groups.keys())[0]
-    assert len(groups[offset]) == 2
+    groups = group_locations_by_timezone(locs, now=WINTER)
+    # Berlin and Paris switch DST together, so every run instant coincides
+    assert list(groups) == ["Europe/Berlin"]
+    assert len(groups["Europe/Berlin"]) == 2
 
 
 def test_group_locations_different_timezones():
@@ -95,12 +97,34 @@ def test_group_locations_different_timezones():
         {"location": "Munich", "lat": 48.13, "lon": 11.58, "timezone": "Europe/Berlin"},
         {"location": "Tokyo", "lat": 35.68, "lon": 139.69, "timezone": "Asia/Tokyo"},
     ]
-    groups = group_locations_by_tz_offset(locs)
-    assert len(groups) == 2
+    groups = group_locations_by_timezone(locs, now=WINTER)
+    assert sorted(groups) == ["Asia/Tokyo", "Europe/Berlin"]
+
+
+def test_group_locations_keeps_fractional_offsets_apart():
+    locs = [
+        {"location": "Delhi", "lat": 28.61, "lon": 77.21, "timezone": "Asia/Kolkata"},
+        {"location": "Kathmandu", "lat": 27.72, "lon": 85.32, "timezone": "Asia/Kathmandu"},
+        {"location": "Dhaka", "lat": 23.81, "lon": 90.41, "timezone": "Asia/Dhaka"},
+    ]
+    groups = group_locations_by_timezone(locs, now=WINTER)
+    # +5:30, +5:45 and +6:00 used to round into overlapping hour buckets
+    assert len(groups) == 3
+
+
+def test_group_locations_splits_zones_before_dst_divergence():
+    locs = [
+        {"location": "Munich", "lat": 48.13, "lon": 11.58, "timezone": "Europe/Berlin"},
+        {"location": "Lagos", "lat": 6.52, "lon": 3.38, "timezone": "Africa/Lagos"},
+    ]
+    # Both UTC+1 in winter, but Berlin springs forward on 2026-03-29
+    assert len(group_locations_by_timezone(locs, now=WINTER)) == 1
+    before_switch = datetime(2026, 3, 28, 12, 0, tzinfo=timezone.utc)
+    assert len(group_locations_by_timezone(locs, now=before_switch)) == 2
 
 
 def test_group_locations_empty_list():
-    groups = group_locations_by_tz_offset([])
+    groups = group_locations_by_timezone([])
     assert groups == {}
 
 
@@ -108,42 +132,13 @@ def test_group_locations_missing_timezone():
     locs = [
         {"location": "Unknown", "lat": 0.0, "lon": 0.0, "timezone": None},
     ]
-    groups = group_locations_by_tz_offset(locs)
-    assert 0 in groups
-    assert len(groups[0]) == 1
+    groups = group_locations_by_timezone(locs)
+    assert len(groups["UTC"]) == 1
 
 
 def test_group_locations_invalid_timezone():
     locs = [
         {"location": "BadTZ", "lat": 0.0, "lon": 0.0, "timezone": "Not/A/Timezone"},
     ]
-    groups = group_locations_by_tz_offset(locs)
-    assert 0 in groups
-
-
-# --- local_to_utc tests ---
-
-def test_local_to_utc_positive_offset():
-    assert local_to_utc("05:30", 1) == "04:30"
-
-
-def test_local_to_utc_negative_offset():
-    assert local_to_utc("05:30", -5) == "10:30"
-
-
-def test_local_to_utc_zero_offset():
-    assert local_to_utc("12:00", 0) == "12:00"
-
-
-def test_local_to_utc_wrap_around_midnight():
-    # 02:00 local with offset +9 = 17:00 previous day UTC
-    assert local_to_utc("02:00", 9) == "17:00"
-
-
-def test_local_to_utc_wrap_forward():
-    # 22:00 local with offset -5 = 03:00 next day UTC
-    assert local_to_utc("22:00", -5) == "03:00"
-
-
-def test_local_to_utc_large_positive_offset():
-    assert local_to_utc("01:00", 12) == "13:00"
+    groups = group_locations_by_timezone(locs)
+    assert "UTC" in groups
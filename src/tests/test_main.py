@@ -1,9 +1,18 @@
-from datetime import date, timedelta
+import sqlite3
+from datetime import date, datetime, timedelta, timezone
 
-import schedule
+import pytest
 
 from src.app import main
 from src.models.forecast import Forecast
+from src.services.tier_schedule import TIER_STAGGER_SECONDS, stagger_seconds
+from src.utils.scheduler import Scheduler, every
+
+
+@pytest.fixture(autouse=True)
+def no_model_run_metadata(monkeypatch):
+    # Unknown upstream run: tiers always fetch, and no metadata request leaves the test
+    monkeypatch.setattr(main.ForecastService, "get_latest_model_run", classmethod(lambda cls: None))
 
 
 def test_get_schedule_time_defaults(monkeypatch):
@@ -213,6 +222,12 @@ def test_process_and_store_formats_and_upserts(monkeypatch):
     saved = []
 
     class FakeStore:
+        def changed_forecasts(self, forecasts):
+            return list(forecasts)
+
+        def touch_forecasts(self, forecasts):
+            pass
+
         def upsert_forecast(self, f):
             saved.append(f)
 
@@ -226,6 +241,29 @@ def test_process_and_store_formats_and_upserts(monkeypatch):
     assert saved[0].description == "desc"
 
 
+def test_process_and_store_skips_unchanged_forecasts(db_path, monkeypatch):
+    from src.services.forecast_store import ForecastStore
+    store = ForecastStore(db_path=db_path)
+    renders = []
+    monkeypatch.setattr(main, "format_summary", lambda f, prefs=None: renders.append(f.date) or "sum")
+    monkeypatch.setattr(main, "format_detailed_forecast", lambda f, prefs=None: "desc")
+
+    def fetched(temp):
+        return [Forecast(date=d, location="Munich", high=20, low=10, times=[f"{d}T12:00"], temps=[temp],
+                         codes=[1], rain=[0], winds=[5])
+                for d in ("2099-01-01", "2099-01-02")]
+
+    assert len(main._process_and_store(fetched(20), store)) == 2
+    renders.clear()
+
+    second = fetched(20)
+    second[1].temps = [25]
+    changed = main._process_and_store(second, store)
+
+    assert [f.date for f in changed] == ["2099-01-02"]
+    assert renders == ["2099-01-02"]
+
+
 # --- refresh_tier tests ---
 
 def _setup_tier_test(monkeypatch, expected_forecast_days=None, expected_start_date=None, expected_end_date=None):
@@ -248,6 +286,12 @@ def _setup_tier_test(monkeypatch, expected_forecast_days=None, expected_start_da
         return result
 
     class FakeStore:
+        def changed_forecasts(self, forecasts):
+            return list(forecasts)
+
+        def touch_forecasts(self, forecasts):
+            pass
+
         def upsert_forecast(self, f):
             pass
 
@@ -298,6 +342,56 @@ def test_refresh_tier3_calls_batch_with_date_range(monkeypatch):
     assert batch_calls[0]["end_date"] == (today + timedelta(days=14)).isoformat()
 
 
+def test_refresh_tier_skips_fetch_without_new_model_run(db_path, monkeypatch):
+    from datetime import datetime, timezone
+    from src.services.forecast_store import ForecastStore
+    monkeypatch.setenv("DB_PATH", db_path)
+    batch_calls = _setup_tier_test(monkeypatch)
+    monkeypatch.setattr(main, "ForecastStore", lambda: ForecastStore(db_path=db_path))
+    run = datetime(2026, 3, 15, 6, 0, tzinfo=timezone.utc)
+    monkeypatch.setattr(main.ForecastService, "get_latest_model_run", classmethod(lambda cls: run))
+    locs = [{"location": "Munich", "lat": 48.1, "lon": 11.6, "timezone": "Europe/Berlin"}]
+
+    main.refresh_tier3(locs)
+    main.refresh_tier3(locs)
+    assert len(batch_calls) == 1
+
+    conn = sqlite3.connect(db_path)
+    statuses = [r[0] for r in conn.execute("SELECT status FROM forecast_refresh_log ORDER BY id")]
+    conn.close()
+    assert statuses == ["success", "skipped"]
+
+    # A newer upstream run triggers a real fetch again
+    newer = run.replace(hour=12)
+    monkeypatch.setattr(main.ForecastService, "get_latest_model_run", classmethod(lambda cls: newer))
+    main.refresh_tier3(locs)
+    assert len(batch_calls) == 2
+
+
+def test_refresh_unified_fetches_full_horizon_and_writes_due_ranges(monkeypatch):
+    from datetime import date, timedelta
+    batch_calls = _setup_tier_test(monkeypatch)
+    today = date.today()
+    days = [(today + timedelta(days=n)).isoformat() for n in range(15)]
+
+    def fake_batch(locations, **kwargs):
+        batch_calls.append(kwargs)
+        return {loc["location"]: [
+            Forecast(date=d, location=loc["location"], high=20, low=10,
+                     times=[f"{d}T12:00"], temps=[20], codes=[1], rain=[0], winds=[5])
+            for d in days
+        ] for loc in locations}
+    monkeypatch.setattr(main.ForecastService, "fetch_forecasts_batch", fake_batch)
+    pushed = []
+    monkeypatch.setattr(main, "_push_google_calendars", lambda **kw: pushed.append(kw["changed"]))
+
+    main.refresh_unified([{"location": "Munich", "lat": 48.1, "lon": 11.6, "timezone": "Europe/Berlin"}],
+                         writes=("tier1", "tier3"))
+
+    assert batch_calls == [{"start_date": days[0], "end_date": days[14]}]
+    assert pushed == [{"Munich": set(days[:2] + days[5:])}]
+
+
 def test_refresh_tier_empty_locations(monkeypatch):
     """Tier functions should no-op with empty locations."""
     batch_calls = _setup_tier_test(monkeypatch)
@@ -309,53 +403,143 @@ def test_refresh_tier_empty_locations(monkeypatch):
 
 # --- _schedule_tier_jobs tests ---
 
-def test_schedule_tier_jobs_creates_correct_job_count(monkeypatch):
-    monkeypatch.setattr(main, "_get_tier_times", lambda: (
+@pytest.fixture
+def fresh_scheduler(monkeypatch):
+    sched = Scheduler(workers=2)
+    monkeypatch.setattr(main, "scheduler", sched)
+    return sched
+
+
+def test_schedule_tier_jobs_creates_correct_job_count(monkeypatch, fresh_scheduler):
+    monkeypatch.setattr(main, "get_tier_times", lambda: (
         ["05:30", "11:00", "15:30", "18:30", "22:00"],
         ["06:00", "17:00"],
         ["02:00"],
     ))
-    schedule.clear()
 
     tz_groups = {
-        1: [{"location": "Munich", "lat": 48.13, "lon": 11.58, "timezone": "Europe/Berlin"}],
-        9: [{"location": "Tokyo", "lat": 35.68, "lon": 139.69, "timezone": "Asia/Tokyo"}],
+        "Europe/Berlin": [{"location": "Munich", "lat": 48.13, "lon": 11.58, "timezone": "Europe/Berlin"}],
+        "Asia/Kolkata": [{"location": "Delhi", "lat": 28.61, "lon": 77.21, "timezone": "Asia/Kolkata"}],
     }
     main._schedule_tier_jobs(tz_groups)
 
-    jobs = schedule.get_jobs()
+    jobs = fresh_scheduler.jobs()
     # Per group: 5 tier1 + 2 tier2 + 1 tier3 = 8 jobs, x2 groups = 16
     assert len(jobs) == 16
-
-    schedule.clear()
+    assert {j.group for j in jobs} == {"Europe/Berlin", "Asia/Kolkata"}
+    delhi_t1 = next(j for j in jobs if j.name == "tier1_Asia/Kolkata_05:30")
+    stagger = stagger_seconds("tier1:Asia/Kolkata:05:30", TIER_STAGGER_SECONDS)
+    # 05:30 IST is exactly 00:00 UTC, plus the slot's stagger
+    assert (delhi_t1.due - timedelta(seconds=stagger)).strftime("%H:%M:%S") == "00:00:00"
 
 
-def test_reschedule_clears_and_recreates(monkeypatch):
-    monkeypatch.setattr(main, "_get_tier_times", lambda: (["12:00"], ["12:00"], ["12:00"]))
-    monkeypatch.setattr(main, "group_locations_by_tz_offset", lambda: {
-        0: [{"location": "London", "lat": 51.5, "lon": -0.12, "timezone": "Europe/London"}],
+def test_reschedule_clears_and_recreates(monkeypatch, fresh_scheduler):
+    monkeypatch.setattr(main, "get_tier_times", lambda: (["12:00"], ["12:00"], ["12:00"]))
+    monkeypatch.setattr(main, "group_locations_by_timezone", lambda: {
+        "Europe/London": [{"location": "London", "lat": 51.5, "lon": -0.12, "timezone": "Europe/London"}],
     })
-    schedule.clear()
+    fresh_scheduler.add("staleness_check", lambda: None, every(3600))
 
     # Create initial jobs
     main._schedule_tier_jobs({
-        0: [{"location": "London", "lat": 51.5, "lon": -0.12, "timezone": "Europe/London"}],
+        "Europe/London": [{"location": "London", "lat": 51.5, "lon": -0.12, "timezone": "Europe/London"}],
     })
-    initial_count = len(schedule.get_jobs())
-    assert initial_count == 3  # 1 + 1 + 1
+    assert len(fresh_scheduler.jobs()) == 4  # 1 + 1 + 1 tiers + staleness
 
-    # Reschedule should clear and recreate
+    # Reschedule should clear and recreate tier jobs only
     main.reschedule()
-    assert len(schedule.get_jobs()) == 3
-
-    schedule.clear()
+    assert len(fresh_scheduler.jobs()) == 4
+
+
+def test_scheduled_tier_job_runs_refresh_for_group(monkeypatch, fresh_scheduler):
+    monkeypatch.setattr(main, "get_tier_times", lambda: (["12:00"], [], []))
+    calls = []
+    monkeypatch.setattr(main, "refresh_tier1", lambda locations: calls.append(locations))
+    berlin = [{"location": "Munich", "lat": 48.13, "lon": 11.58, "timezone": "Europe/Berlin"}]
+    main._schedule_tier_jobs({"Europe/Berlin": berlin})
+
+    job = fresh_scheduler.jobs()[0]
+    fresh_scheduler.run_pending(now=job.due)
+    fresh_scheduler.wait_idle(timeout=5)
+    fresh_scheduler.shutdown()
+
+    assert calls == [berlin]
+
+
+def test_sharded_scheduler_owns_only_its_groups(db_path, monkeypatch, fresh_scheduler):
+    from src.services.tier_schedule import shard_for
+    from src.services.worker_leases import acquire_lease, create_worker_leases_table
+    monkeypatch.setenv("DB_PATH", db_path)
+    create_worker_leases_table(db_path)
+    zones = ["Europe/Berlin", "Europe/London", "America/New_York", "America/Chicago", "Asia/Tokyo",
+             "Asia/Kolkata", "Australia/Sydney", "Africa/Cairo", "America/Sao_Paulo", "Pacific/Auckland"]
+    groups = {z: [{"location": z, "lat": 0, "lon": 0, "timezone": z}] for z in zones}
+    monkeypatch.setattr(main, "group_locations_by_timezone", lambda: groups)
+    monkeypatch.setattr(main, "get_tier_times", lambda: (["12:00"], [], []))
+    monkeypatch.setattr(main, "SCHEDULER_SHARDS", 3)
+    monkeypatch.setattr(main, "SCHEDULER_SHARD", 1)
+    monkeypatch.setattr(main, "_shard_held", main.threading.Event())
+    monkeypatch.setattr(main, "_startup_scheduled", main.threading.Event())
+
+    # Another process holds shard 1: nothing to schedule yet
+    assert acquire_lease(db_path, "shard:1/3", 0.2, owner="other")
+    main._renew_shard_lease(db_path)
+    assert main._owned_groups(groups) == {}
+
+    # Once that lease lapses this process takes the shard and schedules its groups
+    main.time.sleep(0.25)
+    main._renew_shard_lease(db_path)
+    owned = {z for z in zones if shard_for(z, 3) == 1}
+    assert owned and {j.group for j in fresh_scheduler.jobs()} == owned
+    assert all(j.kwargs["lease_key"] == j.name for j in fresh_scheduler.jobs())
+    # Startup tier 1 runs for the owned groups are scheduled on first acquisition
+    startup = {j.group for j in fresh_scheduler.jobs() if j.name.endswith("_startup")}
+    assert startup == owned
+
+
+def test_startup_runs_scheduled_only_on_first_shard_acquisition(db_path, monkeypatch, fresh_scheduler):
+    from src.services.worker_leases import create_worker_leases_table
+    monkeypatch.setenv("DB_PATH", db_path)
+    create_worker_leases_table(db_path)
+    groups = {"Europe/Berlin": [{"location": "Munich", "lat": 0, "lon": 0, "timezone": "Europe/Berlin"}]}
+    monkeypatch.setattr(main, "group_locations_by_timezone", lambda: groups)
+    monkeypatch.setattr(main, "get_tier_times", lambda: (["12:00"], [], []))
+    monkeypatch.setattr(main, "SCHEDULER_SHARDS", 2)
+    monkeypatch.setattr(main, "SCHEDULER_SHARD", main.shard_for("Europe/Berlin", 2))
+    monkeypatch.setattr(main, "_shard_held", main.threading.Event())
+    monkeypatch.setattr(main, "_startup_scheduled", main.threading.Event())
+
+    main._renew_shard_lease(db_path)
+    fresh_scheduler.cancel("tier")
+    assert [j.name for j in fresh_scheduler.jobs()] == ["tier1_Europe/Berlin_startup"]
+
+    # Losing and regaining the shard reschedules tiers but not another startup run
+    main._shard_held.clear()
+    main._renew_shard_lease(db_path)
+    assert [j.name for j in fresh_scheduler.jobs()].count("tier1_Europe/Berlin_startup") == 1
+
+
+def test_run_lease_prevents_double_refresh(db_path, monkeypatch):
+    from src.services.worker_leases import acquire_lease, create_worker_leases_table
+    monkeypatch.setenv("DB_PATH", db_path)
+    create_worker_leases_table(db_path)
+    calls = []
+
+    # Another process already ran this slot
+    assert acquire_lease(db_path, "run:tier1_Europe/Berlin_05:30", 60, owner="other")
+    main._run_tier(calls.append, ["Munich"], lease_key="tier1_Europe/Berlin_05:30")
+    assert calls == []
+
+    main._run_tier(calls.append, ["Munich"], lease_key="tier2_Europe/Berlin_06:00")
+    assert calls == [["Munich"]]
+    assert not acquire_lease(db_path, "run:tier2_Europe/Berlin_06:00", 60, owner="other")
 
 
 def test_get_tier_times_from_env(monkeypatch):
     monkeypatch.setenv("TIER1_TIMES", "06:00,12:00")
     monkeypatch.setenv("TIER2_TIMES", "07:00")
     monkeypatch.setenv("TIER3_TIME", "03:00")
-    t1, t2, t3 = main._get_tier_times()
+    t1, t2, t3 = main.get_tier_times()
     assert t1 == ["06:00", "12:00"]
     assert t2 == ["07:00"]
     assert t3 == ["03:00"]
@@ -365,7 +549,152 @@ def test_get_tier_times_defaults(monkeypatch):
     monkeypatch.delenv("TIER1_TIMES", raising=False)
     monkeypatch.delenv("TIER2_TIMES", raising=False)
     monkeypatch.delenv("TIER3_TIME", raising=False)
-    t1, t2, t3 = main._get_tier_times()
+    t1, t2, t3 = main.get_tier_times()
     assert len(t1) == 5
     assert len(t2) == 2
     assert len(t3) == 1
+
+
+# --- tier-scoped Google push ---
+
+def _google_user(db_path, email, location):
+    from src.integrations.google_push import store_google_tokens
+    from src.web.db import create_user, set_user_location
+    from unittest.mock import MagicMock
+
+    user_id = create_user(db_path, email, "supersecretpass1")
+    set_user_location(db_path, user_id, location, 0.0, 0.0, "Europe/Berlin")
+    cred = MagicMock(token="t", refresh_token="r", expiry=None)
+    store_google_tokens(db_path, user_id, cred, f"cal-{user_id}")
+    return user_id
+
+
+def _store_days(db_path, location, days):
+    from src.services.forecast_store import ForecastStore
+    store = ForecastStore(db_path=db_path)
+    today = date.today()
+    for i in range(days):
+        store.upsert_forecast(Forecast(date=(today + timedelta(days=i)).isoformat(),
+                                       location=location, high=10, low=5))
+
+
+def _capture_pushes(monkeypatch):
+    pushes = []
+    monkeypatch.setattr(
+        main, "push_events_for_user",
+        lambda db_path, user_id, forecasts, prefs, location, tz, prune_beyond=True: pushes.append(
+            (user_id, location, [f.date for f in forecasts], prune_beyond)
+        ),
+    )
+    return pushes
+
+
+def test_push_scoped_to_changed_locations_and_dates(db_path, monkeypatch):
+    munich_user = _google_user(db_path, "m@example.com", "Munich")
+    _google_user(db_path, "t@example.com", "Tokyo")
+    _store_days(db_path, "Munich", 14)
+    _store_days(db_path, "Tokyo", 14)
+    pushes = _capture_pushes(monkeypatch)
+
+    today = date.today()
+    first_two = {today.isoformat(), (today + timedelta(days=1)).isoformat()}
+    main._push_google_calendars(db_path, changed={"Munich": first_two})
+
+    assert pushes == [(munich_user, "Munich", sorted(first_two), False)]
+
+
+def test_push_scoped_prunes_when_reaching_horizon(db_path, monkeypatch):
+    _google_user(db_path, "m@example.com", "Munich")
+    _store_days(db_path, "Munich", 14)
+    pushes = _capture_pushes(monkeypatch)
+
+    today = date.today()
+    tail = {(today + timedelta(days=i)).isoformat() for i in range(5, 14)}
+    main._push_google_calendars(db_path, changed={"Munich": tail})
+
+    assert len(pushes) == 1
+    assert pushes[0][3] is True
+
+
+def test_push_without_changes_is_skipped(db_path, monkeypatch):
+    _google_user(db_path, "m@example.com", "Munich")
+    _store_days(db_path, "Munich", 14)
+    pushes = _capture_pushes(monkeypatch)
+
+    main._push_google_calendars(db_path, changed={})
+    assert pushes == []
+
+
+def test_unscoped_push_covers_all_days(db_path, monkeypatch):
+    _google_user(db_path, "m@example.com", "Munich")
+    _store_days(db_path, "Munich", 14)
+    pushes = _capture_pushes(monkeypatch)
+
+    main._push_google_calendars(db_path)
+
+    assert len(pushes) == 1
+    assert len(pushes[0][2]) == 14
+    assert pushes[0][3] is True
+
+
+def test_failed_push_users_are_queued_for_retry(db_path, monkeypatch):
+    import httplib2
+    from googleapiclient.errors import HttpError
+
+    ok_user = _google_user(db_path, "ok@example.com", "Munich")
+    failing_user = _google_user(db_path, "f@example.com", "Munich")
+    limited_user = _google_user(db_path, "l@example.com", "Munich")
+    _store_days(db_path, "Munich", 14)
+
+    def push(db_path, user_id, *args, **kwargs):
+        if user_id == failing_user:
+            raise RuntimeError("boom")
+        if user_id == limited_user:
+            raise HttpError(httplib2.Response({"status": 429, "retry-after": "600"}), b"Too Many Requests")
+
+    monkeypatch.setattr(main, "push_events_for_user", push)
+    before = datetime.now(timezone.utc)
+    main._push_google_calendars(db_path, changed={"Munich": {date.today().isoformat()}})
+
+    conn = sqlite3.connect(db_path)
+    jobs = dict(conn.execute("SELECT user_id, run_after FROM push_jobs").fetchall())
+    conn.close()
+    assert sorted(jobs) == [failing_user, limited_user]
+    assert ok_user not in jobs
+    assert datetime.fromisoformat(jobs[failing_user]) <= datetime.now(timezone.utc)
+    # The rate-limited user waits out Google's Retry-After
+    delay = (datetime.fromisoformat(jobs[limited_user]) - before).total_seconds()
+    assert delay == pytest.approx(600, abs=2)
+
+
+def test_refresh_tier1_pushes_refreshed_dates(monkeypatch):
+    _setup_tier_test(monkeypatch)
+    pushed = []
+    monkeypatch.setattr(main, "_push_google_calendars", lambda **kw: pushed.append(kw))
+
+    main.refresh_tier1([{"location": "Munich", "lat": 48.13, "lon": 11.58, "timezone": "Europe/Berlin"}])
+
+    assert pushed == [{"changed": {"Munich": {"2099-01-01"}}}]
+
+
+def test_push_queue_worker_drains_queued_users(db_path, monkeypatch):
+    import threading
+    from src.integrations.push_queue import enqueue_push_job
+
+    user_id = _google_user(db_path, "q@example.com", "Munich")
+    _store_days(db_path, "Munich", 14)
+    stop = threading.Event()
+    pushes = []
+    monkeypatch.setattr(
+        main, "push_events_for_user",
+        lambda db_path, uid, forecasts, prefs, location, tz, prune_beyond=True: (
+            pushes.append((uid, len(forecasts))), stop.set()),
+    )
+    enqueue_push_job(db_path, user_id)
+
+    main._push_queue_worker(db_path, stop)
+
+    assert pushes == [(user_id, 14)]
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM push_jobs").fetchone()[0] == 0
+    conn.close()
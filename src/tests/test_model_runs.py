@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta, timezone
+
+from src.services import model_runs
+
+RUN = datetime(2026, 3, 15, 6, 0, tzinfo=timezone.utc)
+LOCS = [{"location": "Munich"}, {"location": "Berlin"}]
+
+
+def test_fetch_key_ignores_location_order():
+    assert model_runs.fetch_key("tier2", LOCS, "2026-03-15") == \
+        model_runs.fetch_key("tier2", LOCS[::-1], "2026-03-15")
+    assert model_runs.fetch_key("tier2", LOCS, "2026-03-15") != \
+        model_runs.fetch_key("tier2", LOCS, "2026-03-16")
+
+
+def test_has_current_run(db_path):
+    key = model_runs.fetch_key("tier2", LOCS, "2026-03-15")
+    assert not model_runs.has_current_run(db_path, key, RUN)
+
+    model_runs.record_fetch(db_path, key, RUN)
+    assert model_runs.has_current_run(db_path, key, RUN)
+    assert not model_runs.has_current_run(db_path, key, RUN + timedelta(hours=6))
+    assert not model_runs.has_current_run(db_path, key, None)
+
+
+def test_has_current_run_expires_after_max_skip(db_path, monkeypatch):
+    key = model_runs.fetch_key("tier3", LOCS, "2026-03-15")
+    model_runs.record_fetch(db_path, key, RUN)
+    monkeypatch.setattr(model_runs, "MODEL_RUN_MAX_SKIP_HOURS", 0)
+    assert not model_runs.has_current_run(db_path, key, RUN)
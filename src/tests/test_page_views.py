@@ -0,0 +1,37 @@
+from unittest.mock import patch
+
+from src.web.db import get_page_view_stats
+from src.web.page_views import PageViewCounter
+
+
+def test_flush_writes_aggregated_counts(db_path):
+    counter = PageViewCounter(flush_seconds=3600)
+    for _ in range(3):
+        counter.record(db_path, "/")
+    counter.record(db_path, "/signup")
+    assert get_page_view_stats(db_path)["today"] == {}
+
+    assert counter.flush() == 4
+    assert get_page_view_stats(db_path)["today"] == {"/": 3, "/signup": 1}
+    assert counter.flush() == 0
+    counter.close()
+
+
+def test_flush_adds_to_stored_counts(db_path):
+    counter = PageViewCounter(flush_seconds=3600)
+    counter.record(db_path, "/")
+    counter.flush()
+    counter.record(db_path, "/")
+    counter.close()  # flushes on shutdown
+    assert get_page_view_stats(db_path)["today"]["/"] == 2
+
+
+def test_failed_flush_keeps_counts(db_path):
+    counter = PageViewCounter(flush_seconds=3600)
+    counter.record(db_path, "/")
+    with patch("src.web.page_views.add_page_views", side_effect=Exception("locked")):
+        assert counter.flush() == 0
+    counter.record(db_path, "/")
+    assert counter.flush() == 2
+    assert get_page_view_stats(db_path)["total"]["/"] == 2
+    counter.close()
@@ -0,0 +1,57 @@
+import sqlite3
+from unittest.mock import patch
+
+from src.web.db import create_feed_token, create_user
+from src.web.poll_buffer import PollBuffer
+
+
+def _token(db_path):
+    return create_feed_token(db_path, create_user(db_path, "poll@example.com", "supersecretpass1"))
+
+
+def _poll_state(db_path, token):
+    conn = sqlite3.connect(db_path)
+    count, agent = conn.execute(
+        "SELECT poll_count, last_user_agent FROM feed_tokens WHERE token = ?", (token,)
+    ).fetchone()
+    logged = conn.execute("SELECT COUNT(*) FROM poll_log WHERE token = ?", (token,)).fetchone()[0]
+    conn.close()
+    return count, agent, logged
+
+
+def test_flush_writes_batched_polls(db_path):
+    token = _token(db_path)
+    buffer = PollBuffer(flush_seconds=3600)
+    buffer.record(db_path, token, "Agent/1")
+    buffer.record(db_path, token, "Agent/2")
+
+    assert _poll_state(db_path, token) == (0, None, 0)
+
+    assert buffer.flush() == 2
+    assert buffer.flush() == 0
+    assert _poll_state(db_path, token) == (2, "Agent/2", 2)
+    buffer.close()
+
+
+def test_background_flush_after_record_threshold(db_path):
+    token = _token(db_path)
+    buffer = PollBuffer(flush_seconds=3600, flush_records=3)
+    for _ in range(3):
+        buffer.record(db_path, token, "Agent")
+    buffer.close()  # joins the thread woken by the threshold
+    assert _poll_state(db_path, token)[0] == 3
+
+
+def test_failed_flush_keeps_polls_and_bounds_buffer(db_path):
+    token = _token(db_path)
+    buffer = PollBuffer(flush_seconds=3600, max_pending=3)
+    for n in range(4):
+        buffer.record(db_path, token, f"Agent/{n}")
+    assert buffer.dropped == 1
+
+    with patch("src.web.poll_buffer.record_feed_polls", side_effect=sqlite3.OperationalError("locked")):
+        assert buffer.flush() == 0
+    assert _poll_state(db_path, token) == (0, None, 0)
+
+    buffer.close()
+    assert _poll_state(db_path, token) == (3, "Agent/3", 3)
@@ -0,0 +1,100 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+from src.services.poll_rollups import POLL_LOG_RETENTION_DAYS, polls_since, rollup_poll_log
+from src.utils.db import get_connection
+from src.web.db import create_feed_token, create_user, delete_user_account, export_user_data, log_feed_poll
+
+NOW = datetime(2026, 3, 15, 12, 30)
+
+
+def _insert_polls(db_path, token, *times):
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT INTO poll_log (token, polled_at, user_agent) VALUES (?, ?, 'Agent')",
+                     [(token, t.isoformat()) for t in times])
+    conn.commit()
+    conn.close()
+
+
+def _rows(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(sql).fetchall()
+    conn.close()
+    return rows
+
+
+def test_rollup_aggregates_hourly_and_daily_incrementally(db_path):
+    _insert_polls(db_path, "tok", NOW - timedelta(minutes=10), NOW - timedelta(minutes=20), NOW - timedelta(hours=2))
+    assert rollup_poll_log(db_path, now=NOW) == {"rolled_up": 3, "pruned": 0}
+
+    _insert_polls(db_path, "tok", NOW - timedelta(minutes=5))
+    assert rollup_poll_log(db_path, now=NOW)["rolled_up"] == 1
+    assert rollup_poll_log(db_path, now=NOW)["rolled_up"] == 0
+
+    assert _rows(db_path, "SELECT hour, polls FROM poll_rollup_hourly ORDER BY hour") == [
+        ("2026-03-15T10", 1), ("2026-03-15T12", 3),
+    ]
+    assert _rows(db_path, "SELECT day, polls FROM poll_rollup_daily") == [("2026-03-15", 4)]
+
+
+def test_rollup_prunes_expired_raw_rows(db_path):
+    old = NOW - timedelta(days=POLL_LOG_RETENTION_DAYS + 1)
+    _insert_polls(db_path, "tok", old, NOW)
+    assert rollup_poll_log(db_path, now=NOW) == {"rolled_up": 2, "pruned": 1}
+    assert _rows(db_path, "SELECT COUNT(*) FROM poll_log") == [(1,)]
+    # The pruned poll is still counted in the daily rollup
+    assert _rows(db_path, "SELECT SUM(polls) FROM poll_rollup_daily") == [(2,)]
+
+
+def test_polls_since_combines_rollups_and_recent_rows(db_path):
+    _insert_polls(db_path, "tok", NOW - timedelta(hours=30), NOW - timedelta(hours=3))
+    rollup_poll_log(db_path, now=NOW)
+    _insert_polls(db_path, "tok", NOW - timedelta(minutes=1))
+    _insert_polls(db_path, "other", NOW - timedelta(hours=25))
+
+    conn = get_connection(db_path)
+    try:
+        assert polls_since(conn.cursor(), NOW - timedelta(hours=24)) == {"tok": 2}
+    finally:
+        conn.close()
+
+
+def test_delete_user_account_removes_rollups(db_path):
+    user_id = create_user(db_path, "rollup@example.com", "password123456")
+    token = create_feed_token(db_path, user_id)
+    log_feed_poll(db_path, token, "Agent")
+    rollup_poll_log(db_path)
+
+    delete_user_account(db_path, user_id)
+    assert _rows(db_path, "SELECT COUNT(*) FROM poll_rollup_daily") == [(0,)]
+    assert _rows(db_path, "SELECT COUNT(*) FROM poll_rollup_hourly") == [(0,)]
+
+
+def test_admin_stats_count_rolled_up_polls(db_path):
+    from src.web.db import get_admin_stats, set_user_location
+    user_id = create_user(db_path, "stats@example.com", "password123456")
+    set_user_location(db_path, user_id, "Berlin", 52.52, 13.405, "Europe/Berlin")
+    token = create_feed_token(db_path, user_id)
+    log_feed_poll(db_path, token, "Agent")
+    rollup_poll_log(db_path)
+    log_feed_poll(db_path, token, "Agent")
+
+    assert _rows(db_path, "SELECT COUNT(*) FROM poll_log WHERE id > (SELECT last_id FROM rollup_watermarks)") == [(1,)]
+    assert get_admin_stats(db_path)["users"][0]["polls_last_24h"] == 2
+
+
+def test_export_serves_poll_history_past_raw_retention(db_path):
+    user_id = create_user(db_path, "history@example.com", "supersecretpass1")
+    token = create_feed_token(db_path, user_id)
+    old = NOW - timedelta(days=POLL_LOG_RETENTION_DAYS + 10)
+    _insert_polls(db_path, token, old, old + timedelta(hours=1), NOW - timedelta(hours=1))
+    _insert_polls(db_path, "someone-else", NOW - timedelta(hours=1))
+    rollup_poll_log(db_path, now=NOW)
+
+    data = export_user_data(db_path, user_id)
+
+    assert len(data["poll_logs"]) == 1  # older raw rows were pruned
+    assert data["poll_history"] == [
+        {"day": "2026-03-15", "polls": 1},
+        {"day": old.date().isoformat(), "polls": 2},
+    ]
@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from src.integrations import google_push, push_executor
+from src.integrations.push_executor import run_push
+from src.utils.rate_limit import TokenBucket
+
+
+def _http_error(status, content=b"error"):
+    resp = MagicMock()
+    resp.status = status
+    return HttpError(resp, content)
+
+
+def _push_log(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute("SELECT * FROM google_push_log").fetchall()
+    conn.close()
+    return rows
+
+
+def test_run_push_pushes_every_user_and_logs_metrics(db_path):
+    pushed = []
+    metrics = run_push(db_path, [1, 2, 3], pushed.append)
+
+    assert sorted(pushed) == [1, 2, 3]
+    assert metrics["users_succeeded"] == 3
+    assert metrics["users_failed"] == 0
+    rows = _push_log(db_path)
+    assert len(rows) == 1
+    assert rows[0]["users_total"] == 3
+    assert rows[0]["error"] is None
+
+
+def test_run_push_runs_users_concurrently(db_path, monkeypatch):
+    monkeypatch.setattr(push_executor, "PUSH_WORKERS", 3)
+    barrier = threading.Barrier(3, timeout=5)
+
+    # Would time out (BrokenBarrierError) if users were pushed one at a time
+    metrics = run_push(db_path, [1, 2, 3], lambda uid: barrier.wait())
+    assert metrics["users_succeeded"] == 3
+
+
+def test_run_push_isolates_failures(db_path):
+    def push(user_id):
+        if user_id == 2:
+            raise RuntimeError("boom")
+
+    metrics = run_push(db_path, [1, 2, 3], push)
+
+    assert metrics["users_succeeded"] == 2
+    assert metrics["users_failed"] == 1
+    assert metrics["failed_users"] == {2: 0}
+    assert "boom" in _push_log(db_path)[0]["error"]
+
+
+def test_run_push_does_not_repush_rate_limited_user(db_path):
+    calls = []
+
+    def push(user_id):
+        calls.append(user_id)
+        raise _http_error(429, b"Too Many Requests")
+
+    metrics = run_push(db_path, [7], push)
+
+    # google_push already retried the requests; re-pushing would redo successful writes
+    assert calls == [7]
+    assert metrics["users_failed"] == 1
+    assert metrics["rate_limited"] == 1
+    assert metrics["failed_users"] == {7: google_push.RATE_LIMIT_COOLDOWN_SECONDS}
+
+
+def test_run_push_does_not_retry_other_http_errors(db_path):
+    calls = []
+
+    def push(user_id):
+        calls.append(user_id)
+        raise _http_error(500, b"Server Error")
+
+    metrics = run_push(db_path, [7], push)
+
+    assert calls == [7]
+    assert metrics["users_failed"] == 1
+
+
+def test_run_push_counts_only_its_own_api_requests(db_path, monkeypatch):
+    monkeypatch.setattr(google_push, "api_rate_limiter", TokenBucket(rate=1e6))
+    other_run_started = threading.Event()
+
+    def busy_elsewhere():
+        google_push._acquire_api_calls(100)
+        other_run_started.set()
+
+    threading.Thread(target=busy_elsewhere).start()
+    other_run_started.wait(5)
+
+    metrics = run_push(db_path, [1, 2], lambda uid: google_push._acquire_api_calls(uid * 2))
+    assert metrics["api_requests"] == 6
+
+
+def test_run_push_no_users_is_noop(db_path):
+    assert run_push(db_path, [], lambda uid: None) == {}
+    assert _push_log(db_path) == []
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=100, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # 1 token up front, then 5 more at 100/s
+    assert time.monotonic() - start >= 0.04
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
@@ -0,0 +1,185 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from src.integrations import push_queue
+from src.integrations.push_queue import (
+    claim_push_jobs,
+    complete_push_job,
+    enqueue_push_job,
+    fail_push_job,
+    process_push_jobs,
+)
+
+
+def _jobs(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    rows = {r["user_id"]: dict(r) for r in conn.execute("SELECT * FROM push_jobs").fetchall()}
+    conn.close()
+    return rows
+
+
+def _make_due(db_path, user_id):
+    past = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat(timespec="microseconds")
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE push_jobs SET run_after = ? WHERE user_id = ?", (past, user_id))
+    conn.commit()
+    conn.close()
+
+
+def test_enqueue_collapses_repeated_requests(db_path):
+    for _ in range(3):
+        enqueue_push_job(db_path, 1)
+    enqueue_push_job(db_path, 2)
+
+    jobs = _jobs(db_path)
+    assert sorted(jobs) == [1, 2]
+    assert jobs[1]["status"] == "pending"
+
+
+def test_claim_leases_jobs(db_path):
+    enqueue_push_job(db_path, 1)
+
+    claimed = claim_push_jobs(db_path)
+
+    assert [j["user_id"] for j in claimed] == [1]
+    assert _jobs(db_path)[1]["status"] == "running"
+    assert claim_push_jobs(db_path) == []
+
+
+def test_expired_lease_is_reclaimed(db_path):
+    enqueue_push_job(db_path, 1)
+    claim_push_jobs(db_path)
+    _make_due(db_path, 1)  # worker died; lease ran out
+
+    assert [j["user_id"] for j in claim_push_jobs(db_path)] == [1]
+
+
+def test_complete_removes_job(db_path):
+    enqueue_push_job(db_path, 1)
+    job = claim_push_jobs(db_path)[0]
+
+    complete_push_job(db_path, 1, job["enqueued_at"])
+
+    assert _jobs(db_path) == {}
+
+
+def test_enqueue_while_running_requeues_after_completion(db_path):
+    enqueue_push_job(db_path, 1)
+    job = claim_push_jobs(db_path)[0]
+    enqueue_push_job(db_path, 1)
+
+    # Still leased to the running worker
+    assert claim_push_jobs(db_path) == []
+    complete_push_job(db_path, 1, job["enqueued_at"])
+
+    assert _jobs(db_path)[1]["status"] == "pending"
+    assert len(claim_push_jobs(db_path)) == 1
+
+
+def test_failure_backs_off_exponentially(db_path):
+    enqueue_push_job(db_path, 1)
+    delays = []
+    for _ in range(2):
+        _make_due(db_path, 1)
+        job = claim_push_jobs(db_path)[0]
+        before = datetime.now(timezone.utc)
+        fail_push_job(db_path, 1, job["enqueued_at"], "boom")
+        run_after = datetime.fromisoformat(_jobs(db_path)[1]["run_after"])
+        delays.append((run_after - before).total_seconds())
+
+    assert _jobs(db_path)[1]["attempts"] == 2
+    assert _jobs(db_path)[1]["last_error"] == "boom"
+    assert delays[0] == pytest.approx(push_queue.PUSH_JOB_RETRY_SECONDS, abs=1)
+    assert delays[1] == pytest.approx(2 * push_queue.PUSH_JOB_RETRY_SECONDS, abs=1)
+
+
+def test_job_marked_failed_after_max_attempts(db_path, monkeypatch):
+    monkeypatch.setattr(push_queue, "PUSH_JOB_MAX_ATTEMPTS", 2)
+    enqueue_push_job(db_path, 1)
+    for _ in range(2):
+        _make_due(db_path, 1)
+        job = claim_push_jobs(db_path)[0]
+        fail_push_job(db_path, 1, job["enqueued_at"], "boom")
+
+    assert _jobs(db_path)[1]["status"] == "failed"
+    assert claim_push_jobs(db_path) == []
+    # A new request revives it with a fresh retry budget
+    enqueue_push_job(db_path, 1)
+    assert _jobs(db_path)[1]["attempts"] == 0
+    assert len(claim_push_jobs(db_path)) == 1
+
+
+def test_process_push_jobs_runs_and_settles_jobs(db_path):
+    enqueue_push_job(db_path, 1)
+    enqueue_push_job(db_path, 2)
+    pushed = []
+
+    def push(user_id):
+        pushed.append(user_id)
+        if user_id == 2:
+            raise RuntimeError("boom")
+
+    assert process_push_jobs(db_path, push) == 2
+
+    assert sorted(pushed) == [1, 2]
+    jobs = _jobs(db_path)
+    assert list(jobs) == [2]
+    assert jobs[2]["status"] == "pending"
+    assert jobs[2]["attempts"] == 1
+
+
+def test_rate_limited_job_uses_one_attempt_per_claim(db_path):
+    enqueue_push_job(db_path, 1)
+    calls = []
+
+    def push(user_id):
+        calls.append(user_id)
+        resp = MagicMock()
+        resp.status = 429
+        raise HttpError(resp, b"Too Many Requests")
+
+    process_push_jobs(db_path, push)
+
+    assert calls == [1]
+    assert _jobs(db_path)[1]["attempts"] == 1
+
+
+def test_rate_limited_job_waits_for_retry_after(db_path):
+    enqueue_push_job(db_path, 1)
+
+    def push(user_id):
+        resp = httplib2.Response({"status": 429, "retry-after": "900"})
+        raise HttpError(resp, b"Too Many Requests")
+
+    before = datetime.now(timezone.utc)
+    process_push_jobs(db_path, push)
+
+    run_after = datetime.fromisoformat(_jobs(db_path)[1]["run_after"])
+    assert (run_after - before).total_seconds() == pytest.approx(900, abs=1)
+    assert claim_push_jobs(db_path) == []
+
+
+def test_rate_limited_job_without_retry_after_uses_default_cooldown(db_path, monkeypatch):
+    monkeypatch.setattr("src.integrations.google_push.RATE_LIMIT_COOLDOWN_SECONDS", 400)
+    enqueue_push_job(db_path, 1)
+
+    def push(user_id):
+        resp = MagicMock()
+        resp.status = 429
+        raise HttpError(resp, b"Too Many Requests")
+
+    before = datetime.now(timezone.utc)
+    process_push_jobs(db_path, push)
+
+    run_after = datetime.fromisoformat(_jobs(db_path)[1]["run_after"])
+    assert (run_after - before).total_seconds() == pytest.approx(400, abs=1)
+
+
+def test_process_push_jobs_empty_queue(db_path):
+    assert process_push_jobs(db_path, lambda uid: None) == 0
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from src.services.tier_schedule import (
+    build_timeline,
+    load_profile,
+    stagger_seconds,
+    startup_stagger,
+    tier_slots,
+    unified_write_plan,
+)
+
+T0 = datetime(2026, 1, 15, 0, 0, tzinfo=timezone.utc)
+TIMES = (["05:30"], ["06:00"], ["02:00"])
+
+
+def _groups(*zones):
+    return {zone: [{"location": zone.split("/")[-1], "timezone": zone}] for zone in zones}
+
+
+def test_stagger_is_deterministic_and_within_window():
+    offsets = [stagger_seconds(f"tier1:Zone/{i}:05:30", 600) for i in range(50)]
+    assert offsets == [stagger_seconds(f"tier1:Zone/{i}:05:30", 600) for i in range(50)]
+    assert all(0 <= o < 600 for o in offsets)
+    assert len(set(offsets)) > 40
+    assert stagger_seconds("anything", 0) == 0
+
+
+def test_tier_slots_one_per_tier_zone_and_time():
+    slots = tier_slots(_groups("Europe/Berlin", "Asia/Tokyo"), TIMES, window=600)
+    assert len(slots) == 6
+    assert {s.name for s in slots} >= {"tier1_Europe/Berlin_05:30", "tier3_Asia/Tokyo_02:00"}
+
+
+def test_slots_sharing_local_time_are_spread_out():
+    zones = ["Europe/Berlin", "Asia/Tokyo", "America/New_York", "Asia/Kolkata", "Australia/Sydney"]
+    slots = [s for s in tier_slots(_groups(*zones), TIMES, window=600) if s.tier == "tier1"]
+    for slot in slots:
+        nominal = slot.next_run(T0) - timedelta(seconds=slot.stagger)
+        assert nominal.astimezone(ZoneInfo(slot.zone)).strftime("%H:%M:%S") == "05:30:00"
+    assert len({slot.stagger for slot in slots}) == len(zones)
+
+
+def test_build_timeline_orders_runs_within_horizon():
+    timeline = build_timeline(_groups("Europe/Berlin", "Asia/Tokyo"), start=T0, hours=24, tier_times=TIMES)
+
+    assert len(timeline) == 6
+    assert [r["at"] for r in timeline] == sorted(r["at"] for r in timeline)
+    berlin_t1 = next(r for r in timeline if r["tier"] == "tier1" and r["zone"] == "Europe/Berlin")
+    at = datetime.fromisoformat(berlin_t1["at"])
+    # 05:30 CET = 04:30 UTC, shifted by at most the stagger window
+    assert timedelta(0) <= at - datetime(2026, 1, 15, 4, 30, tzinfo=timezone.utc) < timedelta(minutes=10)
+
+
+def test_build_timeline_multi_day():
+    timeline = build_timeline(_groups("Europe/Berlin"), start=T0, hours=72, tier_times=TIMES)
+    assert len(timeline) == 9
+
+
+def test_load_profile_buckets_runs():
+    timeline = [
+        {"at": "2026-01-15T04:31:00+00:00", "locations": 2},
+        {"at": "2026-01-15T04:44:00+00:00", "locations": 1},
+        {"at": "2026-01-15T05:02:00+00:00", "locations": 4},
+    ]
+    assert load_profile(timeline) == [
+        {"start": "2026-01-15T04:30:00+00:00", "runs": 2, "locations": 3},
+        {"start": "2026-01-15T05:00:00+00:00", "runs": 1, "locations": 4},
+    ]
+
+
+def test_startup_stagger_within_window():
+    assert 0 <= startup_stagger("Europe/Berlin", window=120) < 120
+
+
+def test_unified_write_plan_assigns_tier_times_to_nearest_run():
+    plan = unified_write_plan((["05:30", "11:00", "15:30", "18:30", "22:00"], ["06:00", "17:00"], ["02:00"]))
+    assert plan == {
+        "05:30": ("tier1", "tier2", "tier3"),
+        "11:00": ("tier1",),
+        "15:30": ("tier1", "tier2"),  # 17:00 ties between 15:30 and 18:30; earlier wins
+        "18:30": ("tier1",),
+        "22:00": ("tier1",),
+    }
+    # Nearest run may be across midnight
+    assert unified_write_plan((["06:00", "23:00"], [], ["00:30"]))["23:00"] == ("tier1", "tier3")
+
+
+def test_unified_slots_one_per_zone_and_tier1_time():
+    slots = tier_slots(_groups("Europe/Berlin"), (["05:30", "15:00"], ["06:00"], ["02:00"]), mode="unified")
+    assert [(s.tier, s.local_time, s.writes) for s in slots] == [
+        ("unified", "05:30", ("tier1", "tier2", "tier3")),
+        ("unified", "15:00", ("tier1",)),
+    ]
+    timeline = build_timeline(_groups("Europe/Berlin"), start=T0, tier_times=TIMES, mode="unified")
+    assert [run["writes"] for run in timeline] == [["tier1", "tier2", "tier3"]]
@@ -7,6 +7,8 @@ from src.constants import DEFAULT_PREFS
 from src.models.forecast import Forecast
 from src.services.forecast_store import ForecastStore
 from src.integrations.google_push import store_google_tokens
+from src.web.page_views import page_view_counter
+from src.web.poll_buffer import poll_buffer
 from src.web.db import (
     check_password,
     create_feed_token,
@@ -394,6 +396,8 @@ def test_feed_records_poll(client, db_path, auth_cookies):
 
     client.get(f"/feed/{token}/weather.ics", headers={"user-agent": "TestAgent/1.0"})
     client.get(f"/feed/{token}/weather.ics", headers={"user-agent": "TestAgent/1.0"})
+    # Polls are buffered and written in batches
+    poll_buffer.flush()
 
     conn = sqlite3.connect(db_path)
     row = conn.execute("SELECT poll_count FROM feed_tokens WHERE token = ?", (token,)).fetchone()
@@ -495,6 +499,17 @@ def test_admin_route_accessible_for_admin(client, db_path, monkeypatch, auth_coo
     assert b"Admin" in resp.content
 
 
+def test_settings_loads_user_row_once_per_request(client, db_path, monkeypatch, auth_cookies):
+    monkeypatch.setattr(web_app, "ADMIN_EMAIL", "admin@example.com")
+    _, auth = auth_cookies(email="admin@example.com")
+    calls = []
+    real = web_app.get_user_by_id
+    monkeypatch.setattr(web_app, "get_user_by_id", lambda *a: calls.append(a) or real(*a))
+    resp = auth.get("/settings")
+    assert resp.status_code == 200
+    assert len(calls) == 1
+
+
 def test_admin_shows_feedback(client, db_path, monkeypatch, auth_cookies):
     monkeypatch.setattr(web_app, "ADMIN_EMAIL", "admin@example.com")
     _, auth = auth_cookies(email="admin@example.com")
@@ -514,6 +529,27 @@ def test_admin_shows_no_feedback_message(client, db_path, monkeypatch, auth_cook
     assert b"No feedback yet." in resp.content
 
 
+def test_admin_schedule_forbidden_for_non_admin(client, db_path, monkeypatch, auth_cookies):
+    monkeypatch.setattr(web_app, "ADMIN_EMAIL", "admin@example.com")
+    _, auth = auth_cookies(email="user@example.com")
+    assert auth.get("/admin/schedule").status_code == 403
+
+
+def test_admin_schedule_lists_planned_tier_runs(client, db_path, monkeypatch, auth_cookies):
+    monkeypatch.setattr(web_app, "ADMIN_EMAIL", "admin@example.com")
+    user_id, auth = auth_cookies(email="admin@example.com")
+    set_user_location(db_path, user_id, "Munich", 48.137, 11.576, "Europe/Berlin")
+
+    resp = auth.get("/admin/schedule?hours=24")
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["groups"] == {"Europe/Berlin": ["Munich"]}
+    # 5 tier1 + 2 tier2 + 1 tier3 slots per day
+    assert len(data["timeline"]) == 8
+    assert sum(b["runs"] for b in data["load"]) == 8
+
+
 # --- Welcome email ---
 
 def test_setup_triggers_welcome_email_on_first_setup(client, db_path, monkeypatch, auth_cookies):
@@ -917,8 +953,7 @@ def test_google_auth_callback_stores_tokens(client, db_path, monkeypatch, auth_c
 
     with patch("src.web.app.get_oauth_flow", return_value=mock_flow), \
          patch("src.web.app.build_google_service", return_value=mock_service), \
-         patch("src.web.app.create_weathercal_calendar", return_value="new_cal@group.calendar.google.com"), \
-         patch("src.web.app._google_push_initial"):
+         patch("src.web.app.create_weathercal_calendar", return_value="new_cal@group.calendar.google.com"):
         resp = auth.get(f"/auth/google/callback?code=test_code&state={state}")
 
     assert resp.status_code == 303
@@ -926,8 +961,10 @@ def test_google_auth_callback_stores_tokens(client, db_path, monkeypatch, auth_c
 
     conn = sqlite3.connect(db_path)
     row = conn.execute("SELECT * FROM google_tokens WHERE user_id = ?", (user_id,)).fetchone()
+    job = conn.execute("SELECT status FROM push_jobs WHERE user_id = ?", (user_id,)).fetchone()
     conn.close()
     assert row is not None
+    assert job == ("pending",)
 
 
 def test_google_auth_disconnect_requires_login(client):
@@ -1128,11 +1165,11 @@ def test_settings_post_triggers_gcal_push_when_connected(client, db_path, monkey
     cred.expiry = datetime.now(timezone.utc) + timedelta(hours=1)
     store_google_tokens(db_path, user_id, cred, "cal123")
 
-    with patch("src.web.app._google_push_initial") as mock_push:
+    with patch("src.web.app.enqueue_push_job") as mock_enqueue:
         resp = auth.post("/settings", data={"cold_threshold": "3.0"})
 
     assert resp.status_code == 303
-    mock_push.assert_called_once_with(db_path, user_id)
+    mock_enqueue.assert_called_once_with(db_path, user_id)
 
 
 def test_settings_post_no_gcal_push_when_not_connected(client, db_path, auth_cookies):
@@ -1141,11 +1178,11 @@ def test_settings_post_no_gcal_push_when_not_connected(client, db_path, auth_coo
     set_user_location(db_path, user_id, "Munich", 48.137, 11.576, "Europe/Berlin")
 
     from unittest.mock import patch
-    with patch("src.web.app._google_push_initial") as mock_push:
+    with patch("src.web.app.enqueue_push_job") as mock_enqueue:
         resp = auth.post("/settings", data={"cold_threshold": "3.0"})
 
     assert resp.status_code == 303
-    mock_push.assert_not_called()
+    mock_enqueue.assert_not_called()
 
 
 # --- Landing page ---
@@ -1275,6 +1312,31 @@ def test_feed_poll_logs_feed_subscribed_once(client, db_path, auth_cookies, make
     assert len(rows) == 1
 
 
+def test_feed_subscribed_logged_once_across_workers(client, db_path, make_forecast, monkeypatch):
+    from src.web import app as app_module
+    from src.web.poll_buffer import PollBuffer
+
+    user_id = create_user(db_path, "feedworkers@example.com", "supersecretpass1")
+    token = create_feed_token(db_path, user_id)
+    set_user_location(db_path, user_id, "Munich", 48.137, 11.576, "Europe/Berlin")
+    ForecastStore(db_path=db_path).upsert_forecast(make_forecast())
+
+    # Each poll lands on a worker whose buffer hasn't written the other's poll yet
+    buffers = [PollBuffer(flush_seconds=3600), PollBuffer(flush_seconds=3600)]
+    for buffer in buffers:
+        monkeypatch.setattr(app_module, "poll_buffer", buffer)
+        assert client.get(f"/feed/{token}/weather.ics").status_code == 200
+    for buffer in buffers:
+        buffer.close()
+
+    conn = sqlite3.connect(db_path)
+    count = conn.execute(
+        "SELECT COUNT(*) FROM funnel_events WHERE user_id = ? AND event_name = 'feed_subscribed'", (user_id,)
+    ).fetchone()[0]
+    conn.close()
+    assert count == 1
+
+
 # --- Sitemap and robots.txt ---
 
 
@@ -1342,8 +1404,7 @@ def test_google_auth_callback_logs_google_connected_funnel_event(client, db_path
 
     with patch("src.web.app.get_oauth_flow", return_value=mock_flow), \
          patch("src.web.app.build_google_service", return_value=MagicMock()), \
-         patch("src.web.app.create_weathercal_calendar", return_value="cal@group.calendar.google.com"), \
-         patch("src.web.app._google_push_initial"):
+         patch("src.web.app.create_weathercal_calendar", return_value="cal@group.calendar.google.com"):
         auth.get(f"/auth/google/callback?code=test_code&state={state}")
 
     conn = sqlite3.connect(db_path)
@@ -1431,6 +1492,7 @@ def test_admin_shows_page_view_cards(client, db_path, monkeypatch, auth_cookies)
 def test_landing_increments_page_views(client, db_path):
     client.get("/")
     client.get("/")
+    page_view_counter.flush()
     from src.web.db import get_page_view_stats
     stats = get_page_view_stats(db_path)
     assert stats["today"].get("/", 0) >= 2
@@ -1438,6 +1500,7 @@ def test_landing_increments_page_views(client, db_path):
 
 def test_signup_increments_page_views(client, db_path):
     client.get("/signup")
+    page_view_counter.flush()
     from src.web.db import get_page_view_stats
     stats = get_page_view_stats(db_path)
     assert stats["today"].get("/signup", 0) >= 1
@@ -0,0 +1,36 @@
+import pytest
+
+from src.services.tier_schedule import shard_for
+from src.services.worker_leases import acquire_lease, create_worker_leases_table, release_lease
+
+
+@pytest.fixture
+def lease_db(db_path):
+    create_worker_leases_table(db_path)
+    return db_path
+
+
+def test_lease_is_exclusive_until_released(lease_db):
+    assert acquire_lease(lease_db, "shard:0/2", 60, owner="a")
+    assert not acquire_lease(lease_db, "shard:0/2", 60, owner="b")
+    # The owner renews its own lease
+    assert acquire_lease(lease_db, "shard:0/2", 60, owner="a")
+
+    release_lease(lease_db, "shard:0/2", owner="b")  # not b's to release
+    assert not acquire_lease(lease_db, "shard:0/2", 60, owner="b")
+    release_lease(lease_db, "shard:0/2", owner="a")
+    assert acquire_lease(lease_db, "shard:0/2", 60, owner="b")
+
+
+def test_expired_lease_can_be_taken_over(lease_db):
+    assert acquire_lease(lease_db, "run:tier1_Europe/Berlin_05:30", 0, owner="a")
+    assert acquire_lease(lease_db, "run:tier1_Europe/Berlin_05:30", 60, owner="b")
+    assert not acquire_lease(lease_db, "run:tier1_Europe/Berlin_05:30", 60, owner="a")
+
+
+def test_shard_for_is_deterministic_and_covers_all_shards():
+    zones = [f"Zone/{i}" for i in range(200)]
+    shards = [shard_for(z, 4) for z in zones]
+    assert shards == [shard_for(z, 4) for z in zones]
+    assert set(shards) == {0, 1, 2, 3}
+    assert all(shard_for(z, 1) == 0 for z in zones)
@@ -1,11 +1,15 @@
 import os
 import sqlite3
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 logger = logging.getLogger(__name__)
 
+# Zones are coalesced only if their offsets agree for this long; the scheduler
+# regroups daily, so this covers the period until the next regroup.
+COALESCE_WINDOW_HOURS = 48
+
 
 def load_locations_from_db(db_path: str = None) -> list:
     """Load distinct active locations from the user_locations table.
@@ -50,43 +54,44 @@ def get_locations():
     return locations
 
 
-def group_locations_by_tz_offset(locations: list = None) -> dict[int, list[dict]]:
-    """Group locations by their current UTC offset (rounded to nearest hour).
+def _zone(tz_name: str | None, location: str | None = None) -> ZoneInfo:
+    if tz_name:
+        try:
+            return ZoneInfo(tz_name)
+        except (KeyError, ValueError):
+            logger.warning("Unknown timezone %s for %s, defaulting to UTC", tz_name, location)
+    return ZoneInfo("UTC")
+
+
+def group_locations_by_timezone(locations: list = None, now: datetime = None,
+                                window_hours: int = COALESCE_WINDOW_HOURS) -> dict[str, list[dict]]:
+    """Group locations by IANA timezone, coalescing zones that keep identical UTC offsets.
 
-    Returns a dict mapping offset_hours -> list of location dicts.
-    E.g. {1: [munich, paris], 9: [tokyo]}
+    Zones whose offsets match at every 15 minutes over the next `window_hours`
+    produce the same run instants for any local time, so they share one group
+    (and one batch fetch). Keys are the alphabetically first zone of each group.
+    Missing or unknown timezones fall into "UTC".
+    E.g. {"Europe/Berlin": [munich, paris], "Asia/Kolkata": [delhi], "Asia/Kathmandu": [...]}
     """
     if locations is None:
         locations = get_locations()
+    now = (now or datetime.now(timezone.utc)).replace(second=0, microsecond=0)
+    samples = [now + timedelta(minutes=15 * i) for i in range(window_hours * 4 + 1)]
 
-    groups: dict[int, list[dict]] = {}
-    now = datetime.now(timezone.utc)
-
+    by_zone: dict[str, list[dict]] = {}
     for loc in locations:
-        tz_name = loc.get("timezone")
-        if not tz_name:
-            offset_hours = 0
-        else:
-            try:
-                tz = ZoneInfo(tz_name)
-                offset_seconds = now.astimezone(tz).utcoffset().total_seconds()
-                offset_hours = round(offset_seconds / 3600)
-            except (KeyError, AttributeError):
-                logger.warning("Unknown timezone %s for %s, defaulting to UTC", tz_name, loc.get("location"))
-                offset_hours = 0
-
-        groups.setdefault(offset_hours, []).append(loc)
-
+        zone = _zone(loc.get("timezone"), loc.get("location"))
+        by_zone.setdefault(zone.key, []).append(loc)
+
+    by_signature: dict[tuple, list[str]] = {}
+    for zone_name in sorted(by_zone):
+        tz = ZoneInfo(zone_name)
+        signature = tuple(t.astimezone(tz).utcoffset() for t in samples)
+        by_signature.setdefault(signature, []).append(zone_name)
+
+    groups: dict[str, list[dict]] = {}
+    for zone_names in by_signature.values():
+        groups[zone_names[0]] = [loc for name in zone_names for loc in by_zone[name]]
+        if len(zone_names) > 1:
+            logger.debug("Coalesced timezones %s into one group", zone_names)
     return groups
-
-
-def local_to_utc(local_time: str, utc_offset_hours: int) -> str:
-    """Convert a local time string like '05:30' to UTC given an offset.
-
-    Returns a time string like '04:30'. Wraps around midnight.
-    """
-    parts = local_time.split(":")
-    hour = int(parts[0]) - utc_offset_hours
-    minute = int(parts[1])
-    hour = hour % 24
-    return f"{hour:02d}:{minute:02d}"
@@ -0,0 +1,270 @@
+"""Heap-based job scheduler.
+
+Jobs sit in a heap ordered by their next run time; the loop sleeps until the
+earliest one is due and hands it to a worker pool, so a slow job never holds
+up the others. Jobs sharing a `group` run one at a time (in due order), which
+keeps e.g. the tiers of one timezone group from overlapping while other groups
+proceed in parallel. A job may carry a start-rate limiter; a due job whose
+limiter has no token yet goes back on the heap until one is available, so the
+wait counts as start lag and no worker is held. Start lag (actual start minus
+due time) is tracked per job.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from datetime import time as dt_time
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+# Runs starting later than this are logged as late
+LATE_AFTER_SECONDS = 60
+# Upper bound on one sleep, so wall-clock jumps are noticed
+MAX_SLEEP_SECONDS = 300
+
+NextRun = Callable[[datetime], datetime | None]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def daily_at(utc_time: str) -> NextRun:
+    """Recurrence firing every day at HH:MM UTC."""
+    hour, minute = (int(p) for p in utc_time.split(":"))
+
+    def next_run(after: datetime) -> datetime:
+        candidate = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if candidate <= after:
+            candidate += timedelta(days=1)
+        return candidate
+    return next_run
+
+
+def daily_at_local(local_time: str, tz_name: str) -> NextRun:
+    """Recurrence firing every day at HH:MM wall-clock time in an IANA zone.
+
+    Each run instant is computed from the zone's rules at that date, so DST
+    changes take effect immediately. A wall time skipped by a spring-forward
+    gap runs at the equivalent instant just after the gap; a repeated wall
+    time runs at its first occurrence.
+    """
+    hour, minute = (int(p) for p in local_time.split(":"))
+    tz = ZoneInfo(tz_name)
+
+    def next_run(after: datetime) -> datetime:
+        day = after.astimezone(tz).date()
+        while True:
+            candidate = datetime.combine(day, dt_time(hour, minute), tzinfo=tz).astimezone(timezone.utc)
+            if candidate > after:
+                return candidate
+            day += timedelta(days=1)
+    return next_run
+
+
+def staggered(next_run: NextRun, seconds: float) -> NextRun:
+    """Shift every instant of a recurrence `seconds` later."""
+    offset = timedelta(seconds=seconds)
+
+    def shifted(after: datetime) -> datetime | None:
+        base = next_run(after - offset)
+        return base + offset if base else None
+    return shifted
+
+
+def every(seconds: float) -> NextRun:
+    """Recurrence firing every `seconds`."""
+    return lambda after: after + timedelta(seconds=seconds)
+
+
+@dataclass(eq=False)
+class Job:
+    name: str
+    fn: Callable
+    next_run: NextRun | None
+    group: str | None = None
+    tags: frozenset = frozenset()
+    kwargs: dict = field(default_factory=dict)
+    limiter: object | None = None  # TokenBucket-like, consulted before each start
+    due: datetime | None = None
+    cancelled: bool = False
+
+
+class Scheduler:
+    def __init__(self, workers: int = 4, late_after: float = LATE_AFTER_SECONDS):
+        self.workers = workers
+        self.late_after = late_after
+        # (dispatch at, seq, job, due); dispatch is later than due while a start is rate limited
+        self._heap: list[tuple[datetime, int, Job, datetime]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._pool: ThreadPoolExecutor | None = None
+        self._active: set[Job] = set()  # queued or running
+        self._busy_groups: set[str] = set()
+        self._backlog: dict[str, deque] = {}
+        self._metrics: dict[str, dict] = {}
+        self._stopping = False
+
+    # --- registration ---
+
+    def add(self, name: str, fn: Callable, next_run: NextRun | None, *, group: str | None = None,
+            tags=(), start: datetime | None = None, limiter=None, **kwargs) -> Job:
+        """Register a job. With next_run=None it runs once at `start` (default: now)."""
+        job = Job(name=name, fn=fn, next_run=next_run, group=group, tags=frozenset(tags), kwargs=kwargs,
+                  limiter=limiter)
+        due = start or (next_run(_utcnow()) if next_run else _utcnow())
+        with self._cond:
+            self._push(job, due)
+            self._cond.notify()
+        return job
+
+    def cancel(self, tag: str | None = None) -> int:
+        """Cancel jobs carrying `tag` (all jobs if None). Returns how many were cancelled."""
+        with self._cond:
+            cancelled = 0
+            for _, _, job, _ in self._heap:
+                if not job.cancelled and (tag is None or tag in job.tags):
+                    job.cancelled = True
+                    cancelled += 1
+            self._heap = [e for e in self._heap if not e[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cond.notify()
+            return cancelled
+
+    def jobs(self) -> list[Job]:
+        """Scheduled jobs ordered by due time."""
+        with self._cond:
+            jobs = [job for _, _, job, _ in sorted(self._heap, key=lambda e: e[:2])]
+            return list(dict.fromkeys(jobs))  # a rate-limited start may also be queued
+
+    def lag_metrics(self) -> dict[str, dict]:
+        """Per-job start lag: runs, late_runs, skipped, last/max lag in seconds."""
+        with self._cond:
+            return {name: dict(m) for name, m in self._metrics.items()}
+
+    # --- loop ---
+
+    def run_pending(self, now: datetime | None = None) -> list[Job]:
+        """Dispatch every job due at `now` and reschedule recurring ones."""
+        now = now or _utcnow()
+        dispatched = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                at, _, job, due = heapq.heappop(self._heap)
+                if job.next_run and at == due:
+                    # Next slot strictly after both the due time and now, so a
+                    # late loop doesn't replay every missed slot
+                    nxt = job.next_run(max(due, now))
+                    if nxt:
+                        self._push(job, nxt)
+                wait = job.limiter.try_acquire() if job.limiter is not None else 0
+                if wait > 0:
+                    retry_at = now + timedelta(seconds=wait)
+                    heapq.heappush(self._heap, (retry_at, next(self._seq), job, due))
+                    continue
+                dispatched.append((job, due))
+        for job, due in dispatched:
+            self._dispatch(job, due)
+        return [job for job, _ in dispatched]
+
+    def run_forever(self) -> None:
+        """Sleep until the next job is due, dispatch it, repeat until stop() is called."""
+        with self._cond:
+            self._stopping = False
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    delay = MAX_SLEEP_SECONDS
+                    if self._heap:
+                        delay = (self._heap[0][0] - _utcnow()).total_seconds()
+                    if delay <= 0:
+                        break
+                    # add() and stop() notify, so a new earlier job cuts the sleep short
+                    self._cond.wait(timeout=min(delay, MAX_SLEEP_SECONDS))
+                if self._stopping:
+                    return
+            self.run_pending()
+
+    def stop(self) -> None:
+        """Make run_forever return."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Block until no dispatched job is queued or running."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._active, timeout=timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+    # --- internals ---
+
+    def _push(self, job: Job, due: datetime) -> None:
+        job.due = due
+        heapq.heappush(self._heap, (due, next(self._seq), job, due))
+
+    def _metric(self, job: Job) -> dict:
+        return self._metrics.setdefault(job.name, {
+            "runs": 0, "late_runs": 0, "skipped": 0, "last_lag_seconds": 0.0, "max_lag_seconds": 0.0,
+        })
+
+    def _dispatch(self, job: Job, due: datetime) -> None:
+        with self._cond:
+            if job in self._active:
+                self._metric(job)["skipped"] += 1
+                logger.warning("Job %s still pending from an earlier run, skipping run due %s", job.name, due)
+                return
+            self._active.add(job)
+            if job.group is not None:
+                if job.group in self._busy_groups:
+                    self._backlog.setdefault(job.group, deque()).append((job, due))
+                    return
+                self._busy_groups.add(job.group)
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scheduler")
+            pool = self._pool
+        pool.submit(self._run, job, due)
+
+    def _run(self, job: Job, due: datetime) -> None:
+        lag = max(0.0, (_utcnow() - due).total_seconds())
+        with self._cond:
+            m = self._metric(job)
+            m["runs"] += 1
+            m["last_lag_seconds"] = round(lag, 3)
+            m["max_lag_seconds"] = round(max(m["max_lag_seconds"], lag), 3)
+            if lag > self.late_after:
+                m["late_runs"] += 1
+        if lag > self.late_after:
+            logger.warning("Job %s started %.1fs late (due %s)", job.name, lag, due.isoformat())
+        try:
+            job.fn(**job.kwargs)
+        except Exception:
+            logger.exception("Scheduled job %s failed", job.name)
+        finally:
+            self._finish(job)
+
+    def _finish(self, job: Job) -> None:
+        nxt = None
+        with self._cond:
+            self._active.discard(job)
+            if job.group is not None:
+                backlog = self._backlog.get(job.group)
+                if backlog:
+                    nxt = backlog.popleft()
+                else:
+                    self._busy_groups.discard(job.group)
+            pool = self._pool
+            self._cond.notify_all()
+        if nxt:
+            pool.submit(self._run, *nxt)
@@ -0,0 +1,24 @@
+"""Web server entry point: python -m src.web [uvicorn options]
+
+Loads .env and sets up logging, then passes the arguments to uvicorn's CLI to
+serve src.web.app:app. The app module reads its settings and sets up the
+schema (which logs) when it is imported, so both happen before uvicorn
+imports it.
+"""
+
+import sys
+
+import uvicorn
+from dotenv import load_dotenv
+
+from src.utils.logging_config import setup_logging
+
+
+def main():
+    load_dotenv()
+    setup_logging()
+    uvicorn.main(["src.web.app:app", *sys.argv[1:]])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import logging
 import os
 import sqlite3
+import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
 from urllib.parse import quote
 
@@ -8,6 +10,7 @@ from fastapi import BackgroundTasks, FastAPI, Form, Query, Request
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 from starlette.staticfiles import StaticFiles
 
 from src.integrations.google_push import (
@@ -19,13 +22,17 @@ from src.integrations.google_push import (
     build_google_service,
     delete_google_tokens,
     is_google_connected,
-    push_events_for_user,
 )
+from src.integrations.push_queue import enqueue_push_job
 from src.integrations.ics_service import generate_google_active_ics, generate_ics
+from src.services.admin_stats import create_admin_user_stats_table
 from src.services.email_service import send_welcome_email
 from src.services.forecast_store import ForecastStore
 from src.services.forecast_service import ForecastService
 from jose import jwt
+from src.web.auth_pool import AuthPoolBusy, auth_pool
+from src.web.page_views import page_view_counter
+from src.web.poll_buffer import poll_buffer
 from src.web.auth import create_session_token, decode_session_token, SECRET_KEY
 from src.events.db import create_event_tables, get_future_events, get_user_id_by_feed_token
 from src.events.ics_events import build_event_ics
@@ -55,10 +62,8 @@ from src.web.db import (
     get_user_calendar_app,
     get_user_locations,
     get_user_preferences,
-    increment_page_view,
-    log_feed_poll,
     log_funnel_event,
-    update_feed_poll,
+    mark_feed_first_polled,
     update_user_email,
     update_user_password,
     upsert_user_preferences,
@@ -89,7 +94,15 @@ def _initial_forecast_fetch(location: str, db_path: str, lat: float = None, lon:
 MAINTENANCE_FLAG = Path(os.getenv("DB_PATH", "data/forecast.db")).parent / "maintenance.flag"
 MAINTENANCE_PAGE = Path(__file__).resolve().parent.parent.parent / "maintenance.html"
 
-app = FastAPI()
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    yield
+    # Write buffered analytics before the worker exits
+    poll_buffer.close()
+    page_view_counter.close()
+
+
+app = FastAPI(lifespan=_lifespan)
 app.add_middleware(ProxyHeadersMiddleware, trusted_hosts="*")
 templates = Jinja2Templates(directory=str(Path(__file__).parent / "templates"))
 
@@ -104,11 +117,23 @@ async def maintenance_mode(request: Request, call_next):
         return HTMLResponse(content=content, status_code=503)
     return await call_next(request)
 
-ForecastStore(db_path=DB_PATH)  # ensures all tables exist before anything else runs
+# Shared ForecastStore per database, since constructing one runs the schema setup.
+# Building the first one ensures all tables exist before anything else runs.
+_stores: dict[str, ForecastStore] = {DB_PATH: ForecastStore(db_path=DB_PATH)}
+_stores_lock = threading.Lock()  # sync routes call _forecast_store from the threadpool
 create_feedback_table(DB_PATH)
 create_user_preferences_table(DB_PATH)
 create_event_tables(DB_PATH)
 create_google_tokens_table(DB_PATH)
+create_admin_user_stats_table(DB_PATH)
+
+
+def _forecast_store(db_path: str) -> ForecastStore:
+    with _stores_lock:
+        store = _stores.get(db_path)
+        if store is None:
+            store = _stores[db_path] = ForecastStore(db_path=db_path)
+        return store
 
 
 def _get_user_id(request: Request):
@@ -128,6 +153,12 @@ async def _handle_login_required(request: Request, exc: _LoginRequired):
     return RedirectResponse(url="/login", status_code=303)
 
 
+@app.exception_handler(AuthPoolBusy)
+async def _handle_auth_pool_busy(request: Request, exc: AuthPoolBusy):
+    return Response(content="Too many sign-in requests right now, please try again in a moment.",
+                    status_code=503, headers={"Retry-After": "5"})
+
+
 def _require_login(request: Request) -> int:
     """Return user_id or raise _LoginRequired to redirect to /login."""
     user_id = _get_user_id(request)
@@ -141,10 +172,20 @@ def _convert_thresholds_to_celsius(cold: float, warm: float, hot: float) -> tupl
     return (cold - 32) * 5 / 9, (warm - 32) * 5 / 9, (hot - 32) * 5 / 9
 
 
-def _is_admin(user_id: int) -> bool:
+def _get_user(request: Request, user_id: int):
+    """get_user_by_id, memoised for the rest of the request."""
+    users = getattr(request.state, "users", None)
+    if users is None:
+        users = request.state.users = {}
+    if user_id not in users:
+        users[user_id] = get_user_by_id(DB_PATH, user_id)
+    return users[user_id]
+
+
+def _is_admin(request: Request, user_id: int) -> bool:
     if not ADMIN_EMAIL:
         return False
-    user = get_user_by_id(DB_PATH, user_id)
+    user = _get_user(request, user_id)
     return bool(user and user["email"] == ADMIN_EMAIL)
 
 
@@ -156,7 +197,7 @@ def _template(name: str, request: Request, ctx: dict | None = None, **kwargs):
 
 
 @app.get("/health")
-async def health():
+def health():
     from src.services.forecast_alerts import check_staleness
     is_stale, last_updated, hours_since = check_staleness(DB_PATH)
     recent_failures = -1
@@ -184,13 +225,13 @@ async def health():
 
 @app.get("/", response_class=HTMLResponse)
 async def landing(request: Request):
-    increment_page_view(DB_PATH, "/")
+    page_view_counter.record(DB_PATH, "/")
     return _template("landing.html", request)
 
 
 @app.get("/signup", response_class=HTMLResponse)
 async def signup_get(request: Request):
-    increment_page_view(DB_PATH, "/signup")
+    page_view_counter.record(DB_PATH, "/signup")
     return _template("signup.html", request, {
         "error": None,
         "utm_source": request.query_params.get("utm_source", ""),
@@ -218,8 +259,8 @@ async def signup_post(
 
     referrer = request.headers.get("referer", "") or ""
     try:
-        user_id = create_user(
-            DB_PATH, email, password,
+        user_id = await auth_pool.run(
+            create_user, DB_PATH, email, password,
             utm_source=utm_source or None,
             utm_medium=utm_medium or None,
             utm_campaign=utm_campaign or None,
@@ -233,8 +274,8 @@ async def signup_post(
             status_code=422,
         )
 
-    create_feed_token(DB_PATH, user_id)
-    log_funnel_event(DB_PATH, user_id, "signup_completed")
+    await run_in_threadpool(create_feed_token, DB_PATH, user_id)
+    await run_in_threadpool(log_funnel_event, DB_PATH, user_id, "signup_completed")
 
     session_token = create_session_token(user_id)
     response = RedirectResponse(url="/setup", status_code=303)
@@ -249,7 +290,7 @@ async def setup_get(request: Request):
 
 
 @app.post("/setup")
-async def setup_post(
+def setup_post(
     request: Request,
     background_tasks: BackgroundTasks,
     location: str = Form(...),
@@ -282,7 +323,7 @@ async def setup_post(
     if not existing_prefs and "united states" in country.lower():
         upsert_user_preferences(DB_PATH, user_id, **{**DEFAULT_PREFS, "temp_unit": "F"})
     if not is_location_change and os.getenv("ENABLE_WELCOME_EMAIL"):
-        user = get_user_by_id(DB_PATH, user_id)
+        user = _get_user(request, user_id)
         feed_token = get_feed_token_by_user(DB_PATH, user_id)
         if feed_token and user:
             webcal_url, _ = _build_feed_urls(request, feed_token)
@@ -293,7 +334,7 @@ async def setup_post(
 
 
 @app.get("/geocode")
-async def geocode(q: str = Query(default="", min_length=0)):
+def geocode(q: str = Query(default="", min_length=0)):
     if len(q) < 3:
         return JSONResponse([])
     try:
@@ -331,8 +372,8 @@ async def login_post(
     email: str = Form(...),
     password: str = Form(...),
 ):
-    user = get_user_by_email(DB_PATH, email)
-    if not user or not check_password(password, user["password_hash"]):
+    user = await run_in_threadpool(get_user_by_email, DB_PATH, email)
+    if not user or not await auth_pool.run(check_password, password, user["password_hash"]):
         return _template(
             "login.html", request,
             {"error": "Invalid email or password.", "email": email},
@@ -366,7 +407,7 @@ def _build_feed_urls(request: Request, feed_token: str):
 
 
 @app.get("/connect", response_class=HTMLResponse)
-async def connect(request: Request):
+def connect(request: Request):
     user_id = _require_login(request)
 
     # Returning users go to settings; new users from setup see the connect page
@@ -393,14 +434,14 @@ async def welcome(request: Request):
 
 
 @app.get("/settings", response_class=HTMLResponse)
-async def settings(
+def settings(
     request: Request,
     success: str = Query(default=""),
     error: str = Query(default=""),
 ):
     user_id = _require_login(request)
 
-    user = get_user_by_id(DB_PATH, user_id)
+    user = _get_user(request, user_id)
     if not user:
         return RedirectResponse(url="/login", status_code=303)
 
@@ -440,7 +481,7 @@ async def settings(
         "success": success,
         "error": error,
         "last_updated": last_updated,
-        "is_admin": _is_admin(user_id),
+        "is_admin": _is_admin(request, user_id),
         "google_oauth_enabled": google_oauth_enabled(),
         "google_connected": is_google_connected(DB_PATH, user_id),
         "calendar_app": calendar_app,
@@ -448,9 +489,8 @@ async def settings(
 
 
 @app.post("/settings")
-async def settings_post(
+def settings_post(
     request: Request,
-    background_tasks: BackgroundTasks,
     cold_threshold: float = Form(default=3.0),
     warn_in_allday: str = Form(default=""),
     warn_rain: str = Form(default=""),
@@ -517,17 +557,18 @@ async def settings_post(
         reminder_evening_hour=reminder_evening_hour,
         reminder_timed_minutes=reminder_timed_minutes,
     )
-    if is_google_connected(DB_PATH, user_id):
-        background_tasks.add_task(_google_push_initial, DB_PATH, user_id)
+    _enqueue_push_if_connected(user_id)
 
     return RedirectResponse(url="/settings?success=prefs", status_code=303)
 
 
+def _enqueue_push_if_connected(user_id: int) -> None:
+    if is_google_connected(DB_PATH, user_id):
+        enqueue_push_job(DB_PATH, user_id)
+
+
 @app.post("/settings/api")
-async def settings_api(
-    request: Request,
-    background_tasks: BackgroundTasks,
-):
+async def settings_api(request: Request):
     user_id = _get_user_id(request)
     if not user_id:
         return JSONResponse({"ok": False, "error": "Login required"}, status_code=401)
@@ -556,8 +597,8 @@ async def settings_api(
         reminder_allday_hour = 0
 
     try:
-        upsert_user_preferences(
-            DB_PATH, user_id,
+        await run_in_threadpool(
+            upsert_user_preferences, DB_PATH, user_id,
             cold_threshold=cold_threshold,
             warm_threshold=warm_threshold,
             hot_threshold=hot_threshold,
@@ -587,8 +628,7 @@ async def settings_api(
         logger.exception("Failed to save preferences via API for user_id=%s", user_id)
         return JSONResponse({"ok": False, "error": "Save failed"}, status_code=500)
 
-    if is_google_connected(DB_PATH, user_id):
-        background_tasks.add_task(_google_push_initial, DB_PATH, user_id)
+    await run_in_threadpool(_enqueue_push_if_connected, user_id)
 
     return JSONResponse({"ok": True})
 
@@ -601,12 +641,12 @@ async def settings_email_post(
 ):
     user_id = _require_login(request)
 
-    user = get_user_by_id(DB_PATH, user_id)
-    if not user or not check_password(current_password, user["password_hash"]):
+    user = await run_in_threadpool(_get_user, request, user_id)
+    if not user or not await auth_pool.run(check_password, current_password, user["password_hash"]):
         return RedirectResponse(url="/settings?error=wrong_password", status_code=303)
 
     try:
-        update_user_email(DB_PATH, user_id, new_email)
+        await run_in_threadpool(update_user_email, DB_PATH, user_id, new_email)
     except sqlite3.IntegrityError:
         return RedirectResponse(url="/settings?error=email_taken", status_code=303)
 
@@ -621,19 +661,19 @@ async def settings_password_post(
 ):
     user_id = _require_login(request)
 
-    user = get_user_by_id(DB_PATH, user_id)
-    if not user or not check_password(current_password, user["password_hash"]):
+    user = await run_in_threadpool(_get_user, request, user_id)
+    if not user or not await auth_pool.run(check_password, current_password, user["password_hash"]):
         return RedirectResponse(url="/settings?error=wrong_password", status_code=303)
 
     if len(new_password) < 12:
         return RedirectResponse(url="/settings?error=password_too_short", status_code=303)
 
-    update_user_password(DB_PATH, user_id, new_password)
+    await auth_pool.run(update_user_password, DB_PATH, user_id, new_password)
     return RedirectResponse(url="/settings?success=password", status_code=303)
 
 
 @app.get("/settings/export")
-async def settings_export(request: Request):
+def settings_export(request: Request):
     user_id = _require_login(request)
 
     data = export_user_data(DB_PATH, user_id)
@@ -644,13 +684,13 @@ async def settings_export(request: Request):
 
 
 @app.post("/settings/delete")
-async def settings_delete_post(
+def settings_delete_post(
     request: Request,
     confirm_email: str = Form(...),
 ):
     user_id = _require_login(request)
 
-    user = get_user_by_id(DB_PATH, user_id)
+    user = _get_user(request, user_id)
     if not user or confirm_email.strip().lower() != user["email"].lower():
         return RedirectResponse(url="/settings?error=email_mismatch", status_code=303)
 
@@ -677,11 +717,11 @@ async def settings_delete_post(
 
 
 @app.get("/feedback", response_class=HTMLResponse)
-async def feedback_page(request: Request):
+def feedback_page(request: Request):
     user_id = _get_user_id(request)
     ctx = {"is_admin": False, "last_updated": None}
     if user_id:
-        ctx["is_admin"] = _is_admin(user_id)
+        ctx["is_admin"] = _is_admin(request, user_id)
         location_names = [loc["location"] for loc in get_user_locations(DB_PATH, user_id)]
         last_updated_raw = get_last_forecast_update(DB_PATH, location_names)
         if last_updated_raw:
@@ -693,23 +733,8 @@ async def feedback_page(request: Request):
     return _template("feedback.html", request, ctx)
 
 
-def _google_push_initial(db_path, user_id):
-    """Background task: push initial forecast events to Google Calendar."""
-    try:
-        from src.web.db import get_user_preferences, get_user_locations, resolve_prefs as _resolve_prefs
-        locations = get_user_locations(db_path, user_id)
-        prefs_row = get_user_preferences(db_path, user_id)
-        prefs = _resolve_prefs(prefs_row)
-        for loc in locations:
-            store = ForecastStore(db_path=db_path)
-            forecasts = store.get_forecasts_for_locations([loc["location"]], days=14)
-            push_events_for_user(db_path, user_id, forecasts, prefs, loc["location"], loc["timezone"])
-    except Exception:
-        logger.exception("Initial Google push failed for user_id=%s", user_id)
-
-
 @app.get("/auth/google")
-async def google_auth_start(request: Request):
+def google_auth_start(request: Request):
     user_id = _require_login(request)
     if not google_oauth_enabled():
         return RedirectResponse(url="/settings", status_code=303)
@@ -733,9 +758,8 @@ async def google_auth_start(request: Request):
 
 
 @app.get("/auth/google/callback")
-async def google_auth_callback(
+def google_auth_callback(
     request: Request,
-    background_tasks: BackgroundTasks,
     code: str = Query(default=""),
     state: str = Query(default=""),
 ):
@@ -775,14 +799,14 @@ async def google_auth_callback(
 
     store_google_tokens(DB_PATH, session_user_id, credentials, calendar_id)
     log_funnel_event(DB_PATH, session_user_id, "google_connected")
-    background_tasks.add_task(_google_push_initial, DB_PATH, session_user_id)
+    enqueue_push_job(DB_PATH, session_user_id)
     if payload.get("from_setup"):
         return RedirectResponse(url="/welcome", status_code=303)
     return RedirectResponse(url="/settings?tab=reconnect&success=google_connected", status_code=303)
 
 
 @app.post("/auth/google/disconnect")
-async def google_auth_disconnect(request: Request):
+def google_auth_disconnect(request: Request):
     user_id = _require_login(request)
 
     from src.integrations.google_push import get_google_credentials, delete_google_calendar
@@ -807,19 +831,18 @@ async def google_auth_disconnect(request: Request):
 
 
 @app.get("/feed/{token}/weather.ics")
-async def feed(request: Request, token: str):
+def feed(request: Request, token: str):
     rows = get_rows_by_token(DB_PATH, token)
     if not rows:
         return Response(content="Invalid or expired token.", status_code=404)
 
     ua = request.headers.get("user-agent", "")
-    # Log funnel event on first-ever feed poll
+    # Log funnel event on first-ever feed poll; the conditional update lets only
+    # one request (across workers) claim it
     user_id = rows[0]["id"]
-    from src.web.db import _get_feed_poll_count
-    if _get_feed_poll_count(DB_PATH, token) == 0:
+    if rows[0]["first_polled_at"] is None and mark_feed_first_polled(DB_PATH, token):
         log_funnel_event(DB_PATH, user_id, "feed_subscribed")
-    update_feed_poll(DB_PATH, token, ua)
-    log_feed_poll(DB_PATH, token, ua)
+    poll_buffer.record(DB_PATH, token, ua)
 
     settings_url = str(request.base_url).rstrip("/") + "/settings"
 
@@ -833,8 +856,7 @@ async def feed(request: Request, token: str):
         )
 
     locations = list({row["location"] for row in rows})
-    store = ForecastStore(db_path=DB_PATH)
-    forecasts = store.get_forecasts_for_locations(locations, days=14)
+    forecasts = _forecast_store(DB_PATH).get_forecasts_for_locations(locations, days=14)
 
     location_name = locations[0] if locations else "Unknown"
     prefs_row = get_user_preferences(DB_PATH, user_id)
@@ -852,7 +874,7 @@ async def feed(request: Request, token: str):
 
 
 @app.get("/events.ics")
-async def events_ics():
+def events_ics():
     events = get_future_events(DB_PATH)
     ics_content = build_event_ics(events)
     return Response(
@@ -863,7 +885,7 @@ async def events_ics():
 
 
 @app.get("/events/free.ics")
-async def events_free_ics():
+def events_free_ics():
     events = get_future_events(DB_PATH, free_only=True)
     ics_content = build_event_ics(events)
     return Response(
@@ -874,7 +896,7 @@ async def events_free_ics():
 
 
 @app.get("/feed/{token}/events.ics")
-async def feed_events(token: str):
+def feed_events(token: str):
     user_id = get_user_id_by_feed_token(DB_PATH, token)
     if not user_id:
         return Response(content="Invalid or expired token.", status_code=404)
@@ -888,15 +910,16 @@ async def feed_events(token: str):
 
 
 @app.get("/admin", response_class=HTMLResponse)
-async def admin(request: Request, days: int = Query(default=30)):
+def admin(request: Request, days: int = Query(default=30)):
     user_id = _require_login(request)
-    if not _is_admin(user_id):
+    if not _is_admin(request, user_id):
         return Response(content="Forbidden", status_code=403)
     stats = get_admin_stats(DB_PATH)
     feedback = get_feedback(DB_PATH)
     funnel = get_funnel_stats(DB_PATH)
     timeseries = get_funnel_timeseries(DB_PATH, days)
     funnel_by_source = get_funnel_by_source(DB_PATH)
+    page_view_counter.flush()  # include views not yet written
     page_views = get_page_view_stats(DB_PATH)
     return _template("admin.html", request, {
         "stats": stats,
@@ -909,10 +932,37 @@ async def admin(request: Request, days: int = Query(default=30)):
     })
 
 
+@app.get("/admin/auth-pool")
+def admin_auth_pool(request: Request):
+    """Password hashing pool queue depth and shed count."""
+    user_id = _require_login(request)
+    if not _is_admin(request, user_id):
+        return Response(content="Forbidden", status_code=403)
+    return JSONResponse(auth_pool.metrics())
+
+
+@app.get("/admin/schedule")
+def admin_schedule(request: Request, hours: int = Query(default=24)):
+    """Planned tier refreshes for the next `hours`, with load per 15-minute bucket."""
+    user_id = _require_login(request)
+    if not _is_admin(request, user_id):
+        return Response(content="Forbidden", status_code=403)
+    from src.services.tier_schedule import build_timeline, load_profile
+    from src.utils.location_management import group_locations_by_timezone, load_locations_from_db
+
+    tz_groups = group_locations_by_timezone(load_locations_from_db(DB_PATH))
+    timeline = build_timeline(tz_groups, hours=max(1, min(hours, 72)))
+    return JSONResponse({
+        "groups": {zone: [loc["location"] for loc in locs] for zone, locs in tz_groups.items()},
+        "timeline": timeline,
+        "load": load_profile(timeline),
+    })
+
+
 @app.get("/admin/export.csv")
-async def admin_export_csv(request: Request):
+def admin_export_csv(request: Request):
     user_id = _require_login(request)
-    if not _is_admin(user_id):
+    if not _is_admin(request, user_id):
         return Response(content="Forbidden", status_code=403)
 
     import csv
@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
 from jose import jwt, JWTError
@@ -6,6 +9,11 @@ from jose import jwt, JWTError
 SECRET_KEY = os.getenv("SECRET_KEY", "change-me-in-production")
 ALGORITHM = "HS256"
 
+# Verified session tokens -> (user_id, exp), so repeat requests skip the HMAC check
+SESSION_CACHE_SIZE = 1024
+_session_cache: OrderedDict = OrderedDict()
+_session_cache_lock = threading.Lock()
+
 
 def create_session_token(user_id: int) -> str:
     exp = datetime.now(timezone.utc) + timedelta(days=30)
@@ -13,8 +21,23 @@ def create_session_token(user_id: int) -> str:
 
 
 def decode_session_token(token: str):
+    key = (SECRET_KEY, token)
+    with _session_cache_lock:
+        cached = _session_cache.get(key)
+        if cached is not None:
+            user_id, exp = cached
+            if exp is None or exp > time.time():
+                _session_cache.move_to_end(key)
+                return user_id
+            del _session_cache[key]
+            return None
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload.get("user_id")
     except JWTError:
         return None
+    user_id = payload.get("user_id")
+    with _session_cache_lock:
+        _session_cache[key] = (user_id, payload.get("exp"))
+        if len(_session_cache) > SESSION_CACHE_SIZE:
+            _session_cache.popitem(last=False)
+    return user_id
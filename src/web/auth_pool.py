@@ -0,0 +1,81 @@
+"""Bounded thread pool for password hashing.
+
+bcrypt takes ~250ms per hash or check, which would block the event loop (and
+every feed poll on the worker) if run inline in an async route. Routes await
+auth_pool.run(...) instead, which runs the call on AUTH_HASH_WORKERS threads. Once
+AUTH_HASH_MAX_QUEUE calls are already waiting for a thread, further calls are
+shed with AuthPoolBusy rather than queueing without limit.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+AUTH_HASH_WORKERS = max(1, int(os.getenv("AUTH_HASH_WORKERS", "2")))
+AUTH_HASH_MAX_QUEUE = max(0, int(os.getenv("AUTH_HASH_MAX_QUEUE", "16")))
+
+
+class AuthPoolBusy(Exception):
+    """Raised when the hashing pool's queue is full."""
+
+
+class AuthPool:
+    def __init__(self, workers: int = AUTH_HASH_WORKERS, max_queue: int = AUTH_HASH_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="auth-hash")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._shed = 0
+
+    async def run(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the pool. Raises AuthPoolBusy when saturated."""
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self._shed += 1
+                shed = self._shed
+            else:
+                shed = None
+                self._in_flight += 1
+                self._peak_queued = max(self._peak_queued, self._in_flight - self.workers)
+        if shed is not None:
+            logger.warning("Auth hashing pool saturated, shedding request (%d shed so far)", shed)
+            raise AuthPoolBusy()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        # The slot is freed when the thread is done with the call, not when this
+        # await ends: a cancelled request leaves the hash running on its thread
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if not future.cancelled():
+                self._completed += 1
+
+    def metrics(self) -> dict:
+        """Current queue depth plus peak depth and completed/shed counts since startup."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": min(self._in_flight, self.workers),
+                "queued": max(0, self._in_flight - self.workers),
+                "peak_queued": self._peak_queued,
+                "completed": self._completed,
+                "shed": self._shed,
+            }
+
+
+auth_pool = AuthPool()
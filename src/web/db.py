@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 import bcrypt
 
 from src.constants import DEFAULT_PREFS
+from src.services.poll_rollups import polls_since
 from src.utils.db import get_connection as _conn
 
 logger = logging.getLogger(__name__)
@@ -130,7 +131,8 @@ def get_rows_by_token(db_path: str, token: str):
         cur = conn.cursor()
         cur.execute(
             """
-            SELECT u.id, u.email, ul.location, ul.lat, ul.lon, ul.timezone
+            SELECT u.id, u.email, ul.location, ul.lat, ul.lon, ul.timezone,
+                   ft.first_polled_at
             FROM feed_tokens ft
             JOIN users u ON ft.user_id = u.id
             JOIN user_locations ul ON ul.user_id = u.id
@@ -412,12 +414,16 @@ def delete_user_account(db_path: str, user_id: int) -> None:
         if tokens:
             placeholders = ",".join("?" * len(tokens))
             conn.execute(f"DELETE FROM poll_log WHERE token IN ({placeholders})", tokens)
+            conn.execute(f"DELETE FROM poll_rollup_hourly WHERE token IN ({placeholders})", tokens)
+            conn.execute(f"DELETE FROM poll_rollup_daily WHERE token IN ({placeholders})", tokens)
         # Delete user-linked data
         conn.execute("DELETE FROM user_preferences WHERE user_id = ?", (user_id,))
         conn.execute("DELETE FROM user_locations WHERE user_id = ?", (user_id,))
         conn.execute("DELETE FROM feedback WHERE user_id = ?", (user_id,))
         try:
             conn.execute("DELETE FROM google_tokens WHERE user_id = ?", (user_id,))
+            conn.execute("DELETE FROM google_events WHERE user_id = ?", (user_id,))
+            conn.execute("DELETE FROM push_jobs WHERE user_id = ?", (user_id,))
         except sqlite3.OperationalError:
             pass  # table may not exist yet
         conn.execute("DELETE FROM feed_tokens WHERE user_id = ?", (user_id,))
@@ -434,8 +440,8 @@ def log_funnel_event(db_path: str, user_id: int, event_name: str) -> None:
     conn = _conn(db_path)
     try:
         conn.execute(
-            "INSERT INTO funnel_events (user_id, event_name, created_at) VALUES (?, ?, ?)",
-            (user_id, event_name, created_at),
+            "INSERT INTO funnel_events (user_id, event_name, created_at, event_date) VALUES (?, ?, ?, ?)",
+            (user_id, event_name, created_at, created_at[:10]),
         )
         conn.commit()
     finally:
@@ -527,18 +533,6 @@ def get_user_calendar_app(db_path: str, user_id: int) -> str:
         conn.close()
 
 
-def _get_feed_poll_count(db_path: str, token: str) -> int:
-    """Return the current poll_count for a feed token."""
-    conn = _conn(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT COALESCE(poll_count, 0) FROM feed_tokens WHERE token = ?", (token,))
-        row = cur.fetchone()
-        return row[0] if row else 0
-    finally:
-        conn.close()
-
-
 def update_feed_poll(db_path: str, token: str, user_agent: str) -> None:
     """Record an ICS feed poll: update timestamp, increment count, store UA."""
     now = datetime.now().isoformat()
@@ -557,6 +551,21 @@ def update_feed_poll(db_path: str, token: str, user_agent: str) -> None:
         conn.close()
 
 
+def mark_feed_first_polled(db_path: str, token: str) -> bool:
+    """Stamp a feed token's first poll. True only for the call that stamped it."""
+    now = datetime.now().isoformat()
+    conn = _conn(db_path)
+    try:
+        cur = conn.execute(
+            "UPDATE feed_tokens SET first_polled_at = ? WHERE token = ? AND first_polled_at IS NULL",
+            (now, token),
+        )
+        conn.commit()
+        return cur.rowcount == 1
+    finally:
+        conn.close()
+
+
 def log_feed_poll(db_path: str, token: str, user_agent: str) -> None:
     """Insert a row into poll_log for granular tracking."""
     now = datetime.now().isoformat()
@@ -571,6 +580,33 @@ def log_feed_poll(db_path: str, token: str, user_agent: str) -> None:
         conn.close()
 
 
+def record_feed_polls(db_path: str, polls: list) -> None:
+    """Write a batch of feed polls, given as (token, polled_at, user_agent) in poll order.
+
+    Equivalent to update_feed_poll + log_feed_poll per poll, in one transaction.
+    """
+    if not polls:
+        return
+    counts, latest = {}, {}
+    for token, polled_at, user_agent in polls:
+        counts[token] = counts.get(token, 0) + 1
+        latest[token] = (polled_at, user_agent)
+    conn = _conn(db_path)
+    try:
+        conn.executemany("INSERT INTO poll_log (token, polled_at, user_agent) VALUES (?, ?, ?)", polls)
+        conn.executemany(
+            """UPDATE feed_tokens
+               SET last_polled_at = ?,
+                   poll_count = COALESCE(poll_count, 0) + ?,
+                   last_user_agent = ?
+               WHERE token = ?""",
+            [(latest[t][0], n, latest[t][1], t) for t, n in counts.items()],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
 def increment_settings_clicks(db_path: str, user_id: int) -> None:
     """Increment the settings link click counter for a user's feed token."""
     conn = _conn(db_path)
@@ -603,6 +639,19 @@ def _export_poll_logs(cur, user_id: int) -> list:
     return [dict(r) for r in cur.fetchall()]
 
 
+def _export_poll_history(cur, user_id: int) -> list:
+    """Polls per day from poll_rollup_daily, which outlives the raw poll_log rows."""
+    cur.execute(
+        """SELECT r.day, SUM(r.polls) AS polls
+           FROM poll_rollup_daily r
+           JOIN feed_tokens ft ON ft.token = r.token
+           WHERE ft.user_id = ?
+           GROUP BY r.day ORDER BY r.day DESC""",
+        (user_id,),
+    )
+    return [dict(r) for r in cur.fetchall()]
+
+
 def _export_google_connection(cur, user_id: int) -> dict | None:
     try:
         cur.execute(
@@ -645,6 +694,7 @@ def export_user_data(db_path: str, user_id: int) -> dict:
             "preferences": dict(prefs_row) if prefs_row else {},
             "feed_tokens": feed_tokens,
             "poll_logs": _export_poll_logs(cur, user_id),
+            "poll_history": _export_poll_history(cur, user_id),
             "feedback": feedback,
             "google_calendar": _export_google_connection(cur, user_id),
         }
@@ -652,35 +702,12 @@ def export_user_data(db_path: str, user_id: int) -> dict:
         conn.close()
 
 
-_CHANGED_PREFS_SQL = """
-    cold_threshold != 3.0
-    OR warm_threshold != 14.0
-    OR hot_threshold != 28.0
-    OR warn_in_allday != 1
-    OR warn_rain != 1
-    OR warn_wind != 1
-    OR warn_cold != 1
-    OR warn_snow != 1
-    OR warn_sunny != 0
-    OR warn_hot != 1
-    OR show_allday_events != 1
-    OR timed_events_enabled != 1
-    OR allday_rain != 1
-    OR allday_wind != 1
-    OR allday_cold != 1
-    OR allday_snow != 1
-    OR allday_sunny != 0
-    OR allday_hot != 1
-    OR title_format != 'simple'
-    OR temp_display != 'feels_like'
-"""
-
-
 def _get_summary_stats(cur) -> dict:
     """Aggregate counts for the admin dashboard header."""
-    cur.execute("SELECT COUNT(*) FROM users WHERE is_active = 1")
-    total_users = cur.fetchone()[0]
+    cur.execute("SELECT COUNT(*), COALESCE(SUM(changed_prefs), 0) FROM admin_user_stats")
+    total_users, changed_prefs_count = cur.fetchone()
 
+    # admin_user_stats keeps one location and token per user; these count all of them
     cur.execute(
         """SELECT COUNT(DISTINCT ul.location)
            FROM user_locations ul
@@ -689,14 +716,6 @@ def _get_summary_stats(cur) -> dict:
     )
     unique_locations = cur.fetchone()[0]
 
-    cur.execute(
-        f"""SELECT COUNT(*)
-            FROM user_preferences up
-            JOIN users u ON up.user_id = u.id
-            WHERE u.is_active = 1 AND ({_CHANGED_PREFS_SQL})"""
-    )
-    changed_prefs_count = cur.fetchone()[0]
-
     cur.execute(
         """SELECT COALESCE(SUM(ft.poll_count), 0), COALESCE(SUM(ft.settings_clicks), 0)
            FROM feed_tokens ft
@@ -715,40 +734,10 @@ def _get_summary_stats(cur) -> dict:
 
 
 def _get_per_user_stats(cur, now) -> list[dict]:
-    """Build per-user stats list for the admin dashboard table."""
-    twenty_four_hours_ago = (now - timedelta(hours=24)).isoformat()
-    cur.execute(
-        """SELECT token, COUNT(*) AS cnt FROM poll_log
-           WHERE polled_at >= ? GROUP BY token""",
-        (twenty_four_hours_ago,),
-    )
-    token_polls_24h = {r["token"]: r["cnt"] for r in cur.fetchall()}
+    """Build per-user stats list for the admin dashboard table from admin_user_stats."""
+    token_polls_24h = polls_since(cur, now - timedelta(hours=24))
 
-    cur.execute(
-        f"""SELECT
-                u.email,
-                ul.location,
-                ul.admin1,
-                ul.country,
-                u.created_at,
-                ft.last_polled_at,
-                COALESCE(ft.poll_count, 0) AS poll_count,
-                ft.token,
-                ft.created_at AS token_created_at,
-                ft.last_user_agent,
-                COALESCE(ft.settings_clicks, 0) AS settings_clicks,
-                (SELECT CASE WHEN COUNT(*) > 0 THEN 1 ELSE 0 END
-                 FROM user_preferences up
-                 WHERE up.user_id = u.id AND ({_CHANGED_PREFS_SQL})) AS changed_prefs,
-                gt.status AS google_status,
-                u.utm_source
-            FROM users u
-            LEFT JOIN user_locations ul ON ul.user_id = u.id
-            LEFT JOIN feed_tokens ft ON ft.user_id = u.id
-            LEFT JOIN google_tokens gt ON gt.user_id = u.id
-            WHERE u.is_active = 1
-            ORDER BY u.created_at DESC"""
-    )
+    cur.execute("SELECT * FROM admin_user_stats ORDER BY created_at DESC")
 
     users = []
     for r in cur.fetchall():
@@ -783,28 +772,40 @@ def _get_per_user_stats(cur, now) -> list[dict]:
 
 def get_funnel_timeseries(db_path: str, days: int = 30) -> list[dict]:
     """Return daily funnel counts for the last N days."""
+    today = datetime.now().date()
     conn = _conn(db_path)
     try:
         cur = conn.cursor()
+        # Counts come from an idx_funnel_date range scan, then fill in the empty days
         cur.execute(
             """
             WITH RECURSIVE dates(d) AS (
-                SELECT date(?, '-' || ? || ' days')
+                SELECT ?
                 UNION ALL
-                SELECT date(d, '+1 day') FROM dates WHERE d < date(?)
+                SELECT date(d, '+1 day') FROM dates WHERE d < ?
+            ),
+            daily AS (
+                SELECT
+                    event_date,
+                    SUM(event_name = 'signup_completed') AS signups,
+                    SUM(event_name = 'location_set') AS location_set,
+                    SUM(event_name = 'feed_subscribed') AS feed_subscribed,
+                    SUM(event_name = 'google_connected') AS google_connected
+                FROM funnel_events
+                WHERE event_date >= ? AND event_date <= ?
+                GROUP BY event_date
             )
             SELECT
                 dates.d AS date,
-                COALESCE(SUM(CASE WHEN fe.event_name = 'signup_completed' THEN 1 ELSE 0 END), 0) AS signups,
-                COALESCE(SUM(CASE WHEN fe.event_name = 'location_set' THEN 1 ELSE 0 END), 0) AS location_set,
-                COALESCE(SUM(CASE WHEN fe.event_name = 'feed_subscribed' THEN 1 ELSE 0 END), 0) AS feed_subscribed,
-                COALESCE(SUM(CASE WHEN fe.event_name = 'google_connected' THEN 1 ELSE 0 END), 0) AS google_connected
+                COALESCE(daily.signups, 0) AS signups,
+                COALESCE(daily.location_set, 0) AS location_set,
+                COALESCE(daily.feed_subscribed, 0) AS feed_subscribed,
+                COALESCE(daily.google_connected, 0) AS google_connected
             FROM dates
-            LEFT JOIN funnel_events fe ON date(fe.created_at) = dates.d
-            GROUP BY dates.d
+            LEFT JOIN daily ON daily.event_date = dates.d
             ORDER BY dates.d
             """,
-            (datetime.now().date().isoformat(), days - 1, datetime.now().date().isoformat()),
+            ((today - timedelta(days=days - 1)).isoformat(), today.isoformat()) * 2,
         )
         return [dict(r) for r in cur.fetchall()]
     finally:
@@ -837,13 +838,19 @@ def get_funnel_by_source(db_path: str) -> list[dict]:
 
 def increment_page_view(db_path: str, path: str) -> None:
     """Increment the page view counter for a path on today's date."""
-    today = datetime.now().date().isoformat()
+    add_page_views(db_path, [(path, datetime.now().date().isoformat(), 1)])
+
+
+def add_page_views(db_path: str, views: list) -> None:
+    """Add a batch of page view counts, given as (path, view_date, count), in one transaction."""
+    if not views:
+        return
     conn = _conn(db_path)
     try:
-        conn.execute(
-            """INSERT INTO page_views (path, view_date, count) VALUES (?, ?, 1)
-               ON CONFLICT(path, view_date) DO UPDATE SET count = count + 1""",
-            (path, today),
+        conn.executemany(
+            """INSERT INTO page_views (path, view_date, count) VALUES (?, ?, ?)
+               ON CONFLICT(path, view_date) DO UPDATE SET count = count + excluded.count""",
+            views,
         )
         conn.commit()
     finally:
@@ -0,0 +1,55 @@
+"""In-process page view counting.
+
+Landing and signup hits are counted in memory per (path, day) and written as
+one aggregated upsert per key every PAGE_VIEW_FLUSH_SECONDS and on shutdown,
+so a traffic spike on / costs no SQLite writes on the request path. A crash
+loses at most one flush interval of counts; if a flush fails the counts are
+kept for the next one.
+"""
+
+import logging
+import os
+from collections import Counter
+from datetime import datetime
+
+from src.web.db import add_page_views
+from src.web.periodic_flush import PeriodicFlusher
+
+logger = logging.getLogger(__name__)
+
+PAGE_VIEW_FLUSH_SECONDS = float(os.getenv("PAGE_VIEW_FLUSH_SECONDS", "30"))
+
+
+class PageViewCounter(PeriodicFlusher):
+    thread_name = "page-views"
+
+    def __init__(self, flush_seconds: float = PAGE_VIEW_FLUSH_SECONDS):
+        super().__init__(flush_seconds)
+        self._counts: Counter = Counter()  # (db_path, path, view_date) -> views not yet written
+
+    def record(self, db_path: str, path: str) -> None:
+        """Count one view of `path` today."""
+        with self._lock:
+            self._counts[(db_path, path, datetime.now().date().isoformat())] += 1
+            self._ensure_thread()
+
+    def _flush(self) -> int:
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        by_db: dict[str, list] = {}
+        for (db_path, path, view_date), n in counts.items():
+            by_db.setdefault(db_path, []).append((path, view_date, n))
+        written = 0
+        for db_path, views in by_db.items():
+            try:
+                add_page_views(db_path, views)
+            except Exception:
+                logger.exception("Failed to write page views for %d paths, will retry", len(views))
+                with self._lock:
+                    self._counts.update({(db_path, path, view_date): n for path, view_date, n in views})
+                continue
+            written += sum(n for _, _, n in views)
+        return written
+
+
+page_view_counter = PageViewCounter()
@@ -0,0 +1,64 @@
+"""Background flushing shared by the in-memory analytics buffers.
+
+A PeriodicFlusher owns the locking and the flush thread: subclasses keep their
+buffered state under self._lock, call self._ensure_thread() from record() while
+holding it, and implement _flush() to write what is buffered. flush() calls are
+serialised, the thread starts on the first record and flushes every
+flush_seconds (or as soon as wake() is called), and close() stops it and writes
+what is left.
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicFlusher:
+    thread_name = "flusher"
+
+    def __init__(self, flush_seconds: float):
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def flush(self) -> int:
+        """Write what is buffered so far. Returns the number of records written."""
+        with self._flush_lock:
+            return self._flush()
+
+    def wake(self) -> None:
+        """Flush now instead of waiting for the next interval."""
+        self._wake.set()
+
+    def close(self) -> None:
+        """Stop the background thread and write what is left."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self.flush()
+        with self._lock:
+            self._thread = None
+            self._stop.clear()
+
+    def _ensure_thread(self) -> None:
+        """Start the flush thread if it isn't running. Call with self._lock held."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+            self._thread.start()
+
+    def _flush(self) -> int:
+        raise NotImplementedError
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("%s flush failed", self.thread_name)
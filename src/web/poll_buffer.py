@@ -0,0 +1,75 @@
+"""Buffered feed-poll analytics.
+
+Feed polls are the hottest request path, so instead of two writes per poll
+(feed_tokens counters and a poll_log row) the route records the poll here and
+a background thread writes batches via record_feed_polls every
+POLL_FLUSH_SECONDS, or sooner once POLL_FLUSH_RECORDS are waiting. A crash
+loses at most that window; a graceful shutdown flushes what is left. If the
+database stays unwritable, at most POLL_BUFFER_MAX polls are held and the
+oldest are dropped.
+"""
+
+import logging
+import os
+from collections import deque
+from datetime import datetime
+
+from src.web.db import record_feed_polls
+from src.web.periodic_flush import PeriodicFlusher
+
+logger = logging.getLogger(__name__)
+
+POLL_FLUSH_SECONDS = float(os.getenv("POLL_FLUSH_SECONDS", "5"))
+POLL_FLUSH_RECORDS = int(os.getenv("POLL_FLUSH_RECORDS", "200"))
+POLL_BUFFER_MAX = 10_000
+
+
+class PollBuffer(PeriodicFlusher):
+    thread_name = "poll-buffer"
+
+    def __init__(self, flush_seconds: float = POLL_FLUSH_SECONDS, flush_records: int = POLL_FLUSH_RECORDS,
+                 max_pending: int = POLL_BUFFER_MAX):
+        super().__init__(flush_seconds)
+        self.flush_records = flush_records
+        self._pending: deque = deque(maxlen=max_pending)  # (db_path, token, polled_at, user_agent)
+        self.dropped = 0
+
+    def record(self, db_path: str, token: str, user_agent: str) -> None:
+        """Queue one feed poll for the next flush."""
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append((db_path, token, datetime.now().isoformat(), user_agent))
+            full = len(self._pending) >= self.flush_records
+            self._ensure_thread()
+        if full:
+            self.wake()
+
+    def _flush(self) -> int:
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        by_db: dict[str, list] = {}
+        for db_path, token, polled_at, user_agent in batch:
+            by_db.setdefault(db_path, []).append((token, polled_at, user_agent))
+        written = 0
+        for db_path, polls in by_db.items():
+            try:
+                record_feed_polls(db_path, polls)
+            except Exception:
+                logger.exception("Failed to write %d feed polls, will retry", len(polls))
+                self._requeue(db_path, polls)
+                continue
+            written += len(polls)
+        return written
+
+    def _requeue(self, db_path: str, polls: list) -> None:
+        """Put unwritten polls back ahead of newer ones, dropping the oldest if there is no room."""
+        with self._lock:
+            room = self._pending.maxlen - len(self._pending)
+            keep = polls[len(polls) - room:] if room < len(polls) else polls
+            self.dropped += len(polls) - len(keep)
+            self._pending.extendleft((db_path, *p) for p in reversed(keep))
+
+
+poll_buffer = PollBuffer()